@@ -0,0 +1,524 @@
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class ActionBackend:
+    """OS operations behind the gesture commands: audio, keys, mouse, screen and apps
+
+    Controllers call these from the action worker, so every method may
+    block. Backends open their OS handles (audio endpoint, display
+    connection) once and keep them; preload() opens them on a background
+    thread so the first command does not pay for it. Volume levels are
+    scalars in 0..1 and screenshots are BGR uint8 arrays.
+    """
+
+    name = None
+
+    def preload(self):
+        def load():
+            try:
+                self._preload()
+            except Exception as e:
+                print(f"Could not prepare {self.name} actions: {e}")
+
+        threading.Thread(target=load, name=f"{self.name}-backend", daemon=True).start()
+        return self
+
+    def _preload(self):
+        pass
+
+    # Audio
+    def volume(self):
+        raise NotImplementedError
+
+    def set_volume(self, level):
+        raise NotImplementedError
+
+    def change_volume(self, delta):
+        """Step the volume, clamped to 0..1; returns the new level"""
+        level = min(1.0, max(0.0, self.volume() + delta))
+        self.set_volume(level)
+        return level
+
+    def muted(self):
+        raise NotImplementedError
+
+    def set_mute(self, muted):
+        raise NotImplementedError
+
+    def toggle_mute(self):
+        """Returns True when the output is now muted"""
+        muted = not self.muted()
+        self.set_mute(muted)
+        return muted
+
+    # Keyboard
+    def hotkey(self, *keys):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def type_text(self, text):
+        """Type a whole string at once, not one sleep-separated key at a time"""
+        raise NotImplementedError
+
+    # Mouse
+    def move_cursor(self, x, y):
+        raise NotImplementedError
+
+    def click(self, button="left", clicks=1):
+        raise NotImplementedError
+
+    def mouse_down(self):
+        raise NotImplementedError
+
+    def mouse_up(self):
+        raise NotImplementedError
+
+    def scroll(self, amount):
+        raise NotImplementedError
+
+    # Screen, windows and apps
+    def screen_size(self):
+        raise NotImplementedError
+
+    def screenshot(self, out=None):
+        """Grab the screen as BGR, into out when it has the screen's shape"""
+        raise NotImplementedError
+
+    def active_window_title(self):
+        raise NotImplementedError
+
+    def open_url(self, url, browser=None, private=False):
+        raise NotImplementedError
+
+    def suspend(self):
+        raise NotImplementedError
+
+
+class PyAutoGuiBackend(ActionBackend):
+    """Keyboard, mouse and screen through pyautogui, shared by the desktop backends
+
+    pyautogui sleeps for pyautogui.PAUSE after every call; actions already
+    run one at a time on the worker, so every call skips that pause.
+    """
+
+    def __init__(self):
+        self._gui = None
+        self._keyboard = None
+        self._screen_size = None
+
+    @property
+    def gui(self):
+        if self._gui is None:
+            import pyautogui
+            self._gui = pyautogui
+        return self._gui
+
+    def _preload(self):
+        self.gui
+        self.screen_size()
+
+    def hotkey(self, *keys):
+        self.gui.hotkey(*keys, _pause=False)
+
+    def press(self, key):
+        self.gui.press(key, _pause=False)
+
+    def type_text(self, text):
+        # pynput types any Unicode character, pyautogui only what is on its key map
+        if self._keyboard is None:
+            from pynput.keyboard import Controller
+            self._keyboard = Controller()
+        self._keyboard.type(text)
+
+    def move_cursor(self, x, y):
+        self.gui.moveTo(x, y, _pause=False)
+
+    def click(self, button="left", clicks=1):
+        self.gui.click(button=button, clicks=clicks, _pause=False)
+
+    def mouse_down(self):
+        self.gui.mouseDown(_pause=False)
+
+    def mouse_up(self):
+        self.gui.mouseUp(_pause=False)
+
+    def scroll(self, amount):
+        self.gui.scroll(amount, _pause=False)
+
+    def screen_size(self):
+        # Size of the first monitor, read once
+        if self._screen_size is None:
+            from screeninfo import get_monitors
+            for m in get_monitors():
+                self._screen_size = (m.width, m.height)
+                break
+        return self._screen_size
+
+    def screenshot(self, out=None):
+        from PIL import ImageGrab
+        image = ImageGrab.grab()
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if out is not None and out.shape != (image.height, image.width, 3):
+            out = None
+        # The channel swap writes straight into out, so no further copy is needed
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR, dst=out)
+
+
+class WindowsBackend(PyAutoGuiBackend):
+    """Windows: Core Audio through pycaw, power management through powrprof
+
+    The audio endpoint is activated once and reused by every volume and
+    mute command, and mute state is cached instead of queried each time.
+    """
+
+    name = "windows"
+
+    def __init__(self):
+        super().__init__()
+        self._volume = None
+        self._muted = None
+        self._lock = threading.Lock()
+
+    def _preload(self):
+        super()._preload()
+        self.endpoint
+
+    @property
+    def endpoint(self):
+        with self._lock:
+            if self._volume is None:
+                # Join the multithreaded COM apartment: preload() activates the
+                # endpoint on its own thread but the action worker uses it, and
+                # an apartment-threaded pointer is only valid on the thread that
+                # made it. comtypes initialises COM when first imported
+                sys.coinit_flags = 0
+                from ctypes import cast, POINTER
+                from comtypes import CLSCTX_ALL
+                from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+
+                devices = AudioUtilities.GetSpeakers()
+                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+                self._volume = cast(interface, POINTER(IAudioEndpointVolume))
+                self._muted = bool(self._volume.GetMute())
+        return self._volume
+
+    def volume(self):
+        return self.endpoint.GetMasterVolumeLevelScalar()
+
+    def set_volume(self, level):
+        self.endpoint.SetMasterVolumeLevelScalar(level, None)
+
+    def muted(self):
+        self.endpoint
+        return self._muted
+
+    def set_mute(self, muted):
+        self.endpoint.SetMute(muted, None)
+        self._muted = bool(muted)
+
+    def active_window_title(self):
+        window = self.gui.getActiveWindow()
+        return window.title if window else None
+
+    def open_url(self, url, browser=None, private=False):
+        if browser is None:
+            import webbrowser
+            webbrowser.open(url)
+            return
+        command = ["start", browser]
+        if private:
+            command.append("--incognito")
+        subprocess.Popen(command + [url], shell=True)
+
+    def type_text(self, text):
+        # One SendInput call with a Unicode key down and up per UTF-16 unit
+        import ctypes
+        input_type = _windows_input_type()
+        units = text.encode("utf-16-le")
+        codes = [int.from_bytes(units[i:i + 2], "little") for i in range(0, len(units), 2)]
+        inputs = (input_type * (2 * len(codes)))()
+        for i, code in enumerate(codes):
+            for j, flags in enumerate((KEYEVENTF_UNICODE, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)):
+                event = inputs[2 * i + j]
+                event.type = INPUT_KEYBOARD
+                event.ki.wScan = code
+                event.ki.dwFlags = flags
+        sent = ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(input_type))
+        if sent != len(inputs):
+            raise OSError(f"SendInput typed {sent} of {len(inputs)} key events")
+
+    def suspend(self):
+        import ctypes
+        ctypes.windll.powrprof.SetSuspendState(0, 1, 0)
+
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+_INPUT = None
+
+
+def _windows_input_type():
+    """The Win32 INPUT structure for SendInput, built on first use"""
+    global _INPUT
+    if _INPUT is None:
+        import ctypes
+        from ctypes import wintypes
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        # The union must be as large as its biggest member for SendInput to accept the size
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        class INPUTUNION(ctypes.Union):
+            _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _anonymous_ = ("union",)
+            _fields_ = [("type", wintypes.DWORD), ("union", INPUTUNION)]
+
+        _INPUT = INPUT
+    return _INPUT
+
+
+class LinuxBackend(PyAutoGuiBackend):
+    """Linux with X11: PulseAudio or PipeWire audio, Xlib windows, systemd suspend
+
+    Audio uses one pulsectl connection when that package is installed and
+    falls back to pactl. The pactl fallback reads the level once and then
+    tracks it locally, so a volume step is a single subprocess. The active
+    window is read through one persistent Xlib display connection.
+    """
+
+    name = "linux"
+
+    def __init__(self):
+        super().__init__()
+        self._pulse = None
+        self._level = None
+        self._muted = None
+        self._display = None
+        self._lock = threading.Lock()
+
+    def _preload(self):
+        super()._preload()
+        self.volume()
+        self.display
+
+    # Audio
+    def _load_audio(self):
+        with self._lock:
+            if self._level is not None:
+                return
+            try:
+                import pulsectl
+                self._pulse = pulsectl.Pulse("gesture-control")
+                sink = self._sink()
+                self._level = sink.volume.value_flat
+                self._muted = bool(sink.mute)
+                return
+            except ImportError:
+                pass
+            output = self._pactl("get-sink-volume", capture=True)
+            match = re.search(r"(\d+)%", output)
+            self._level = int(match.group(1)) / 100 if match else 0.0
+            self._muted = "yes" in self._pactl("get-sink-mute", capture=True)
+
+    def _sink(self):
+        default = self._pulse.server_info().default_sink_name
+        return self._pulse.get_sink_by_name(default)
+
+    def _pactl(self, command, value=None, capture=False):
+        args = ["pactl", command, "@DEFAULT_SINK@"]
+        if value is not None:
+            args.append(value)
+        result = subprocess.run(args, capture_output=capture, text=True, check=True)
+        return result.stdout
+
+    def volume(self):
+        self._load_audio()
+        return self._level
+
+    def set_volume(self, level):
+        self._load_audio()
+        if self._pulse is not None:
+            self._pulse.volume_set_all_chans(self._sink(), level)
+        else:
+            self._pactl("set-sink-volume", f"{round(level * 100)}%")
+        self._level = level
+
+    def muted(self):
+        self._load_audio()
+        return self._muted
+
+    def set_mute(self, muted):
+        self._load_audio()
+        if self._pulse is not None:
+            self._pulse.mute(self._sink(), muted)
+        else:
+            self._pactl("set-sink-mute", "1" if muted else "0")
+        self._muted = bool(muted)
+
+    # Windows and apps
+    @property
+    def display(self):
+        if self._display is None:
+            from Xlib import display
+            self._display = display.Display()
+        return self._display
+
+    def active_window_title(self):
+        from Xlib import X
+        d = self.display
+        root = d.screen().root
+        active = root.get_full_property(d.intern_atom("_NET_ACTIVE_WINDOW"), X.AnyPropertyType)
+        if not active or not active.value[0]:
+            return None
+        window = d.create_resource_object("window", active.value[0])
+        name = window.get_full_property(d.intern_atom("_NET_WM_NAME"), 0) or window.get_wm_name()
+        if name is None:
+            return None
+        value = getattr(name, "value", name)
+        return value.decode("utf-8", "replace") if isinstance(value, bytes) else value
+
+    def open_url(self, url, browser=None, private=False):
+        command = ["xdg-open", url]
+        if browser:
+            executable = shutil.which(browser) or shutil.which(f"{browser}-browser")
+            if executable:
+                command = [executable] + (["--incognito"] if private else []) + [url]
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def type_text(self, text):
+        # xdotool sends the whole string in one process with no delay between keys
+        if shutil.which("xdotool"):
+            subprocess.run(["xdotool", "type", "--delay", "0", "--clearmodifiers", "--", text], check=True)
+        else:
+            super().type_text(text)
+
+    def suspend(self):
+        subprocess.Popen(["systemctl", "suspend"])
+
+
+class RecordingBackend(ActionBackend):
+    """Performs nothing and records every call with its time, for tests and benchmarks
+
+    Keeps a simulated volume, mute state and cursor position so commands
+    that read state behave as on a real desktop.
+    """
+
+    name = "recording"
+
+    def __init__(self, screen_size=(1920, 1080), active_window=None, volume=0.5, clock=time.monotonic):
+        self.clock = clock
+        self.calls = []
+        self.lock = threading.Lock()
+        self._screen_size = tuple(screen_size)
+        self.active_window = active_window
+        self.level = volume
+        self.is_muted = False
+        self.cursor = (0, 0)
+
+    def _record(self, name, *args):
+        with self.lock:
+            self.calls.append((self.clock(), name, args))
+
+    def names(self):
+        """Names of the recorded calls, oldest first"""
+        with self.lock:
+            return [name for _, name, _ in self.calls]
+
+    def clear(self):
+        with self.lock:
+            self.calls.clear()
+
+    def volume(self):
+        return self.level
+
+    def set_volume(self, level):
+        self._record("set_volume", level)
+        self.level = level
+
+    def muted(self):
+        return self.is_muted
+
+    def set_mute(self, muted):
+        self._record("set_mute", muted)
+        self.is_muted = bool(muted)
+
+    def hotkey(self, *keys):
+        self._record("hotkey", *keys)
+
+    def press(self, key):
+        self._record("press", key)
+
+    def type_text(self, text):
+        self._record("type_text", text)
+
+    def move_cursor(self, x, y):
+        self._record("move_cursor", x, y)
+        self.cursor = (x, y)
+
+    def click(self, button="left", clicks=1):
+        self._record("click", button, clicks)
+
+    def mouse_down(self):
+        self._record("mouse_down")
+
+    def mouse_up(self):
+        self._record("mouse_up")
+
+    def scroll(self, amount):
+        self._record("scroll", amount)
+
+    def screen_size(self):
+        return self._screen_size
+
+    def screenshot(self, out=None):
+        self._record("screenshot")
+        width, height = self._screen_size
+        if out is None or out.shape != (height, width, 3):
+            return np.zeros((height, width, 3), dtype=np.uint8)
+        out.fill(0)
+        return out
+
+    def active_window_title(self):
+        return self.active_window
+
+    def open_url(self, url, browser=None, private=False):
+        self._record("open_url", url, browser, private)
+
+    def suspend(self):
+        self._record("suspend")
+
+
+BACKENDS = {
+    "windows": WindowsBackend,
+    "linux": LinuxBackend,
+    "recording": RecordingBackend,
+}
+
+
+def get_backend(name=None):
+    """Build the named backend, or the one for this platform"""
+    if name is None:
+        name = "windows" if sys.platform == "win32" else "linux"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown action backend {name!r}; choose from {', '.join(sorted(BACKENDS))}")
+    return BACKENDS[name]()
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+ActionResult = namedtuple("ActionResult", ["name", "status", "value", "error", "latency"])
+
+
+class _Action:
+    __slots__ = ("name", "func", "args", "kwargs", "coalesce_key", "deadline", "submitted_at")
+
+    def __init__(self, name, func, args, kwargs, coalesce_key, deadline, submitted_at):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.coalesce_key = coalesce_key
+        self.deadline = deadline
+        self.submitted_at = submitted_at
+
+
+class ActionExecutor:
+    """Runs OS actions on a dedicated worker thread so the frame loop never waits on them
+
+    Actions run one at a time, in submission order, all on the same worker
+    thread. An action submitted with a coalesce_key replaces a pending
+    action with the same key when that action is the last one queued, so a
+    burst of cursor moves collapses to the latest target without reordering
+    it around clicks. A timeout covers both the time spent waiting in the
+    queue and the time spent running: actions still queued past their
+    deadline are skipped, and ones that ran past it are reported as timed
+    out. A hung OS call holds up the queue rather than letting the next
+    action run beside it.
+
+    When more than max_pending actions are queued the oldest one with a
+    timeout or a coalesce_key is dropped. Actions with neither, such as
+    mouse_up or typed text, are never dropped.
+    """
+
+    def __init__(self, on_result=None, max_pending=64):
+        self.on_result = on_result
+        self.max_pending = max_pending
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.running = True
+        self.dropped = 0
+        self.coalesced = 0
+
+        self.worker = threading.Thread(target=self._worker_loop, name="action-executor", daemon=True)
+        self.worker.start()
+
+    def submit(self, name, func, *args, coalesce_key=None, timeout=None, **kwargs):
+        """Queue func(*args, **kwargs) to run on the worker thread"""
+        now = time.monotonic()
+        deadline = now + timeout if timeout is not None else None
+        action = _Action(name, func, args, kwargs, coalesce_key, deadline, now)
+
+        with self.condition:
+            if (coalesce_key is not None and self.pending
+                    and self.pending[-1].coalesce_key == coalesce_key):
+                self.pending[-1] = action
+                self.coalesced += 1
+            else:
+                if len(self.pending) >= self.max_pending:
+                    self._drop_oldest()
+                self.pending.append(action)
+            self.condition.notify()
+
+    def _drop_oldest(self):
+        for i, pending in enumerate(self.pending):
+            if pending.deadline is not None or pending.coalesce_key is not None:
+                del self.pending[i]
+                self.dropped += 1
+                return
+
+    def _worker_loop(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                action = self.pending.popleft()
+            self._report(self._execute(action))
+
+    def _execute(self, action):
+        start = time.monotonic()
+        if action.deadline is not None and start >= action.deadline:
+            return ActionResult(action.name, "expired", None, None, start - action.submitted_at)
+
+        try:
+            value = action.func(*action.args, **action.kwargs)
+        except Exception as e:
+            return ActionResult(action.name, "error", None, e, time.monotonic() - action.submitted_at)
+        end = time.monotonic()
+        if action.deadline is not None and end > action.deadline:
+            return ActionResult(action.name, "timeout", value, None, end - action.submitted_at)
+        return ActionResult(action.name, "ok", value, None, end - action.submitted_at)
+
+    def _report(self, result):
+        if self.on_result is not None:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                print(f"Action result handler error: {str(e)}")
+
+    def close(self, wait=True, timeout=2.0):
+        """Stop accepting work; pending actions still run unless wait is False
+
+        With wait, returns once the queue has drained or after timeout
+        seconds, whichever comes first; a hung action is left to the daemon
+        worker.
+        """
+        with self.condition:
+            if not wait:
+                self.pending.clear()
+            self.running = False
+            self.condition.notify_all()
+        if wait:
+            self.worker.join(timeout)
+            if self.worker.is_alive():
+                print(f"Action worker still busy after {timeout:g}s; {len(self.pending)} actions not run")
@@ -0,0 +1,211 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+
+from action_backends import RecordingBackend
+from frame_sources import open_source
+from landmark_session import SessionReader, replay
+from preprocess import FramePreprocessor
+from roi_tracker import RoiTracker
+from inference_scheduler import InferenceScheduler
+from stage_timing import LatencyRecorder
+
+STAGE_ORDER = ["capture", "flip", "color", "inference", "classify",
+               "action_dispatch", "overlay", "action", "frame"]
+
+
+class ContTarget:
+    """Drives the cursor controller loop in cont.py"""
+
+    name = "cont"
+
+    def __init__(self, timings, roi=False, scheduler=None, mirror_image=True):
+        import cont
+        cont.setup("recording")
+        cont.timings = timings
+        cont.roi_tracker = RoiTracker() if roi else None
+        cont.scheduler = scheduler
+        cont.preprocessor = FramePreprocessor(mirror_image)
+        self.cont = cont
+        self.preprocessor = cont.preprocessor
+
+    def process_frame(self, image):
+        return self.cont.process_frame(image)
+
+    def draw_overlay(self, image, result):
+        results, status_text = result
+        self.cont.draw_overlay(image, results, status_text)
+
+    def handle_hands(self, hands, timestamp):
+        self.cont.handle_hands(hands, 480, 640, timestamp)
+
+    def close(self):
+        self.cont.executor.close()
+
+
+class MainTarget:
+    """Drives HandGestureControl in main.py"""
+
+    name = "main"
+
+    def __init__(self, timings, roi=False, scheduler=None, mirror_image=True):
+        from main import HandGestureControl
+        self.controller = HandGestureControl(source=None, roi=roi, scheduler=scheduler,
+                                             mirror_image=mirror_image, backend=RecordingBackend())
+        self.controller.timings = timings
+        self.preprocessor = self.controller.preprocessor
+
+    def process_frame(self, image):
+        return self.controller.process_frame(image)
+
+    def draw_overlay(self, image, detections):
+        self.controller.draw_overlay(image, detections)
+
+    def handle_hands(self, hands, timestamp):
+        self.controller.handle_hands(hands, timestamp)
+
+    def close(self):
+        # Let queued actions finish so their latency is recorded
+        self.controller.executor.close()
+        self.controller.close()
+
+
+TARGETS = {"cont": ContTarget, "main": MainTarget}
+
+
+def run_frames(target, source, timings, frames, warmup=0, draw=True):
+    """Run the full capture -> flip -> process -> overlay path over a frame source"""
+    count = 0
+    frame = None
+    start = time.perf_counter()
+    while frames is None or count < frames + warmup:
+        if count == warmup:
+            # Discard warm-up samples such as MediaPipe graph initialisation
+            timings.samples.clear()
+            start = time.perf_counter()
+
+        with timings.stage("frame"):
+            with timings.stage("capture"):
+                frame = source.read(frame)
+            if frame is None:
+                break
+            with timings.stage("flip"):
+                image = target.preprocessor.mirror(frame)
+            result = target.process_frame(image)
+            if draw:
+                with timings.stage("overlay"):
+                    image = target.preprocessor.display(image)
+                    target.draw_overlay(image, result)
+        count += 1
+    return max(count - warmup, 0), time.perf_counter() - start
+
+
+def run_session(target, reader, timings):
+    """Run recorded landmarks through classification and action dispatch at full speed"""
+    start = time.perf_counter()
+    for timestamp, hands in replay(reader, realtime=False):
+        with timings.stage("frame"):
+            target.handle_hands(hands, timestamp)
+    return len(reader), time.perf_counter() - start
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_summary(report):
+    lines = [f"{report['target']} on {report['input']}: {report['frames']} frames "
+             f"in {report['elapsed_s']:.2f}s ({report['fps']:.1f} FPS)",
+             f"{'stage':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+    for stage in sorted(report["stages"], key=lambda s: STAGE_ORDER.index(s) if s in STAGE_ORDER else 99):
+        s = report["stages"][stage]
+        lines.append(f"{stage:<16}{s['count']:>8}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+    return "\n".join(lines)
+
+
+def format_comparison(report, baseline):
+    lines = [f"Compared with {baseline.get('commit') or 'baseline'}:",
+             f"{'stage':<16}{'p50 ms':>18}{'p95 ms':>18}"]
+    for stage, s in report["stages"].items():
+        old = baseline["stages"].get(stage)
+        if not old:
+            continue
+        lines.append(f"{stage:<16}"
+                     f"{old['p50_ms']:>8.3f} -> {s['p50_ms']:<7.3f}"
+                     f"{old['p95_ms']:>8.3f} -> {s['p95_ms']:<7.3f}")
+    lines.append(f"{'fps':<16}{baseline['fps']:>8.1f} -> {report['fps']:.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency and throughput benchmark")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="cont",
+                        help="which controller loop to drive")
+    parser.add_argument("--source", default="synthetic",
+                        help="camera index, video file, image directory or synthetic[:pattern]")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="drive classification and actions from a recorded session instead")
+    parser.add_argument("--frames", type=int, default=300, help="frames to measure")
+    parser.add_argument("--warmup", type=int, default=10, help="frames to run before measuring")
+    parser.add_argument("--fps", type=float, help="pace the input source to this frame rate")
+    parser.add_argument("--roi", action="store_true", help="crop inference input around the tracked hand")
+    parser.add_argument("--motion-gate", action="store_true", help="gate inference on frame motion")
+    parser.add_argument("--mirror-landmarks", action="store_true",
+                        help="mirror landmark coordinates instead of flipping every frame")
+    parser.add_argument("--no-overlay", action="store_true", help="skip overlay drawing")
+    parser.add_argument("--output", metavar="PATH", help="write the JSON report here")
+    parser.add_argument("--compare", metavar="PATH", help="print deltas against an earlier JSON report")
+    args = parser.parse_args()
+
+    timings = LatencyRecorder()
+    scheduler = InferenceScheduler() if args.motion_gate else None
+    target = TARGETS[args.target](timings, roi=args.roi, scheduler=scheduler,
+                                  mirror_image=not args.mirror_landmarks)
+    try:
+        if args.replay:
+            frames, elapsed = run_session(target, SessionReader(args.replay), timings)
+            input_name = args.replay
+        else:
+            source = open_source(args.source, fps=args.fps)
+            try:
+                frames, elapsed = run_frames(target, source, timings, args.frames,
+                                             args.warmup, draw=not args.no_overlay)
+            finally:
+                source.close()
+            input_name = args.source
+    finally:
+        target.close()
+
+    report = {
+        "target": target.name,
+        "input": input_name,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.platform(),
+        "frames": frames,
+        "elapsed_s": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "stages": timings.summary(),
+    }
+
+    if scheduler:
+        report["scheduler"] = dict(scheduler.counts)
+
+    print(format_summary(report))
+    if args.compare:
+        with open(args.compare) as f:
+            print(format_comparison(report, json.load(f)))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
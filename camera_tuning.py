@@ -0,0 +1,215 @@
+import json
+import os
+import time
+
+import cv2
+
+# Tried in this order when modes are otherwise equal; MJPG needs far less USB bandwidth than raw YUYV
+FOURCC_PREFERENCE = ("MJPG", "YUYV")
+COMMON_RESOLUTIONS = ((320, 240), (424, 240), (640, 360), (640, 480), (800, 600), (960, 540),
+                      (1280, 720), (1920, 1080))
+FRAME_RATES = (60, 30)
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'gesture_control', 'camera_modes.json')
+
+
+def fourcc_code(name):
+    return cv2.VideoWriter_fourcc(*name)
+
+
+def fourcc_name(value):
+    """Four-character code from the float cap.get(CAP_PROP_FOURCC) returns"""
+    value = int(value)
+    if value <= 0:
+        return ""
+    return "".join(chr((value >> 8 * i) & 0xFF) for i in range(4))
+
+
+class CaptureMode:
+    """One camera configuration and, once probed, its measured frame interval"""
+
+    def __init__(self, fourcc, width, height, fps, buffer_size=1, interval=None):
+        self.fourcc = fourcc
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = float(fps)
+        self.buffer_size = buffer_size
+        self.interval = interval  # Mean seconds between frames, measured while probing
+
+    @property
+    def pixels(self):
+        return self.width * self.height
+
+    def same_format(self, other):
+        return (self.fourcc, self.width, self.height) == (other.fourcc, other.width, other.height)
+
+    def describe(self):
+        text = f"{self.fourcc or '?'} {self.width}x{self.height} @ {self.fps:g} fps"
+        if self.interval:
+            text += f" (measured {1 / self.interval:.1f} fps)"
+        if self.buffer_size:
+            text += f", buffer {self.buffer_size}"
+        return text
+
+    def to_dict(self):
+        return {"fourcc": self.fourcc, "width": self.width, "height": self.height, "fps": self.fps,
+                "buffer_size": self.buffer_size, "interval": self.interval}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["fourcc"], data["width"], data["height"], data["fps"],
+                   data.get("buffer_size"), data.get("interval"))
+
+
+def apply_mode(cap, mode):
+    """Configure a capture and return the mode the driver actually settled on
+
+    FOURCC goes first: V4L2 drivers only offer some sizes and rates in
+    each pixel format.
+    """
+    cap.set(cv2.CAP_PROP_FOURCC, fourcc_code(mode.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    cap.set(cv2.CAP_PROP_FPS, mode.fps)
+    buffer_size = None
+    # One buffered frame keeps the driver from handing out stale frames; not every backend supports it
+    if mode.buffer_size and cap.set(cv2.CAP_PROP_BUFFERSIZE, mode.buffer_size):
+        buffer_size = int(cap.get(cv2.CAP_PROP_BUFFERSIZE)) or None
+    return CaptureMode(fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)), cap.get(cv2.CAP_PROP_FRAME_WIDTH),
+                       cap.get(cv2.CAP_PROP_FRAME_HEIGHT), cap.get(cv2.CAP_PROP_FPS), buffer_size)
+
+
+def device_key(device, cap=None):
+    """Cache key for a camera: capture backend, index and, on Linux, the device name"""
+    backend = ""
+    if cap is not None and hasattr(cap, "getBackendName"):
+        try:
+            backend = cap.getBackendName()
+        except cv2.error:
+            pass
+    name = ""
+    try:
+        with open(f"/sys/class/video4linux/video{device}/name", encoding="utf-8") as f:
+            name = f.read().strip()
+    except OSError:
+        pass
+    return f"{backend}:{device}:{name}"
+
+
+class CaptureTuner:
+    """Picks the lowest-latency camera mode for a target inference size and caches it per device
+
+    Probing tries each preferred FOURCC at the smallest resolutions that
+    still cover target_size and at every rate in frame_rates, reads back
+    what the driver really chose and times a few frames in each distinct
+    mode. The interval includes the decode time, so it stands in for the
+    latency a mode adds. Modes within tolerance of the shortest interval
+    count as fast enough, and among those the one with fewest pixels is
+    used, since it decodes and converts fastest; ties go to the shorter
+    interval, then the preferred FOURCC. The buffer size is set to one
+    frame wherever the backend allows.
+
+    The result is stored in a JSON file keyed by device_key(), so later
+    starts only apply the cached mode and check that the driver accepted
+    it; retune probes again anyway. clock is replaceable so a simulated
+    camera can be probed in virtual time.
+    """
+
+    def __init__(self, target_size=(640, 480), cache_path=DEFAULT_CACHE, sizes_per_format=2, warmup=5,
+                 frames=10, tolerance=0.1, fourccs=FOURCC_PREFERENCE, resolutions=COMMON_RESOLUTIONS,
+                 frame_rates=FRAME_RATES, retune=False, clock=time.perf_counter):
+        self.target_size = tuple(target_size)
+        self.cache_path = cache_path
+        self.sizes_per_format = sizes_per_format
+        self.warmup = warmup
+        self.frames = frames
+        self.tolerance = tolerance
+        self.fourccs = fourccs
+        self.resolutions = resolutions
+        self.frame_rates = frame_rates
+        self.retune = retune
+        self.clock = clock
+
+    def candidates(self):
+        """Modes to try, most preferred first"""
+        width, height = self.target_size
+        covering = sorted((size for size in self.resolutions if size[0] >= width and size[1] >= height),
+                          key=lambda size: size[0] * size[1])
+        sizes = covering[:self.sizes_per_format] or [max(self.resolutions, key=lambda size: size[0] * size[1])]
+        return [CaptureMode(fourcc, w, h, fps)
+                for fourcc in self.fourccs for w, h in sizes for fps in self.frame_rates]
+
+    def measure(self, cap):
+        """Mean seconds per frame after warm-up, or None when the camera delivers nothing"""
+        image = None
+        for _ in range(self.warmup):
+            success, image = cap.read(image=image)
+            if not success:
+                return None
+        start = self.clock()
+        for _ in range(self.frames):
+            success, image = cap.read(image=image)
+            if not success:
+                return None
+        return (self.clock() - start) / self.frames
+
+    def choose(self, modes):
+        """The preferred mode among probed ones, or None when none delivered frames"""
+        modes = [mode for mode in modes if mode.interval]
+        if not modes:
+            return None
+        fastest = min(mode.interval for mode in modes)
+        equal = [mode for mode in modes if mode.interval <= fastest * (1 + self.tolerance)]
+        order = {fourcc: i for i, fourcc in enumerate(self.fourccs)}
+        return min(equal, key=lambda mode: (mode.pixels, mode.interval, order.get(mode.fourcc, len(order))))
+
+    def probe(self, cap):
+        """Try every candidate mode; returns the probed modes with their intervals"""
+        probed = []
+        for candidate in self.candidates():
+            actual = apply_mode(cap, candidate)
+            # Drivers snap unsupported requests to a mode that may already be measured
+            if any(actual.same_format(mode) and abs(actual.fps - mode.fps) < 0.5 for mode in probed):
+                continue
+            actual.interval = self.measure(cap)
+            probed.append(actual)
+        return probed
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self, cache):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = self.cache_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(temporary, self.cache_path)
+
+    def tune(self, cap, key):
+        """Configure cap for the device named key; returns (mode, from_cache)"""
+        cache = self.load_cache()
+        entry = cache.get(key)
+        if entry and not self.retune and tuple(entry.get("target", ())) == self.target_size:
+            cached = CaptureMode.from_dict(entry["mode"])
+            actual = apply_mode(cap, cached)
+            if actual.same_format(cached):
+                actual.interval = cached.interval
+                return actual, True
+
+        best = self.choose(self.probe(cap))
+        if best is None:
+            raise IOError("The camera delivered no frames in any mode")
+        actual = apply_mode(cap, best)
+        actual.interval = best.interval
+        cache[key] = {"target": list(self.target_size), "mode": actual.to_dict(), "probed_at": time.time()}
+        try:
+            self.save_cache(cache)
+        except OSError as e:
+            print(f"Could not save the camera mode cache: {str(e)}")
+        return actual, False
+
@@ -1,332 +1,227 @@
+import argparse
 import cv2
-import mediapipe as mp
-import pyautogui
 import numpy as np
-import speech_recognition as sr
-import threading
+import os
 import time
-import pynput
-from pynput.keyboard import Key, Controller
-from screeninfo import get_monitors
-
-# Initialize MediaPipe hands
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
-)
-mp_drawing = mp.solutions.drawing_utils
-
-# Initialize keyboard controller
-keyboard = Controller()
-
-# Get screen dimensions
+from collections import Counter, deque
+
+from hand_model import HandModel
+from action_backends import get_backend, BACKENDS
+from dictation import Dictation, MicrophoneSource, WavFileSource, make_recognizer, RECOGNIZERS
+from gesture_classifier import load_classifier, CURSOR_GESTURES
+from gesture_state import GestureStateMachine, ActionCooldowns
+from hand_tracking import HandTracker, PinchZoom
+from trajectory import MotionRecognizer
+from pipeline import FramePipeline
+from multi_stream import MultiStreamInference, StreamFusion
+from cursor_filter import CursorDriver, OneEuroFilter, LerpFilter, CURSOR_FILTERS
+from control import ControlChannel, OverlaySubscriber
+from action_executor import ActionExecutor
+from frame_sources import open_source
+from camera_tuning import CaptureTuner, DEFAULT_CACHE
+from landmark_session import SessionWriter, SessionReader, replay, hands_from_results
+from preprocess import FramePreprocessor
+from roi_tracker import RoiTracker
+from inference_scheduler import InferenceScheduler, RUN, REUSE, SKIP
+from stage_timing import NULL_RECORDER
+from event_log import EventLog, NULL_EVENT_LOG
+from metrics import Metrics, MetricsExporter, FrameProfiler, NULL_METRICS
+
+# Keyboard, mouse and screen operations, picked by setup(); --backend picks another one
+backend = None
+
+# MediaPipe hands; loaded in the background once the camera starts, or on the first frame
+hand_model = HandModel(max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+
+# Screen dimensions, read from the backend when tracking starts
 screen_width, screen_height = 0, 0
-for m in get_monitors():
-    screen_width = m.width
-    screen_height = m.height
-    break
 
 # Variables for controlling cursor
 prev_x, prev_y = 0, 0
-smoothing = 8  # Smoothing factor for cursor movement
+smoothing = 8  # Smoothing factor for cursor movement with --cursor-filter lerp
+cursor_hz = 0  # Cursor driver refresh rate; 0 moves the cursor only on inference frames
 is_tracking = False
 is_dragging = False
 clicking = False
 is_text_field = False
-last_gesture = None
-gesture_hold_frames = 0
-required_hold_frames = 5  # How many frames a gesture must be held to activate
 
-# Variables for voice recognition
+# One-shot actions get a cooldown (seconds) so holding them does not repeat every frame
+action_cooldowns = ActionCooldowns({
+    "v_sign": 1.0,
+    "three_fingers": 1.0,
+    "thumb_up": 1.0,
+    "thumb_down": 1.0,
+    "rock_gesture": 1.0,
+    # Flat-hand motions
+    "swipe_right": 0.5,
+    "swipe_left": 0.5,
+    "swipe_up": 0.5,
+    "swipe_down": 0.5,
+    "circle": 1.0,
+    "push": 1.0,
+})
+
+# Voice dictation; the microphone opens the first time voice is activated
 voice_active = False
-recognizer = sr.Recognizer()
-mic = sr.Microphone()
-
-# Calibrate the recognizer for ambient noise
-with mic as source:
-    recognizer.adjust_for_ambient_noise(source)
-
-# Define gesture detection functions
-def detect_open_palm(landmarks):
-    # Check if fingers are extended
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    
-    wrist = landmarks[0]
-    
-    # Check vertical positions of fingertips relative to palm
-    all_fingers_up = (
-        thumb_tip.y < wrist.y and
-        index_tip.y < wrist.y and
-        middle_tip.y < wrist.y and
-        ring_tip.y < wrist.y and
-        pinky_tip.y < wrist.y
-    )
-    
-    # Check fingers are spread out (not in a fist)
-    fingers_spread = (
-        abs(thumb_tip.x - index_tip.x) > 0.04 and
-        abs(index_tip.x - pinky_tip.x) > 0.1
-    )
-    
-    return all_fingers_up and fingers_spread
-
-def detect_pinch(landmarks):
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    
-    # Calculate distance between thumb tip and index tip
-    distance = ((thumb_tip.x - index_tip.x) ** 2 + 
-                (thumb_tip.y - index_tip.y) ** 2) ** 0.5
-                
-    # Distance threshold for pinch detection
-    return distance < 0.04
-
-def detect_ok_sign(landmarks):
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    index_pip = landmarks[6]  # Lower joint of index finger
-    
-    # Calculate distance between thumb tip and index PIP
-    distance = ((thumb_tip.x - index_pip.x) ** 2 + 
-                (thumb_tip.y - index_pip.y) ** 2) ** 0.5
-                
-    # Check if thumb and index are forming a circle
-    is_circle = distance < 0.05
-    
-    # Make sure other fingers are extended
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    other_fingers_extended = (
-        middle_tip.y < wrist.y and
-        ring_tip.y < wrist.y and
-        pinky_tip.y < wrist.y
-    )
-    
-    return is_circle and other_fingers_extended
-
-def detect_v_sign(landmarks):
-    # Check if index and middle fingers are extended while others are closed
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    # Index and middle fingers up
-    v_sign = (
-        index_tip.y < wrist.y and
-        middle_tip.y < wrist.y and
-        ring_tip.y > wrist.y and
-        pinky_tip.y > wrist.y
-    )
-    
-    # Check if index and middle are spread apart
-    fingers_spread = abs(index_tip.x - middle_tip.x) > 0.04
-    
-    return v_sign and fingers_spread
-
-def detect_three_fingers(landmarks):
-    # Check if index, middle, and ring fingers are extended while others are closed
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    thumb_tip = landmarks[4]
-    wrist = landmarks[0]
-    
-    return (
-        index_tip.y < wrist.y and
-        middle_tip.y < wrist.y and
-        ring_tip.y < wrist.y and
-        pinky_tip.y > wrist.y and
-        thumb_tip.y > wrist.y
-    )
-
-def detect_all_finger_pinch(landmarks):
-    # Check if all fingertips are close to thumb tip
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    
-    # Calculate distances
-    distances = [
-        ((thumb_tip.x - finger_tip.x) ** 2 + (thumb_tip.y - finger_tip.y) ** 2) ** 0.5
-        for finger_tip in [index_tip, middle_tip, ring_tip, pinky_tip]
-    ]
-    
-    # All distances should be small for a pinch with all fingers
-    return all(d < 0.07 for d in distances)
-
-def detect_fist(landmarks):
-    # Check if all fingers are curled into a fist
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    # In a fist, all fingertips are below middle palm position and close to palm
-    all_curled = (
-        thumb_tip.y > wrist.y and
-        index_tip.y > wrist.y and
-        middle_tip.y > wrist.y and
-        ring_tip.y > wrist.y and
-        pinky_tip.y > wrist.y
-    )
-    
-    # Check fingers are not spread out (compact fist)
-    compact = (
-        abs(index_tip.x - pinky_tip.x) < 0.1
-    )
-    
-    return all_curled and compact
-
-def detect_thumb_up(landmarks):
-    # Check if thumb is extended upward while other fingers are curled
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    thumb_up = thumb_tip.y < wrist.y - 0.1  # Thumb is significantly above wrist
-    
-    # Other fingers are curled
-    other_fingers_curled = (
-        index_tip.y > wrist.y and
-        middle_tip.y > wrist.y and
-        ring_tip.y > wrist.y and
-        pinky_tip.y > wrist.y
-    )
-    
-    return thumb_up and other_fingers_curled
-
-def detect_thumb_down(landmarks):
-    # Check if thumb is extended downward while other fingers are curled
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    thumb_down = thumb_tip.y > wrist.y + 0.1  # Thumb is significantly below wrist
-    
-    # Other fingers are curled
-    other_fingers_curled = (
-        index_tip.y > wrist.y and
-        middle_tip.y > wrist.y and
-        ring_tip.y > wrist.y and
-        pinky_tip.y > wrist.y
-    )
-    
-    return thumb_down and other_fingers_curled
-
-def detect_rock_gesture(landmarks):
-    # Rock gesture: pinky and thumb extended, others curled (🤘)
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    return (
-        thumb_tip.y < wrist.y and  # Thumb extended
-        index_tip.y > wrist.y and  # Index curled
-        middle_tip.y > wrist.y and  # Middle curled
-        ring_tip.y > wrist.y and  # Ring curled
-        pinky_tip.y < wrist.y  # Pinky extended
-    )
-
-def detect_flat_hand(landmarks):
-    # Flat hand: all fingers extended and together
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    middle_tip = landmarks[12]
-    ring_tip = landmarks[16]
-    pinky_tip = landmarks[20]
-    wrist = landmarks[0]
-    
-    all_extended = (
-        index_tip.y < wrist.y and
-        middle_tip.y < wrist.y and
-        ring_tip.y < wrist.y and
-        pinky_tip.y < wrist.y
-    )
-    
-    # Fingers are close to each other (not spread)
-    fingers_together = (
-        abs(index_tip.x - middle_tip.x) < 0.03 and
-        abs(middle_tip.x - ring_tip.x) < 0.03 and
-        abs(ring_tip.x - pinky_tip.x) < 0.03
-    )
-    
-    return all_extended and fingers_together
-
-# Function for voice recognition
-def voice_recognition():
-    global voice_active, is_text_field
-    
-    while True:
-        if voice_active and is_text_field:
-            try:
-                with mic as source:
-                    print("Listening...")
-                    audio = recognizer.listen(source, timeout=5)
-                
-                try:
-                    text = recognizer.recognize_google(audio)
-                    print(f"Recognized: {text}")
-                    
-                    # Type the recognized text
-                    for char in text:
-                        keyboard.press(char)
-                        keyboard.release(char)
-                        time.sleep(0.01)
-                    
-                except sr.UnknownValueError:
-                    print("Could not understand audio")
-                except sr.RequestError as e:
-                    print(f"Speech recognition error: {e}")
-                
-                # After processing voice, pause for a moment
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"Error in voice recognition: {e}")
-                time.sleep(1)
+dictation = None
+dictation_typed = False  # Whether to put a space before the next utterance
+voice_options = {"recognizer": "google", "model": None, "transcript": None, "audio_input": None}
+
+# Gesture rules compiled from a config file by setup(), and reusable landmark buffers, one per hand
+classifier = None
+landmark_buffers = np.empty((2, 21, 3), dtype=np.float32)
+
+# Optional landmark recorder for offline replay
+recorder = None
+
+# Flip and colour conversion into reusable buffers
+preprocessor = FramePreprocessor()
+
+# Picks and caches the camera's FOURCC, resolution, frame rate and buffer size for 640x480 inference
+camera_tuner = CaptureTuner((640, 480))
+
+# Optional hand region-of-interest cropping for cheaper inference
+roi_tracker = None
+
+# Optional motion-gated inference scheduler and the results it reuses
+scheduler = None
+last_results = None
+last_hands = []
+last_status_text = "Show open palm to activate"
+
+# Set once the preview window has been shown; headless runs never open one
+window_open = False
+
+# Per-stage latency recorder, replaced by benchmark.py
+timings = NULL_RECORDER
+
+# Recent distinct action statuses, and the structured event log set up by --event-log
+command_history = deque(maxlen=50)
+event_log = NULL_EVENT_LOG
+
+def use_metrics(registry):
+    """Point the counters and stage timings at a metrics registry"""
+    global metrics, timings, frame_counter, gesture_counter, action_counter
+    
+    metrics = registry
+    if registry.enabled:
+        timings = registry
+    frame_counter = registry.counter("frames_total", "Frames handled, by inference scheduler decision",
+                                     ("decision",))
+    gesture_counter = registry.counter("gestures_total", "Per-frame classification of each detected hand",
+                                       ("gesture",))
+    action_counter = registry.counter("actions_total", "Actions finished, by outcome", ("action", "outcome"))
+
+# Counters for the metrics endpoint; --metrics-port or --metrics-file enables them
+use_metrics(NULL_METRICS)
+
+# Optional cProfile dumps of sampled frames
+profiler = FrameProfiler()
+
+def type_dictation(text):
+    global dictation_typed
+    
+    if dictation_typed:
+        text = " " + text
+    dictation_typed = True
+    # Typed on the action worker so it never interleaves with shortcut keys
+    executor.submit("type", backend.type_text, text)
+
+def set_voice_active(active):
+    """Start or pause dictation, starting the audio capture the first time"""
+    global voice_active, dictation, dictation_typed
+    
+    if active and not voice_active:
+        dictation_typed = False
+    voice_active = active
+    if active and dictation is None:
+        if voice_options["audio_input"]:
+            source = WavFileSource(voice_options["audio_input"], realtime=True)
         else:
-            time.sleep(0.5)
+            source = MicrophoneSource()
+        recognizer = make_recognizer(voice_options["recognizer"], voice_options["model"],
+                                     voice_options["transcript"])
+        dictation = Dictation(source, recognizer, type_dictation).start()
+    if dictation is not None:
+        dictation.active = active
+
+def new_hand_state():
+    """Per-hand gesture debouncing and motion (swipe, circle, push) tracking
+    
+    Gestures must hold for 0.15 s to activate whatever the frame rate.
+    """
+    return GestureStateMachine(hold_time=0.15, window=0.25), MotionRecognizer()
 
-# Start voice recognition in a separate thread
-voice_thread = threading.Thread(target=voice_recognition, daemon=True)
-voice_thread.start()
+# Each detected hand keeps its own state under a stable track ID
+hand_tracker = HandTracker(new_hand_state)
 
-# Gesture state tracking
-last_swipe_x = 0
-last_flat_hand_detection = 0
+# Two hands pinching zoom in and out instead of moving the cursor
+pinch_zoom = PinchZoom()
+
+# Status text and keys for motions made with a flat hand
+MOTION_KEYS = {
+    "swipe_right": ("Backspace", ("backspace",)),
+    "swipe_left": ("Delete", ("delete",)),
+    "swipe_up": ("Page up", ("pageup",)),
+    "swipe_down": ("Page down", ("pagedown",)),
+    "circle": ("Undo", ("ctrl", "z")),
+    "push": ("Enter pressed", ("enter",)),
+}
+
+def report_action_result(result):
+    timings.add("action", result.latency)
+    action_counter.inc((result.name, result.status))
+    # Cursor moves arrive at camera rate and would swamp the log
+    if result.name != "move":
+        event_log.log("action", action=result.name, outcome=result.status, latency=round(result.latency, 4),
+                      detail=str(result.error) if result.error is not None else None)
+    if result.status != "ok":
+        print(f"Action {result.name} {result.status}: {result.error}")
+
+# OS actions run on a worker thread, started by setup(), so they never stall the frame loop
+executor = None
+ACTION_TIMEOUT = 1.0  # Drop keyboard/mouse actions that can't run within a second
+
+def move_cursor(x, y):
+    executor.submit("move", backend.move_cursor, x, y, coalesce_key="cursor")
+
+# Filters cursor targets and, once started, moves the cursor at display refresh rate
+cursor = CursorDriver(OneEuroFilter(), move_cursor)
+
+def setup(backend_name=None, gestures=CURSOR_GESTURES):
+    """Pick the action backend, compile the gesture rules and start the action worker
+    
+    None of this happens at import: spawned stream workers import this
+    script again as __mp_main__, and benchmark.py imports it as a module.
+    """
+    global backend, classifier, executor
+    
+    backend = get_backend(backend_name)
+    classifier = load_classifier(gestures)
+    executor = ActionExecutor(on_result=report_action_result)
+
+def click_and_check_text_field():
+    global is_text_field
+    
+    backend.click()
+    
+    # Check if we're clicking on a text field
+    # This is an approximation - in a real app you'd need to detect text fields
+    # more accurately based on the UI elements
+    is_text_field = backend.active_window_title() in ["Notepad", "Word", "TextEdit", "Google Docs"]
+    set_voice_active(is_text_field)
 
 # Function to perform actions based on gestures
-def perform_gesture_action(gesture, landmarks, frame_height, frame_width):
+def perform_gesture_action(gesture, points, frame_height, frame_width, current_time=None, motion=None):
     global is_tracking, is_dragging, clicking, is_text_field, voice_active
-    global prev_x, prev_y, last_swipe_x, last_flat_hand_detection
+    global prev_x, prev_y, screen_width, screen_height
+    
+    if current_time is None:
+        current_time = time.time()
     
     if gesture == "open_palm":
+        if not screen_width:
+            screen_width, screen_height = backend.screen_size()
         is_tracking = True
         is_dragging = False
         clicking = False
@@ -334,125 +229,83 @@ def perform_gesture_action(gesture, landmarks, frame_height, frame_width):
     
     elif gesture == "pinch" and is_tracking:
         # Calculate average position of thumb and index finger for cursor position
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
+        thumb_tip = points[4]
+        index_tip = points[8]
         
-        x = (thumb_tip.x + index_tip.x) / 2
-        y = (thumb_tip.y + index_tip.y) / 2
+        x = float(thumb_tip[0] + index_tip[0]) / 2
+        y = float(thumb_tip[1] + index_tip[1]) / 2
         
         # Convert to screen coordinates with vertical flip (camera is mirrored)
         screen_x = screen_width - (x * screen_width)
         screen_y = y * screen_height
         
         # Apply smoothing
-        if prev_x > 0 and prev_y > 0:
-            screen_x = prev_x + (screen_x - prev_x) / smoothing
-            screen_y = prev_y + (screen_y - prev_y) / smoothing
-        
+        screen_x, screen_y = cursor.update(current_time, screen_x, screen_y)
         prev_x, prev_y = screen_x, screen_y
         
-        # Move cursor
-        pyautogui.moveTo(screen_x, screen_y)
+        # Move cursor; a running cursor driver pushes positions at display rate instead
+        if not cursor.running:
+            move_cursor(screen_x, screen_y)
         return "Moving cursor"
     
     elif gesture == "ok_sign" and is_tracking:
         if not clicking:
-            pyautogui.click()
+            executor.submit("click", click_and_check_text_field, timeout=ACTION_TIMEOUT)
             clicking = True
-            
-            # Check if we're clicking on a text field
-            # This is an approximation - in a real app you'd need to detect text fields
-            # more accurately based on the UI elements
-            active_window = pyautogui.getActiveWindow()
-            if active_window and active_window.title in ["Notepad", "Word", "TextEdit", "Google Docs"]:
-                is_text_field = True
-                voice_active = True
-                return "Clicked - Voice recognition activated"
-            else:
-                is_text_field = False
-                voice_active = False
-                return "Clicked"
+            return "Clicked"
         return "Click held"
     
     elif gesture == "v_sign" and is_tracking:
-        pyautogui.rightClick()
+        executor.submit("right_click", backend.click, "right", timeout=ACTION_TIMEOUT)
         return "Right clicked"
     
     elif gesture == "three_fingers" and is_tracking:
-        pyautogui.doubleClick()
+        executor.submit("double_click", backend.click, "left", 2, timeout=ACTION_TIMEOUT)
         return "Double clicked"
     
     elif gesture == "all_finger_pinch" and is_tracking:
         if not is_dragging:
-            pyautogui.mouseDown()
+            executor.submit("mouse_down", backend.mouse_down)
             is_dragging = True
             return "Started dragging"
         return "Dragging..."
     
     elif gesture == "fist" and is_tracking:
         # Fist gesture for scrolling
-        index_knuckle = landmarks[5]
+        knuckle_y = float(points[5, 1])
         
         # Determine scroll direction based on hand position change
         if prev_y > 0:
-            scroll_amount = (index_knuckle.y * screen_height - prev_y) * 0.1
-            pyautogui.scroll(-int(scroll_amount))
+            scroll_amount = (knuckle_y * screen_height - prev_y) * 0.1
+            executor.submit("scroll", backend.scroll, -int(scroll_amount), timeout=ACTION_TIMEOUT)
         
-        prev_y = index_knuckle.y * screen_height
+        prev_y = knuckle_y * screen_height
         return "Scrolling"
     
     elif gesture == "thumb_up" and is_tracking:
         # Copy
-        pyautogui.hotkey('ctrl', 'c')
+        executor.submit("copy", backend.hotkey, 'ctrl', 'c', timeout=ACTION_TIMEOUT)
         return "Copy"
     
     elif gesture == "thumb_down" and is_tracking:
         # Paste
-        pyautogui.hotkey('ctrl', 'v')
+        executor.submit("paste", backend.hotkey, 'ctrl', 'v', timeout=ACTION_TIMEOUT)
         return "Paste"
     
     elif gesture == "rock_gesture" and is_tracking:
         # Press Enter
-        pyautogui.press('enter')
+        executor.submit("enter", backend.press, 'enter', timeout=ACTION_TIMEOUT)
         return "Enter pressed"
     
     elif gesture == "flat_hand" and is_tracking:
-        # Track horizontal movement for swipe gestures
-        wrist = landmarks[0]
-        current_x = wrist.x
-        
-        # Initialize if first detection
-        if last_swipe_x == 0:
-            last_swipe_x = current_x
-            last_flat_hand_detection = time.time()
+        # Swipe, circle or push with a flat hand
+        if motion not in MOTION_KEYS:
             return "Ready for swipe"
-        
-        time_since_last = time.time() - last_flat_hand_detection
-        
-        # Reset if too much time has passed
-        if time_since_last > 1.0:
-            last_swipe_x = current_x
-            last_flat_hand_detection = time.time()
-            return "Swipe reset"
-        
-        # Check for horizontal swipe
-        if abs(current_x - last_swipe_x) > 0.15:
-            # Left to right swipe (backspace)
-            if current_x > last_swipe_x:
-                pyautogui.press('backspace')
-                result = "Backspace"
-            # Right to left swipe (can add another action)
-            else:
-                pyautogui.press('delete')
-                result = "Delete"
-                
-            # Reset after detecting swipe
-            last_swipe_x = 0
-            return result
-        
-        last_swipe_x = current_x
-        last_flat_hand_detection = time.time()
-        return "Preparing swipe"
+        if not action_cooldowns.ready(motion, current_time):
+            return "Waiting for cooldown"
+        result, keys = MOTION_KEYS[motion]
+        executor.submit(motion, backend.hotkey, *keys, timeout=ACTION_TIMEOUT)
+        return result
     
     else:
         # No specific gesture or tracking not active
@@ -463,90 +316,131 @@ def perform_gesture_action(gesture, landmarks, frame_height, frame_width):
             clicking = False
             return "Waiting for gesture"
 
-# Main loop for webcam processing
-cap = cv2.VideoCapture(0)
-
-# Set smaller resolution for better performance
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-
-while cap.isOpened():
-    success, image = cap.read()
-    if not success:
-        print("Failed to capture from webcam.")
-        break
+def process_frame(image):
+    """Run hand detection on a mirrored BGR frame and act on held gestures
+    
+    Returns the MediaPipe results and the status text for the overlay.
+    """
     
-    # Flip the image horizontally for a more intuitive mirror effect
-    image = cv2.flip(image, 1)
+    global last_results, last_hands, last_status_text
+    
+    # Get image dimensions
+    frame_height, frame_width, _ = image.shape
+    current_time = time.time()
+    
+    # Skip inference, or reuse the last landmarks, when little has moved
+    decision = scheduler.decide(image) if scheduler else RUN
+    frame_counter.inc(decision)
+    if decision == SKIP:
+        return last_results, last_status_text
+    if decision == REUSE:
+        last_status_text = handle_hands(last_hands, frame_height, frame_width, current_time)
+        return last_results, last_status_text
+    
+    # Crop to the tracked hand when ROI tracking is enabled
+    roi = None
+    if roi_tracker:
+        image, roi = roi_tracker.crop(image)
     
     # Convert the BGR image to RGB for MediaPipe
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    with timings.stage("color"):
+        image_rgb = preprocessor.to_rgb(image)
     
     # Process the image with MediaPipe
-    results = hands.process(image_rgb)
+    with timings.stage("inference"):
+        results = hand_model.process(image_rgb)
+    
+    # Map cropped landmarks back to full-frame coordinates
+    if roi_tracker:
+        roi_tracker.update(results, roi, (frame_height, frame_width))
+    preprocessor.fix_results(results)
+    
+    detected_hands = hands_from_results(results, landmark_buffers)
+    if recorder:
+        recorder.write(current_time, detected_hands)
+    if scheduler:
+        scheduler.observe(bool(detected_hands))
+    
+    last_status_text = handle_hands(detected_hands, frame_height, frame_width, current_time)
+    last_results, last_hands = results, detected_hands
+    return results, last_status_text
+
+def handle_hands(detected_hands, frame_height, frame_width, current_time=None):
+    """Classify (handedness, points) pairs and act on gestures held long enough
     
-    # Get image dimensions
-    frame_height, frame_width, _ = image.shape
+    This is the shared path for live frames and recorded sessions.
+    """
+    global is_dragging, clicking
+    
+    if current_time is None:
+        current_time = time.time()
     
     status_text = "Show open palm to activate"
     
     # If hands are detected
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            # Draw hand landmarks
-            mp_drawing.draw_landmarks(
-                image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-            
-            # Get landmark positions
-            landmarks = hand_landmarks.landmark
-            
-            # Detect gestures
-            current_gesture = None
-            
-            if detect_open_palm(landmarks):
-                current_gesture = "open_palm"
-            elif detect_pinch(landmarks):
-                current_gesture = "pinch"
-            elif detect_ok_sign(landmarks):
-                current_gesture = "ok_sign"
-            elif detect_v_sign(landmarks):
-                current_gesture = "v_sign"
-            elif detect_three_fingers(landmarks):
-                current_gesture = "three_fingers"
-            elif detect_all_finger_pinch(landmarks):
-                current_gesture = "all_finger_pinch"
-            elif detect_fist(landmarks):
-                current_gesture = "fist"
-            elif detect_thumb_up(landmarks):
-                current_gesture = "thumb_up"
-            elif detect_thumb_down(landmarks):
-                current_gesture = "thumb_down"
-            elif detect_rock_gesture(landmarks):
-                current_gesture = "rock_gesture"
-            elif detect_flat_hand(landmarks):
-                current_gesture = "flat_hand"
-            
-            # Handle gesture debouncing
-            if current_gesture == last_gesture:
-                gesture_hold_frames += 1
-            else:
-                gesture_hold_frames = 0
-                
-            last_gesture = current_gesture
+    if detected_hands:
+        # Detect gestures for every hand in one batch
+        points = np.stack([hand_points for _, hand_points in detected_hands])
+        with timings.stage("classify"):
+            gestures = classifier.labels(points)
+        for gesture in gestures:
+            gesture_counter.inc(gesture)
+        tracks = hand_tracker.update(current_time, [handedness for handedness, _ in detected_hands], points)
+        
+        # Handle gesture debouncing and motion tracking per hand
+        stable_gestures = []
+        motions = []
+        for track, gesture, hand_points in zip(tracks, gestures, points):
+            gesture_state, motion_recognizer = track.state
+            stable = gesture_state.update(current_time, gesture)
+            motion = motion_recognizer.update(current_time, hand_points)
+            stable_gestures.append(stable)
+            motions.append(motion)
             
-            # Only perform action if gesture is held for enough frames
-            if gesture_hold_frames >= required_hold_frames and current_gesture:
-                status_text = perform_gesture_action(current_gesture, landmarks, frame_height, frame_width)
-            elif is_dragging and current_gesture != "all_finger_pinch":
+            # Log gestures as they become stable, and every motion
+            if stable and gesture_state.active_since == current_time:
+                event_log.log("gesture", t=current_time, gesture=stable, hand=f"{track.handedness}-{track.track_id}",
+                              confidence=round(gesture_state.confidence(current_time), 3))
+            if motion:
+                event_log.log("motion", t=current_time, motion=motion, hand=f"{track.handedness}-{track.track_id}")
+        
+        # Two pinching hands zoom instead of acting on their own
+        zoom = pinch_zoom.update(stable_gestures, points)
+        if pinch_zoom.active:
+            if zoom:
+                executor.submit(zoom, backend.hotkey, 'ctrl', '+' if zoom == "zoom_in" else '-',
+                                timeout=ACTION_TIMEOUT)
+                return "Zoom in" if zoom == "zoom_in" else "Zoom out"
+            return "Zooming"
+        
+        for stable_gesture, motion, hand_points in zip(stable_gestures, motions, points):
+            # Only perform action once the gesture is stable and off cooldown
+            if stable_gesture and action_cooldowns.ready(stable_gesture, current_time):
+                with timings.stage("action_dispatch"):
+                    status_text = perform_gesture_action(stable_gesture, hand_points, frame_height, frame_width,
+                                                         current_time, motion)
+                if not command_history or command_history[-1] != status_text:
+                    command_history.append(status_text)
+            elif stable_gesture:
+                status_text = "Waiting for cooldown"
+            elif is_dragging:
                 # Release mouse if was dragging but no longer using drag gesture
-                pyautogui.mouseUp()
+                executor.submit("mouse_up", backend.mouse_up)
                 is_dragging = False
                 status_text = "Drag ended"
     else:
-        # No hands detected
+        # No hands detected; per-hand state expires with its track
         is_dragging = False
         clicking = False
     
+    return status_text
+
+def draw_overlay(image, results, status_text):
+    # Draw hand landmarks
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
+            hand_model.draw(image, hand_landmarks)
+    
     # Display status text
     cv2.putText(image, f"Status: {status_text}", (10, 30), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
@@ -555,14 +449,291 @@ while cap.isOpened():
     voice_status = "ON" if voice_active else "OFF"
     cv2.putText(image, f"Voice: {voice_status}", (10, 60), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+def open_camera(spec="0", fps=None, prefetch=None):
+    # Set smaller resolution for better performance; the tuner, when enabled, picks the whole mode
+    return open_source(spec, fps=fps, prefetch=prefetch, width=640, height=480, tuner=camera_tuner)
+
+def show_frame(image, result):
+    """Draw the overlay and show the preview window; returns False when 'q' is pressed"""
+    global window_open
     
-    # Display the image
-    cv2.imshow('Hand Gesture Control', image)
+    results, status_text = result
+    image = preprocessor.display(image)
+    draw_overlay(image, results, status_text)
     
-    # Break the loop if 'q' is pressed
-    if cv2.waitKey(5) & 0xFF == ord('q'):
-        break
+    # Display the image
+    with timings.stage("display"):
+        cv2.imshow('Hand Gesture Control', image)
+        window_open = True
+        
+        # Break the loop if 'q' is pressed
+        return cv2.waitKey(1) & 0xFF != ord('q')
+
+def controller_status():
+    return {
+        "status": last_status_text,
+        "last_command": command_history[-1] if command_history else None,
+        "tracking": is_tracking,
+        "dragging": is_dragging,
+        "voice": voice_active,
+    }
+
+def release_resources(source):
+    cursor.stop()
+    executor.close()
+    source.close()
+    if window_open:
+        cv2.destroyAllWindows()
+    if recorder:
+        recorder.close()
+    if dictation:
+        dictation.close()
+    event_log.close()
+    hand_model.close()
 
-# Release resources
-cap.release()
-cv2.destroyAllWindows()
+# Main loop for webcam processing
+def run(source, headless=False, overlay_fps=None, control_address=None):
+    backend.preload()
+    if cursor_hz:
+        cursor.start()
+    overlay = None if headless else OverlaySubscriber(show_frame, overlay_fps)
+    control = ControlChannel(control_address, controller_status).start()
+    process = profiler.wrap(process_frame)
+    frame = None
+    
+    try:
+        while not control.stop_requested:
+            # Capture into the previous frame's memory instead of a new array
+            frame = source.read(frame)
+            if frame is None:
+                print("Failed to capture from webcam.")
+                break
+            
+            # Flip the image horizontally for a more intuitive mirror effect
+            image = preprocessor.mirror(frame)
+            
+            result = process(image)
+            if overlay and not overlay.publish(image, result, time.perf_counter()):
+                break
+    finally:
+        # Release resources
+        control.close()
+        release_resources(source)
+
+# Threaded loop: capture, inference and display each get their own stage
+def run_pipelined(source, headless=False, overlay_fps=None, control_address=None):
+    global preprocessor
+    
+    backend.preload()
+    if cursor_hz:
+        cursor.start()
+    overlay = None if headless else OverlaySubscriber(show_frame, overlay_fps)
+    control = ControlChannel(control_address, controller_status).start()
+    frame = None
+    
+    def capture():
+        nonlocal frame
+        # Mirroring copies the frame into a pooled buffer, so the capture buffer can be reused
+        frame = source.read(frame if preprocessor.mirror_image else None)
+        if frame is None:
+            print("Failed to capture from webcam.")
+            return None
+        # Flip the image horizontally for a more intuitive mirror effect
+        return preprocessor.mirror(frame)
+    
+    def present(image, result):
+        if control.stop_requested:
+            return False
+        if overlay:
+            return overlay.publish(image, result, time.perf_counter())
+        return True
+    
+    # Mirrored frames are queued between threads, so a buffer is only reused once its frame is presented
+    preprocessor = FramePreprocessor(preprocessor.mirror_image, pooled=True)
+    pipeline = FramePipeline(capture, profiler.wrap(process_frame), present, release=preprocessor.release)
+    metrics.gauge("frames_dropped", "Frames dropped between pipeline stages",
+                  lambda: {"before_inference": pipeline.frames.dropped,
+                           "before_presentation": pipeline.results.dropped}, label="queue")
+    try:
+        pipeline.run()
+    finally:
+        control.close()
+        release_resources(source)
+        print(pipeline.format_report())
+
+# One inference process per camera; the camera that sees the hand drives the gestures
+def run_multi_stream(specs, fps=None, control_address=None):
+    backend.preload()
+    if cursor_hz:
+        cursor.start()
+    control = ControlChannel(control_address, controller_status).start()
+    streams = MultiStreamInference([open_camera(spec, fps) for spec in specs],
+                                   hand_options=hand_model.settings(), timings=timings)
+    fusion = StreamFusion()
+    metrics.gauge("stream_frames_dropped", "Frames dropped per camera stream", streams.dropped, label="stream")
+    
+    def handle(stream, t, detected_hands):
+        global last_status_text
+        
+        frame_counter.inc(RUN)
+        detected_hands = fusion.update(stream, t, detected_hands)
+        if detected_hands is None:
+            return
+        if recorder:
+            recorder.write(t, detected_hands)
+        frame_height, frame_width, _ = streams.frame_shape(stream)
+        last_status_text = handle_hands(detected_hands, frame_height, frame_width, t)
+    
+    try:
+        streams.run(handle, lambda: control.stop_requested)
+    finally:
+        control.close()
+        release_resources(streams)
+        print(streams.format_report())
+        print(f"Active stream switches: {fusion.switches}")
+
+# Replay a recorded landmark session through the gesture and action logic
+def run_replay(path, realtime=True, frame_size=(480, 640)):
+    reader = SessionReader(path)
+    frame_height, frame_width = frame_size
+    
+    status_counts = Counter()
+    start = time.perf_counter()
+    for timestamp, detected_hands in replay(reader, realtime):
+        status_counts[handle_hands(detected_hands, frame_height, frame_width, timestamp)] += 1
+    elapsed = time.perf_counter() - start
+    executor.close()
+    event_log.close()
+    
+    print(f"Replayed {len(reader)} frames in {elapsed:.3f}s")
+    for status, count in status_counts.most_common():
+        print(f"- {status}: {count}")
+    return status_counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pincher Controller")
+    parser.add_argument("--source", default="0",
+                        help="camera index, video file, image directory or synthetic[:pattern]")
+    parser.add_argument("--fps", type=float,
+                        help="pace the input source to this frame rate")
+    parser.add_argument("--prefetch", type=int,
+                        help="number of frames to decode ahead of the main loop")
+    parser.add_argument("--roi", action="store_true",
+                        help="run inference on a crop around the tracked hand")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="only run inference on motion or at a minimum rate")
+    parser.add_argument("--tracking-fps", type=float, default=10.0,
+                        help="minimum inference rate while a hand is tracked (with --motion-gate)")
+    parser.add_argument("--idle-fps", type=float, default=2.0,
+                        help="inference rate while no hand is present (with --motion-gate)")
+    parser.add_argument("--mirror-landmarks", action="store_true",
+                        help="mirror landmark coordinates instead of flipping every frame")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run capture, inference and display on separate threads")
+    parser.add_argument("--streams", nargs="+", metavar="SOURCE",
+                        help="run one inference process per camera (headless; no ROI or motion gate)")
+    parser.add_argument("--no-camera-tuning", action="store_true",
+                        help="only set the camera resolution instead of probing for the fastest mode")
+    parser.add_argument("--retune-camera", action="store_true",
+                        help="probe camera modes again even when a tuned mode is cached")
+    parser.add_argument("--camera-cache", metavar="PATH", default=DEFAULT_CACHE,
+                        help="file caching the tuned mode of each camera")
+    parser.add_argument("--headless", action="store_true",
+                        help="no preview window or drawing; stop with a signal or the control socket")
+    parser.add_argument("--overlay-fps", type=float,
+                        help="refresh the preview window at most this often")
+    parser.add_argument("--control", metavar="ADDRESS",
+                        help="Unix socket path or local TCP port accepting stop/status commands")
+    parser.add_argument("--cursor-filter", choices=sorted(CURSOR_FILTERS), default="one_euro",
+                        help="cursor smoothing filter")
+    parser.add_argument("--cursor-hz", type=float, default=60.0,
+                        help="rate at which predicted cursor positions are pushed (0 = on inference only)")
+    parser.add_argument("--max-hands", type=int, default=1,
+                        help="number of hands to track; two pinching hands zoom")
+    parser.add_argument("--gestures", metavar="PATH",
+                        help="gesture rule file or trained model (.npz) (default: gestures/cursor.json)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="OS action backend; 'recording' only logs actions (default: this platform)")
+    parser.add_argument("--recognizer", choices=RECOGNIZERS, default="google",
+                        help="speech recogniser for dictation; vosk and transcript work offline")
+    parser.add_argument("--vosk-model", metavar="DIR", help="Vosk model directory (with --recognizer vosk)")
+    parser.add_argument("--audio-input", metavar="WAV",
+                        help="dictate from a 16-bit WAV file instead of the microphone")
+    parser.add_argument("--transcript", metavar="PATH",
+                        help="one line per utterance for --recognizer transcript (default: WAV name with .txt)")
+    parser.add_argument("--event-log", metavar="PATH",
+                        help="write gesture and action events as JSONL (gzip when PATH ends in .gz)")
+    parser.add_argument("--event-log-mb", type=float, default=10.0,
+                        help="rotate the event log at this size")
+    parser.add_argument("--event-log-backups", type=int, default=5,
+                        help="rotated event log files to keep")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="rewrite a metrics snapshot to PATH every --metrics-interval seconds")
+    parser.add_argument("--metrics-interval", type=float, default=10.0,
+                        help="seconds between metrics snapshots")
+    parser.add_argument("--profile-every", type=int, default=0, metavar="N",
+                        help="cProfile one frame in every N and write it to --profile-dir")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="directory for frame profiles (at most 20 are written)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record hand landmarks to a session file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recorded session instead of using the webcam")
+    parser.add_argument("--max-speed", action="store_true",
+                        help="replay as fast as possible instead of in real time")
+    args = parser.parse_args()
+    
+    if args.max_hands != 1:
+        hand_model = HandModel(max_hands=args.max_hands, min_detection_confidence=0.7,
+                               min_tracking_confidence=0.7)
+        landmark_buffers = np.empty((args.max_hands, 21, 3), dtype=np.float32)
+    setup(args.backend, args.gestures or CURSOR_GESTURES)
+    transcript = args.transcript
+    if transcript is None and args.audio_input:
+        transcript = os.path.splitext(args.audio_input)[0] + ".txt"
+    voice_options.update(recognizer=args.recognizer, model=args.vosk_model,
+                         transcript=transcript, audio_input=args.audio_input)
+    camera_tuner = None
+    if not args.no_camera_tuning:
+        camera_tuner = CaptureTuner((640, 480), cache_path=args.camera_cache, retune=args.retune_camera)
+    if args.event_log:
+        event_log = EventLog(args.event_log, max_bytes=int(args.event_log_mb * 1024 * 1024),
+                             backups=args.event_log_backups)
+    exporter = None
+    if args.metrics_port is not None or args.metrics_file:
+        use_metrics(Metrics())
+        metrics.gauge("actions_dropped", "Actions dropped because the action queue was full",
+                      lambda: executor.dropped)
+        metrics.gauge("events_dropped", "Events dropped because the event log fell behind",
+                      lambda: event_log.dropped)
+        exporter = MetricsExporter(metrics, args.metrics_port, args.metrics_file, args.metrics_interval)
+    profiler = FrameProfiler(args.profile_every, args.profile_dir)
+    if args.record:
+        recorder = SessionWriter(args.record, max_hands=args.max_hands)
+    if args.roi:
+        roi_tracker = RoiTracker()
+    if args.mirror_landmarks:
+        preprocessor = FramePreprocessor(mirror_image=False)
+    if args.motion_gate:
+        scheduler = InferenceScheduler(min_tracking_fps=args.tracking_fps, idle_fps=args.idle_fps)
+    cursor_filter = LerpFilter(smoothing) if args.cursor_filter == "lerp" else CURSOR_FILTERS[args.cursor_filter]()
+    cursor_hz = args.cursor_hz
+    cursor = CursorDriver(cursor_filter, move_cursor, refresh_hz=cursor_hz or 60.0)
+    
+    if args.replay:
+        run_replay(args.replay, realtime=not args.max_speed)
+    elif args.streams:
+        run_multi_stream(args.streams, args.fps, args.control)
+    else:
+        # Load the hand model while the camera opens
+        hand_model.start()
+        source = open_camera(args.source, args.fps, args.prefetch)
+        if args.pipeline:
+            run_pipelined(source, args.headless, args.overlay_fps, args.control)
+        else:
+            run(source, args.headless, args.overlay_fps, args.control)
+    if exporter is not None:
+        exporter.close()
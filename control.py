@@ -0,0 +1,135 @@
+import json
+import os
+import signal
+import socket
+import stat
+import threading
+
+
+def _is_socket(path):
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+class ControlChannel:
+    """Stops a running controller on SIGINT/SIGTERM or on commands from a local socket
+
+    address is either a filesystem path for a Unix domain socket or a TCP
+    port bound to 127.0.0.1. Each connection sends one line:
+      stop    request a clean shutdown
+      status  reply with the JSON from the status callback
+      ping    reply with "pong"
+    A stale socket left at address by an earlier run is replaced, but any
+    other file there is an error. close() puts back the signal handlers
+    that start() replaced.
+    """
+
+    def __init__(self, address=None, status=None):
+        self.address = address
+        self.status = status
+        self.stop_event = threading.Event()
+        self.server = None
+        self.thread = None
+        self.previous_handlers = {}
+
+    @property
+    def stop_requested(self):
+        return self.stop_event.is_set()
+
+    def request_stop(self, *_):
+        self.stop_event.set()
+
+    def start(self):
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                self.previous_handlers[signum] = signal.signal(signum, self.request_stop)
+
+        if self.address:
+            try:
+                self.server = self._listen(self.address)
+            except OSError:
+                self.close()
+                raise
+            self.thread = threading.Thread(target=self._serve, name="control", daemon=True)
+            self.thread.start()
+        return self
+
+    def _listen(self, address):
+        if str(address).isdigit():
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(("127.0.0.1", int(address)))
+        else:
+            if os.path.exists(address):
+                if not _is_socket(address):
+                    raise FileExistsError(f"Control address {address} exists and is not a socket")
+                os.unlink(address)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(address)
+        server.listen(4)
+        server.settimeout(0.5)
+        return server
+
+    def _serve(self):
+        while not self.stop_event.is_set():
+            try:
+                connection, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with connection:
+                connection.settimeout(1.0)
+                try:
+                    command = connection.recv(256).decode("utf-8", "replace").strip().lower()
+                    connection.sendall((self.handle(command) + "\n").encode("utf-8"))
+                except OSError:
+                    pass
+
+    def handle(self, command):
+        if command == "stop":
+            self.request_stop()
+            return "stopping"
+        if command == "status":
+            return json.dumps(self.status() if self.status else {})
+        if command == "ping":
+            return "pong"
+        return f"unknown command: {command}"
+
+    def close(self):
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.close()
+            if not str(self.address).isdigit() and _is_socket(self.address):
+                os.unlink(self.address)
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        if threading.current_thread() is threading.main_thread():
+            for signum, handler in self.previous_handlers.items():
+                # None means the handler was not installed from Python and cannot be put back
+                if handler is not None:
+                    signal.signal(signum, handler)
+            self.previous_handlers = {}
+
+
+class OverlaySubscriber:
+    """Renders the preview window from the frame loop, at most refresh_fps times a second
+
+    render(image, result) draws and shows one frame and returns False when
+    the user asked to quit. Frames between refreshes are not drawn at all.
+    """
+
+    def __init__(self, render, refresh_fps=None):
+        self.render = render
+        self.interval = 1.0 / refresh_fps if refresh_fps else 0.0
+        self.last_refresh = None
+
+    def publish(self, image, result, now):
+        """Offer a frame; returns False once the viewer wants to stop"""
+        if self.last_refresh is not None and now - self.last_refresh < self.interval:
+            return True
+        self.last_refresh = now
+        return self.render(image, result) is not False
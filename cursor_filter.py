@@ -0,0 +1,212 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+
+class LerpFilter:
+    """The original fixed-factor smoothing: move 1/smoothing of the way to the target"""
+
+    def __init__(self, smoothing=8):
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self.position = None
+
+    def update(self, t, position):
+        position = np.asarray(position, dtype=np.float64)
+        if self.position is None:
+            self.position = position
+        else:
+            self.position = self.position + (position - self.position) / self.smoothing
+        return self.position
+
+    def predict(self, t):
+        return self.position
+
+
+class OneEuroFilter:
+    """One-Euro filter (Casiez et al.): heavy smoothing at rest, little lag when moving fast
+
+    min_cutoff (Hz) sets the jitter reduction when still, beta how quickly
+    the cutoff rises with speed (in pixels per second).
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = np.zeros(2)
+        self.last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, t, position):
+        position = np.asarray(position, dtype=np.float64)
+        if self.position is None:
+            self.position = position
+            self.last_time = t
+            return self.position
+
+        dt = max(t - self.last_time, 1e-6)
+        raw_velocity = (position - self.position) / dt
+        self.velocity += self._alpha(self.d_cutoff, dt) * (raw_velocity - self.velocity)
+
+        cutoff = self.min_cutoff + self.beta * np.linalg.norm(self.velocity)
+        self.position = self.position + self._alpha(cutoff, dt) * (position - self.position)
+        self.last_time = t
+        return self.position
+
+    def predict(self, t):
+        """Extrapolate along the filtered velocity to time t"""
+        if self.position is None:
+            return None
+        return self.position + self.velocity * max(t - self.last_time, 0.0)
+
+
+class KalmanCursorFilter:
+    """Constant-velocity Kalman filter over [x, y, vx, vy]
+
+    process_noise is the white acceleration noise (pixels/s^2) and
+    measurement_noise the landmark jitter (pixels), both as std deviations.
+    """
+
+    def __init__(self, process_noise=2000.0, measurement_noise=4.0):
+        self.q = process_noise ** 2
+        self.R = np.eye(2) * measurement_noise ** 2
+        self.H = np.hstack([np.eye(2), np.zeros((2, 2))])
+        self.reset()
+
+    def reset(self):
+        self.state = None
+        self.covariance = None
+        self.last_time = None
+
+    def _transition(self, dt):
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+        block = np.array([[dt ** 4 / 4, dt ** 3 / 2], [dt ** 3 / 2, dt ** 2]]) * self.q
+        Q = np.zeros((4, 4))
+        Q[np.ix_([0, 2], [0, 2])] = block
+        Q[np.ix_([1, 3], [1, 3])] = block
+        return F, Q
+
+    def update(self, t, position):
+        z = np.asarray(position, dtype=np.float64)
+        if self.state is None:
+            self.state = np.array([z[0], z[1], 0.0, 0.0])
+            self.covariance = np.diag([self.R[0, 0], self.R[1, 1], 1e6, 1e6])
+            self.last_time = t
+            return self.state[:2]
+
+        F, Q = self._transition(max(t - self.last_time, 1e-6))
+        state = F @ self.state
+        covariance = F @ self.covariance @ F.T + Q
+
+        residual = z - self.H @ state
+        S = self.H @ covariance @ self.H.T + self.R
+        K = covariance @ self.H.T @ np.linalg.inv(S)
+        self.state = state + K @ residual
+        self.covariance = (np.eye(4) - K @ self.H) @ covariance
+        self.last_time = t
+        return self.state[:2]
+
+    def predict(self, t):
+        """Project the state forward to time t without updating it"""
+        if self.state is None:
+            return None
+        dt = max(t - self.last_time, 0.0)
+        return self.state[:2] + self.state[2:] * dt
+
+
+CURSOR_FILTERS = {
+    "lerp": LerpFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanCursorFilter,
+}
+
+
+class CursorDriver:
+    """Pushes filtered cursor positions at display refresh rate from its own thread
+
+    The vision loop calls update() with timestamped measurements at camera
+    rate. Between measurements the driver extrapolates with the filter's
+    velocity, looking ahead by lookahead seconds to hide inference and OS
+    latency. It never extrapolates more than max_extrapolation past the last
+    measurement, and resets the filter after a gap longer than reset_after.
+    """
+
+    def __init__(self, cursor_filter, move, refresh_hz=60.0, lookahead=0.03,
+                 max_extrapolation=0.1, reset_after=0.5, clock=time.time):
+        self.filter = cursor_filter
+        self.move = move
+        self.interval = 1.0 / refresh_hz
+        self.lookahead = lookahead
+        self.max_extrapolation = max_extrapolation
+        self.reset_after = reset_after
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.last_measurement = None
+        self.last_pushed = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def update(self, t, x, y):
+        """Feed a measurement; returns the filtered position"""
+        with self.lock:
+            if self.last_measurement is not None and t - self.last_measurement > self.reset_after:
+                self.filter.reset()
+            self.last_measurement = t
+            return self.filter.update(t, (x, y))
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, name="cursor-driver", daemon=True)
+        self.thread.start()
+        return self
+
+    def _loop(self):
+        next_tick = time.perf_counter()
+        while not self.stop_event.is_set():
+            self._tick()
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    def _tick(self):
+        now = self.clock()
+        with self.lock:
+            if self.last_measurement is None:
+                return
+            horizon = self.last_measurement + self.max_extrapolation
+            if now > horizon + self.interval:
+                # Tracking stopped; leave the cursor where it is
+                return
+            position = self.filter.predict(min(now + self.lookahead, horizon))
+        if position is None:
+            return
+        if self.last_pushed is not None and np.abs(position - self.last_pushed).max() < 0.5:
+            return
+        self.last_pushed = position
+        self.move(float(position[0]), float(position[1]))
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
@@ -0,0 +1,345 @@
+import json
+import math
+import queue
+import threading
+import time
+import wave
+
+import numpy as np
+
+from lazy_loading import lazy_import
+
+sr = lazy_import("speech_recognition")
+
+
+class AudioRingBuffer:
+    """Fixed-size ring of int16 samples addressed by absolute sample number
+
+    Samples older than the capacity are overwritten; read() clamps to what
+    is still held.
+    """
+
+    def __init__(self, seconds, rate):
+        self.samples = np.zeros(int(seconds * rate), dtype=np.int16)
+        self.count = 0
+
+    def write(self, chunk):
+        capacity = len(self.samples)
+        length = len(chunk)
+        # Only the newest capacity samples fit, but they keep their absolute positions
+        chunk = chunk[-capacity:]
+        start = (self.count + length - len(chunk)) % capacity
+        first = min(len(chunk), capacity - start)
+        self.samples[start:start + first] = chunk[:first]
+        self.samples[:len(chunk) - first] = chunk[first:]
+        self.count += length
+
+    def read(self, start, end):
+        """Copy of samples start..end (absolute sample numbers)"""
+        capacity = len(self.samples)
+        start = max(start, self.count - capacity, 0)
+        end = min(end, self.count)
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        slots = np.arange(start, end) % capacity
+        return self.samples[slots]
+
+
+class EnergyVAD:
+    """Voice activity from chunk energy against an adaptive noise floor
+
+    A chunk is voiced when its level is threshold_db above the noise floor,
+    which follows quiet chunks slowly and drops immediately to quieter
+    ones. Speech starts after start_chunks voiced chunks in a row and ends
+    after end_chunks unvoiced ones, so short pauses between words do not
+    split an utterance. This replaces the one-off ambient noise calibration.
+    """
+
+    def __init__(self, threshold_db=10.0, start_chunks=3, end_chunks=25, floor_rate=0.05, min_floor_db=-70.0):
+        self.threshold_db = threshold_db
+        self.start_chunks = start_chunks
+        self.end_chunks = end_chunks
+        self.floor_rate = floor_rate
+        self.min_floor_db = min_floor_db
+        self.floor = None
+        self.reset()
+
+    def reset(self):
+        """Forget the current utterance; the noise floor is kept"""
+        self.speaking = False
+        self.voiced_run = 0
+        self.silent_run = 0
+
+    def level(self, chunk):
+        """Chunk RMS level in dB relative to full scale"""
+        samples = chunk.astype(np.float32)
+        rms = math.sqrt(float(np.dot(samples, samples)) / max(len(samples), 1))
+        return 20 * math.log10(rms / 32768 + 1e-10)
+
+    def update(self, chunk):
+        """Feed one chunk; returns "start", "end" or None"""
+        level = self.level(chunk)
+        if self.floor is None:
+            self.floor = max(level, self.min_floor_db)
+        voiced = level > self.floor + self.threshold_db
+        if not voiced:
+            if level < self.floor:
+                self.floor = max(level, self.min_floor_db)
+            else:
+                self.floor += self.floor_rate * (level - self.floor)
+
+        if not self.speaking:
+            self.voiced_run = self.voiced_run + 1 if voiced else 0
+            if self.voiced_run >= self.start_chunks:
+                self.speaking = True
+                self.silent_run = 0
+                return "start"
+            return None
+
+        self.silent_run = 0 if voiced else self.silent_run + 1
+        if self.silent_run >= self.end_chunks:
+            self.reset()
+            return "end"
+        return None
+
+
+class MicrophoneSource:
+    """Fixed-size int16 chunks from the default (or given) input device through PyAudio"""
+
+    def __init__(self, rate=16000, chunk=480, device=None):
+        self.rate = rate
+        self.chunk = chunk
+        self.device = device
+        self.audio = None
+        self.stream = None
+
+    def open(self):
+        import pyaudio
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=self.rate, input=True,
+                                      frames_per_buffer=self.chunk, input_device_index=self.device)
+
+    def read_chunk(self):
+        data = self.stream.read(self.chunk, exception_on_overflow=False)
+        return np.frombuffer(data, dtype=np.int16)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.audio.terminate()
+            self.stream = None
+
+
+class WavFileSource:
+    """Chunks from a 16-bit WAV file, optionally paced to real time; stereo is averaged to mono"""
+
+    def __init__(self, path, chunk_seconds=0.03, realtime=False):
+        self.path = path
+        self.chunk_seconds = chunk_seconds
+        self.realtime = realtime
+        with wave.open(path, "rb") as f:
+            if f.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit WAV files are supported")
+            self.rate = f.getframerate()
+            channels = f.getnchannels()
+            samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        self.samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        self.chunk = max(1, int(self.rate * chunk_seconds))
+        self.position = 0
+        self.started = None
+
+    def open(self):
+        self.position = 0
+        self.started = time.monotonic()
+
+    def read_chunk(self):
+        """Next chunk, or None at the end of the file"""
+        if self.position >= len(self.samples):
+            return None
+        if self.realtime:
+            delay = self.started + self.position / self.rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        chunk = self.samples[self.position:self.position + self.chunk]
+        self.position += self.chunk
+        return chunk
+
+    def close(self):
+        pass
+
+
+class GoogleRecognizer:
+    """Google Web Speech through speech_recognition; needs network access"""
+
+    name = "google"
+
+    def __init__(self, language="en-US"):
+        self.language = language
+        self.recognizer = None
+
+    def transcribe(self, audio, rate):
+        if self.recognizer is None:
+            self.recognizer = sr.Recognizer()
+        try:
+            return self.recognizer.recognize_google(sr.AudioData(audio.tobytes(), rate, 2), language=self.language)
+        except sr.UnknownValueError:
+            return None
+
+
+class VoskRecognizer:
+    """Offline recognition with a local Vosk model directory"""
+
+    name = "vosk"
+
+    def __init__(self, model_path):
+        import vosk
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    def transcribe(self, audio, rate):
+        recognizer = self.vosk.KaldiRecognizer(self.model, rate)
+        recognizer.AcceptWaveform(audio.tobytes())
+        return json.loads(recognizer.FinalResult()).get("text") or None
+
+
+class TranscriptRecognizer:
+    """Offline stub returning the next line of a transcript file for each utterance
+
+    Pair it with a WavFileSource whose utterances match the lines, e.g.
+    clip.wav and clip.txt, to exercise dictation without a speech engine.
+    """
+
+    name = "transcript"
+
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as f:
+            self.lines = [line.strip() for line in f if line.strip()]
+        self.next_line = 0
+
+    def transcribe(self, audio, rate):
+        if self.next_line >= len(self.lines):
+            return None
+        text = self.lines[self.next_line]
+        self.next_line += 1
+        return text
+
+
+class Dictation:
+    """Streams audio through voice activity detection into a recogniser
+
+    A capture thread reads fixed-size chunks into a ring buffer and runs
+    the VAD on each one; a finished utterance (with pre_roll seconds of
+    audio before its detected start) is queued for a recognition thread,
+    which passes the text to on_text. Capture keeps running while the
+    recogniser works, so nothing said in the meantime is lost. While
+    active is False chunks are read and dropped.
+    """
+
+    def __init__(self, source, recognizer, on_text, vad=None, pre_roll=0.3, max_utterance=15.0,
+                 buffer_seconds=30.0, max_queued=8):
+        self.source = source
+        self.recognizer = recognizer
+        self.on_text = on_text
+        self.vad = vad or EnergyVAD()
+        self.pre_roll = pre_roll
+        self.max_utterance = max_utterance
+        self.buffer_seconds = buffer_seconds
+        self.utterances = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+        self.active = True
+        self.stopped = threading.Event()
+        self.threads = []
+
+    def start(self):
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name="dictation-capture", daemon=True),
+            threading.Thread(target=self._recognize_loop, name="dictation-recognize", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def _queue(self, audio):
+        try:
+            self.utterances.put_nowait(audio)
+        except queue.Full:
+            self.dropped += 1
+
+    def _capture_loop(self):
+        try:
+            self.source.open()
+            rate = self.source.rate
+            ring = AudioRingBuffer(self.buffer_seconds, rate)
+            pre_roll = int(self.pre_roll * rate)
+            max_samples = int(self.max_utterance * rate)
+            utterance_start = None
+
+            while not self.stopped.is_set():
+                chunk = self.source.read_chunk()
+                if chunk is None:
+                    break
+                chunk_start = ring.count
+                ring.write(chunk)
+                if not self.active:
+                    self.vad.reset()
+                    utterance_start = None
+                    continue
+
+                event = self.vad.update(chunk)
+                if event == "start":
+                    # The VAD needs a few voiced chunks before it reports a start
+                    voiced = self.vad.start_chunks * len(chunk)
+                    utterance_start = chunk_start + len(chunk) - voiced - pre_roll
+                elif utterance_start is not None and (event == "end"
+                                                      or ring.count - utterance_start >= max_samples):
+                    self._queue(ring.read(utterance_start, ring.count))
+                    utterance_start = None
+                    self.vad.reset()
+
+            # Recognise speech cut off by the end of the input
+            if utterance_start is not None:
+                self._queue(ring.read(utterance_start, ring.count))
+        except Exception as e:
+            print(f"Dictation capture error: {e}")
+        finally:
+            self.source.close()
+            self.utterances.put(None)
+
+    def _recognize_loop(self):
+        while True:
+            audio = self.utterances.get()
+            if audio is None:
+                return
+            try:
+                text = self.recognizer.transcribe(audio, self.source.rate)
+            except Exception as e:
+                print(f"Speech recognition error: {e}")
+                continue
+            if text:
+                self.on_text(text)
+
+    def join(self, timeout=None):
+        """Wait for a finite source to be fully transcribed"""
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def close(self):
+        self.stopped.set()
+
+
+RECOGNIZERS = ["google", "vosk", "transcript"]
+
+
+def make_recognizer(name, model=None, transcript=None):
+    if name == "google":
+        return GoogleRecognizer()
+    if name == "vosk":
+        if not model:
+            raise ValueError("The vosk recogniser needs a model directory")
+        return VoskRecognizer(model)
+    if name == "transcript":
+        if not transcript:
+            raise ValueError("The transcript recogniser needs a transcript file")
+        return TranscriptRecognizer(transcript)
+    raise ValueError(f"Unknown recogniser {name!r}")
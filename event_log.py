@@ -0,0 +1,125 @@
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class EventLog:
+    """Structured event log written to rotating JSONL files by a background thread
+
+    log() only appends a dict to a bounded deque, so the frame loop never
+    waits on the disk; when the writer falls behind by more than max_pending
+    events the oldest are dropped and counted in dropped. Events lost to a
+    failed write are reported and counted in failed. Every flush_interval the
+    writer serialises everything pending in one write. A path ending in
+    .gz is written as gzip members, one per batch, which gzip.open and
+    zcat read as a single stream at a fraction of the size.
+
+    Once a file passes max_bytes it is renamed to path.1 (path.1 to path.2
+    and so on, keeping backups files), so disk use is bounded as well.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backups=5, flush_interval=1.0, max_pending=4096):
+        self.path = path
+        self.compress = path.endswith(".gz")
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pending = deque()
+        # log() runs on several threads; the queue and its counters change under the lock
+        self.lock = threading.Lock()
+        self.logged = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "ab")
+        self.size = self.file.tell()
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._writer_loop, name="event-log", daemon=True)
+        self.thread.start()
+
+    def log(self, kind, **fields):
+        """Queue one event; t defaults to the current wall-clock time"""
+        t = fields.pop("t", None)
+        event = {"event": kind, "t": time.time() if t is None else t, **fields}
+        with self.lock:
+            if len(self.pending) >= self.max_pending:
+                self.pending.popleft()
+                self.dropped += 1
+            self.pending.append(event)
+            self.logged += 1
+
+    def _writer_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, deque()
+
+        data = "".join(json.dumps(event, separators=(",", ":"), default=str) + "\n"
+                       for event in batch).encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+        try:
+            if self.size and self.size + len(data) > self.max_bytes:
+                self._rotate()
+            self.file.write(data)
+            self.file.flush()
+            self.size += len(data)
+            self.written += len(batch)
+        except OSError as e:
+            self.failed += len(batch)
+            print(f"Event log write error, {len(batch)} events lost: {str(e)}")
+
+    def _rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "wb")
+        self.size = 0
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.file.close()
+
+
+class NullEventLog:
+    """Drop-in event log that discards everything; the default without --event-log"""
+
+    dropped = 0
+    failed = 0
+
+    def log(self, kind, **fields):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_EVENT_LOG = NullEventLog()
+
+
+def read_events(path):
+    """Yield the events of one log file, plain or gzip"""
+    opener = gzip.open if path.endswith(".gz") or ".gz." in path else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
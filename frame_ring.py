@@ -0,0 +1,124 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class FrameRing:
+    """Fixed-slot ring of equally sized uint8 frames in one shared-memory block
+
+    The single writer claims the next slot, fills it in place (for example
+    with cap.read(image=slot)) and publishes it under the next sequence
+    number and its capture time. Readers, in this process or in others that
+    attach by name, get read-only views of the slots rather than copies,
+    and tell from the sequence numbers how many frames they missed. The
+    oldest frame is simply overwritten, so memory is fixed and a slow
+    reader never holds up the writer.
+
+    A view stays valid until the writer laps the ring, slots - 1 frames
+    later; valid(sequence) tells whether a frame was overwritten while it
+    was being read.
+    """
+
+    def __init__(self, shape, slots=4, name=None):
+        if slots < 2:
+            raise ValueError("A frame ring needs at least two slots")
+        self.shape = tuple(shape)
+        self.slot_count = slots
+        self.owner = name is None
+        header_bytes = 8 * (2 * slots + 1)
+        size = header_bytes + slots * int(np.prod(self.shape))
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+
+        # Header: the newest published sequence number, the sequence number
+        # held by each slot (-1 while it is being written) and the time each
+        # slot was published
+        header = np.ndarray((slots + 1,), dtype=np.int64, buffer=self.memory.buf)
+        if self.owner:
+            header.fill(-1)
+        self.published = header[:1]
+        self.slot_sequences = header[1:]
+        self.timestamps = np.ndarray((slots,), dtype=np.float64, buffer=self.memory.buf, offset=header.nbytes)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.memory.buf,
+                                 offset=header_bytes)
+        self.claimed = None
+
+    @classmethod
+    def attach(cls, spec):
+        """Open a ring created elsewhere from its spec()"""
+        shape, slots, name = spec
+        return cls(shape, slots, name)
+
+    def spec(self):
+        """Everything another process needs to attach: (shape, slots, name)"""
+        return self.shape, self.slot_count, self.memory.name
+
+    @property
+    def sequence(self):
+        """Sequence number of the newest published frame, -1 before the first"""
+        return int(self.published[0])
+
+    # Writer side
+    def claim(self):
+        """Writable view of the slot that the next frame goes into"""
+        sequence = self.sequence + 1
+        slot = sequence % self.slot_count
+        self.slot_sequences[slot] = -1
+        self.claimed = sequence
+        return self.frames[slot]
+
+    def publish(self, timestamp=None):
+        """Make the claimed slot visible to readers; returns its sequence number"""
+        sequence = self.claimed
+        self.timestamps[sequence % self.slot_count] = time.time() if timestamp is None else timestamp
+        self.slot_sequences[sequence % self.slot_count] = sequence
+        self.published[0] = sequence
+        self.claimed = None
+        return sequence
+
+    def write(self, frame, timestamp=None):
+        """Copy a frame into the next slot and publish it"""
+        np.copyto(self.claim(), frame)
+        return self.publish(timestamp)
+
+    # Reader side
+    def valid(self, sequence):
+        """Whether the frame is still in its slot"""
+        return sequence >= 0 and int(self.slot_sequences[sequence % self.slot_count]) == sequence
+
+    def timestamp(self, sequence):
+        """Time the frame was published, or None once it has been overwritten"""
+        timestamp = float(self.timestamps[sequence % self.slot_count])
+        return timestamp if self.valid(sequence) else None
+
+    def view(self, sequence):
+        """Read-only view of a frame, or None once it has been overwritten"""
+        if not self.valid(sequence):
+            return None
+        view = self.frames[sequence % self.slot_count].view()
+        view.flags.writeable = False
+        return view
+
+    def latest(self, after=-1):
+        """(sequence, view, dropped) for the newest frame after sequence after, or None
+
+        dropped is the number of frames published since after that the
+        reader skipped.
+        """
+        sequence = self.sequence
+        if sequence <= after:
+            return None
+        view = self.view(sequence)
+        if view is None:
+            return None
+        return sequence, view, sequence - after - 1
+
+    def close(self):
+        """Detach, and free the memory if this ring created it; drop all views first"""
+        if self.memory is None:
+            return
+        self.published = self.slot_sequences = self.timestamps = self.frames = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+        self.memory = None
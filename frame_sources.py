@@ -0,0 +1,247 @@
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from camera_tuning import device_key
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """Base class for BGR frame producers consumed by the main loops
+
+    Subclasses implement _grab(out), returning a frame or None when
+    exhausted; when out is given and matches the frame size the frame is
+    written into it instead of a new array. With fps set, read() paces
+    frames to that rate. With prefetch > 0, a background thread keeps up to
+    that many decoded frames ready; it blocks rather than drops, so file and
+    synthetic input stays reproducible.
+    """
+
+    def __init__(self, fps=None, prefetch=0):
+        self.fps = fps
+        self.prefetch = prefetch
+        self._next_frame_time = None
+        self._buffer = None
+        self._prefetcher = None
+        self._stopped = threading.Event()
+
+    def _grab(self, out=None):
+        raise NotImplementedError
+
+    @staticmethod
+    def _fill(out, image):
+        if out is not None and image is not None and out.shape == image.shape:
+            np.copyto(out, image)
+            return out
+        return image
+
+    def _release(self):
+        pass
+
+    def _prefetch_loop(self):
+        try:
+            while not self._stopped.is_set():
+                frame = self._grab()
+                while not self._stopped.is_set():
+                    try:
+                        self._buffer.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if frame is None:
+                    break
+        except Exception as e:
+            print(f"Frame source error: {str(e)}")
+            self._buffer.put(None)
+
+    def _next(self, out):
+        if not self.prefetch:
+            return self._grab(out)
+        if self._prefetcher is None:
+            self._buffer = queue.Queue(maxsize=self.prefetch)
+            self._prefetcher = threading.Thread(target=self._prefetch_loop, name="frame-prefetch", daemon=True)
+            self._prefetcher.start()
+        frame = self._buffer.get()
+        if frame is None:
+            # The prefetcher has stopped; leave the end marker for later reads
+            self._buffer.put(None)
+        return self._fill(out, frame)
+
+    def read(self, out=None):
+        """Return the next BGR frame, or None when the source is exhausted
+
+        Pass the previous frame (or a slot of a FrameRing) as out to reuse
+        its memory; the returned frame is out unless the size changed.
+        """
+        if self._stopped.is_set():
+            return None
+        frame = self._next(out)
+        if frame is not None and self.fps:
+            now = time.perf_counter()
+            if self._next_frame_time is None:
+                self._next_frame_time = now
+            delay = self._next_frame_time - now
+            if delay > 0:
+                time.sleep(delay)
+            # Fall back onto the current time if we are running behind
+            self._next_frame_time = max(self._next_frame_time, now) + 1.0 / self.fps
+        return frame
+
+    def close(self):
+        self._stopped.set()
+        if self._prefetcher is not None:
+            self._prefetcher.join(timeout=1.0)
+        self._release()
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+
+class WebcamSource(FrameSource):
+    """Live camera frames; the camera paces itself unless fps is set
+
+    With a CaptureTuner the camera is switched to the tuned (or cached)
+    FOURCC, resolution, frame rate and buffer size instead of just width
+    and height. open_capture builds the capture (cv2.VideoCapture unless replaced).
+    """
+
+    def __init__(self, device=0, width=None, height=None, fps=None, prefetch=0, tuner=None,
+                 open_capture=cv2.VideoCapture):
+        super().__init__(fps, prefetch)
+        self.cap = open_capture(device)
+        if not self.cap.isOpened():
+            raise IOError("Cannot open webcam")
+        self.mode = None
+        if tuner is not None:
+            try:
+                self.mode, cached = tuner.tune(self.cap, device_key(device, self.cap))
+                print(f"Camera {device}: {self.mode.describe()}{' (cached)' if cached else ''}")
+            except Exception as e:
+                print(f"Camera tuning failed, using the default mode: {str(e)}")
+        if self.mode is None:
+            if width:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            if height:
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def _grab(self, out=None):
+        success, image = self.cap.read(image=out)
+        return image if success else None
+
+    def _release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file, optionally looped"""
+
+    def __init__(self, path, fps=None, prefetch=4, loop=False):
+        super().__init__(fps, prefetch)
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video file: {path}")
+
+    def _grab(self, out=None):
+        success, image = self.cap.read(image=out)
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self.cap.read(image=out)
+        return image if success else None
+
+    def _release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames read from the images in a directory, in file name order"""
+
+    def __init__(self, path, fps=None, prefetch=4, loop=False):
+        super().__init__(fps, prefetch)
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise IOError(f"No images found in {path}")
+        self.loop = loop
+        self.index = 0
+
+    def _grab(self, out=None):
+        if self.index >= len(self.paths):
+            if not self.loop:
+                return None
+            self.index = 0
+        image = cv2.imread(self.paths[self.index])
+        self.index += 1
+        return self._fill(out, image)
+
+
+class SyntheticSource(FrameSource):
+    """Generated test patterns at a fixed size, for camera-free benchmarking
+
+    Patterns: "gradient" (static), "moving_box" (a bright square sweeping the
+    frame) and "noise" (seeded random pixels).
+    """
+
+    def __init__(self, width=640, height=480, fps=30, prefetch=0, pattern="moving_box",
+                 frames=None, seed=0):
+        super().__init__(fps, prefetch)
+        self.width = width
+        self.height = height
+        self.pattern = pattern
+        self.frames = frames
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        ramp = np.linspace(0, 255, width, dtype=np.uint8)
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = ramp[np.newaxis, :, np.newaxis]
+
+    def _grab(self, out=None):
+        if self.frames is not None and self.count >= self.frames:
+            return None
+        self.count += 1
+
+        if self.pattern == "noise":
+            return self._fill(out, self.rng.integers(0, 256, (self.height, self.width, 3), dtype=np.uint8))
+
+        image = self._fill(out, self.background)
+        if image is not out:
+            image = self.background.copy()
+        if self.pattern == "moving_box":
+            size = min(self.width, self.height) // 4
+            x = (self.count * 8) % (self.width - size)
+            y = (self.height - size) // 2
+            image[y:y + size, x:x + size] = 255
+        return image
+
+
+def open_source(spec, fps=None, prefetch=None, width=None, height=None, tuner=None):
+    """Build a frame source from a command line spec
+
+    Accepts a camera index ("0"), "synthetic" or "synthetic:<pattern>",
+    an image directory or a video file path. tuner only applies to cameras.
+    """
+    kwargs = {"fps": fps}
+    if prefetch is not None:
+        kwargs["prefetch"] = prefetch
+
+    if str(spec).isdigit():
+        return WebcamSource(int(spec), width=width, height=height, tuner=tuner, **kwargs)
+    if str(spec).startswith("synthetic"):
+        pattern = spec.partition(":")[2] or "moving_box"
+        return SyntheticSource(width or 640, height or 480, pattern=pattern, **kwargs)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, **kwargs)
+    return VideoFileSource(spec, **kwargs)
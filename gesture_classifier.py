@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+
+from gesture_rules import load_rules
+from learned_classifier import load_model
+
+# Rule files shipped with the controllers
+GESTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures")
+DESKTOP_GESTURES = os.path.join(GESTURE_DIR, "desktop.json")
+CURSOR_GESTURES = os.path.join(GESTURE_DIR, "cursor.json")
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """Copy MediaPipe landmarks into a (21, 3) float32 array"""
+    landmarks = getattr(hand_landmarks, "landmark", hand_landmarks)
+    if out is None:
+        out = np.empty((21, 3), dtype=np.float32)
+    for i, landmark in enumerate(landmarks):
+        out[i, 0] = landmark.x
+        out[i, 1] = landmark.y
+        out[i, 2] = landmark.z
+    return out
+
+
+class GestureClassifier:
+    """Labels hands with the winning rule of a compiled gesture RuleSet or a trained model"""
+
+    def __init__(self, rules, default=None):
+        self.rules = rules
+        self.names = rules.names
+        self.default = default if default is not None else rules.default
+
+        # Lookup table from rule index to label, with the default in the last slot
+        self._labels = np.array(self.names + [self.default], dtype=object)
+
+    def classify_batch(self, points):
+        """Return the index of the winning rule per hand, -1 if none match"""
+        points = np.asarray(points, dtype=np.float32)
+        if points.ndim == 2:
+            points = points[np.newaxis]
+        return self.rules.first_match(points)
+
+    def labels(self, points):
+        """Return gesture names for a (N, 21, 3) batch"""
+        return self._labels[self.classify_batch(points)]
+
+    def classify(self, points):
+        """Return the gesture name for a single (21, 3) hand"""
+        return self._labels[self.classify_batch(points)[0]]
+
+
+def load_classifier(path, default=None):
+    """Load a JSON rule file, or a trained model (.npz) written by train_gestures.py"""
+    if path.endswith(".npz"):
+        return GestureClassifier(load_model(path), default)
+    return GestureClassifier(load_rules(path), default)
@@ -0,0 +1,186 @@
+"""Declarative gesture rules compiled into a single vectorised evaluation pass
+
+A rule file is JSON:
+
+    {
+      "default": "unknown",
+      "gestures": [
+        {"name": "pinch", "priority": 0,
+         "all": [["dist:thumb_tip:index_tip", "<", 0.04], "above:index_tip:wrist"],
+         "any": [...]}
+      ]
+    }
+
+A gesture matches when every "all" condition holds and, if present, at
+least one "any" condition holds. The highest priority match wins and ties
+go to the gesture listed first.
+
+Features are named kind:landmark[:landmark] over normalised coordinates:
+  x:a, y:a          position of landmark a
+  dx:a:b, dy:a:b    b minus a along one axis (y grows downwards)
+  gap_x:a:b, gap_y:a:b  absolute difference along one axis
+  dist:a:b          2D distance
+Conditions are [feature, op, threshold] with op one of < <= > >=, or one
+of the shorthands above:a:b, below:a:b, left_of:a:b, right_of:a:b.
+
+Compilation deduplicates features and conditions across all rules. Each
+frame computes every feature once, evaluates all conditions in one
+comparison, and resolves every rule with one matrix product, so adding a
+gesture adds columns rather than another pass over the landmarks.
+"""
+import json
+
+import numpy as np
+
+LANDMARK_NAMES = [
+    "wrist",
+    "thumb_cmc", "thumb_mcp", "thumb_ip", "thumb_tip",
+    "index_mcp", "index_pip", "index_dip", "index_tip",
+    "middle_mcp", "middle_pip", "middle_dip", "middle_tip",
+    "ring_mcp", "ring_pip", "ring_dip", "ring_tip",
+    "pinky_mcp", "pinky_pip", "pinky_dip", "pinky_tip",
+]
+LANDMARK_INDEX = {name: i for i, name in enumerate(LANDMARK_NAMES)}
+
+FEATURE_ARITY = {"x": 1, "y": 1, "dx": 2, "dy": 2, "gap_x": 2, "gap_y": 2, "dist": 2}
+
+# Shorthand conditions, expressed as (feature kind, op, threshold)
+SHORTHANDS = {
+    "above": ("dy", ">", 0.0),     # a above b: y_a < y_b
+    "below": ("dy", "<", 0.0),     # a below b: y_a > y_b
+    "left_of": ("dx", ">", 0.0),   # a left of b: x_a < x_b
+    "right_of": ("dx", "<", 0.0),  # a right of b: x_a > x_b
+}
+
+# Every op is rewritten as sign * (value - threshold) < 0, or <= 0 when not strict
+OPS = {"<": (1.0, True), "<=": (1.0, False), ">": (-1.0, True), ">=": (-1.0, False)}
+
+
+def _parse_feature(name):
+    kind, *landmarks = name.split(":")
+    if kind not in FEATURE_ARITY or len(landmarks) != FEATURE_ARITY[kind]:
+        raise ValueError(f"Unknown gesture feature: {name}")
+    for landmark in landmarks:
+        if landmark not in LANDMARK_INDEX:
+            raise ValueError(f"Unknown landmark {landmark!r} in feature {name}")
+    return kind, tuple(LANDMARK_INDEX[landmark] for landmark in landmarks)
+
+
+def _parse_condition(condition):
+    """Return (feature name, op, threshold) for a condition in either form"""
+    if isinstance(condition, str):
+        kind, _, landmarks = condition.partition(":")
+        if kind not in SHORTHANDS:
+            raise ValueError(f"Unknown gesture condition: {condition}")
+        feature_kind, op, threshold = SHORTHANDS[kind]
+        return f"{feature_kind}:{landmarks}", op, threshold
+    feature, op, threshold = condition
+    if op not in OPS:
+        raise ValueError(f"Unknown comparison {op!r} in condition {condition}")
+    return feature, op, float(threshold)
+
+
+class RuleSet:
+    """Compiled gesture rules; evaluate (N, 21, 3) landmark batches with first_match()"""
+
+    def __init__(self, gestures, default=None):
+        self.default = default
+
+        # Stable sort: higher priority first, file order within a priority
+        ordered = sorted(enumerate(gestures), key=lambda item: (-item[1].get("priority", 0), item[0]))
+        self.names = [gesture["name"] for _, gesture in ordered]
+
+        features = {}
+        conditions = {}
+        all_sets = []
+        any_sets = []
+        for _, gesture in ordered:
+            for key, target in (("all", all_sets), ("any", any_sets)):
+                indices = []
+                for condition in gesture.get(key, []):
+                    feature, op, threshold = _parse_condition(condition)
+                    if feature not in features:
+                        features[feature] = _parse_feature(feature)
+                    atom = (feature, op, threshold)
+                    indices.append(conditions.setdefault(atom, len(conditions)))
+                target.append(sorted(set(indices)))
+
+        self.feature_names = list(features)
+        self._compile_features(features)
+        self._compile_conditions(list(conditions))
+        self._compile_rules(all_sets, any_sets)
+
+    def _compile_features(self, features):
+        # Group features by kind so each kind is one fancy-indexing operation
+        self._feature_groups = []
+        for kind in FEATURE_ARITY:
+            columns = [i for i, name in enumerate(self.feature_names) if features[name][0] == kind]
+            if not columns:
+                continue
+            landmarks = np.array([features[self.feature_names[i]][1] for i in columns])
+            self._feature_groups.append((kind, np.array(columns), landmarks))
+
+    def _compile_conditions(self, conditions):
+        feature_column = {name: i for i, name in enumerate(self.feature_names)}
+        self.conditions = conditions
+        self._condition_feature = np.array([feature_column[f] for f, _, _ in conditions], dtype=np.intp)
+        self._condition_sign = np.array([OPS[op][0] for _, op, _ in conditions], dtype=np.float32)
+        self._condition_strict = np.array([OPS[op][1] for _, op, _ in conditions], dtype=bool)
+        self._condition_threshold = np.array([t for _, _, t in conditions], dtype=np.float32)
+
+    def _compile_rules(self, all_sets, any_sets):
+        count = len(self.conditions)
+        self._all_matrix = np.zeros((count, len(all_sets)), dtype=np.float32)
+        self._any_matrix = np.zeros((count, len(any_sets)), dtype=np.float32)
+        for rule, indices in enumerate(all_sets):
+            self._all_matrix[indices, rule] = 1
+        for rule, indices in enumerate(any_sets):
+            self._any_matrix[indices, rule] = 1
+        self._all_required = self._all_matrix.sum(axis=0)
+        self._has_any = self._any_matrix.sum(axis=0) > 0
+
+    def features(self, points):
+        """Compute every referenced feature once: (N, len(feature_names)) float32"""
+        values = np.empty((points.shape[0], len(self.feature_names)), dtype=np.float32)
+        x = points[:, :, 0]
+        y = points[:, :, 1]
+        for kind, columns, landmarks in self._feature_groups:
+            if kind == "x":
+                values[:, columns] = x[:, landmarks[:, 0]]
+            elif kind == "y":
+                values[:, columns] = y[:, landmarks[:, 0]]
+            else:
+                a, b = landmarks[:, 0], landmarks[:, 1]
+                if kind in ("dx", "gap_x"):
+                    diff = x[:, b] - x[:, a]
+                elif kind in ("dy", "gap_y"):
+                    diff = y[:, b] - y[:, a]
+                else:
+                    diff = np.hypot(x[:, b] - x[:, a], y[:, b] - y[:, a])
+                values[:, columns] = np.abs(diff) if kind.startswith("gap") else diff
+        return values
+
+    def matches(self, points):
+        """Boolean (N, len(names)) matrix of which rules hold for each hand"""
+        values = self.features(points)
+        signed = self._condition_sign * (values[:, self._condition_feature] - self._condition_threshold)
+        satisfied = np.where(self._condition_strict, signed < 0, signed <= 0).astype(np.float32)
+
+        matched = satisfied @ self._all_matrix == self._all_required
+        if self._has_any.any():
+            matched &= ~self._has_any | (satisfied @ self._any_matrix > 0)
+        return matched
+
+    def first_match(self, points):
+        """Index into names of the winning rule per hand, -1 when nothing matches"""
+        matched = self.matches(points)
+        if not self.names:
+            return np.full(points.shape[0], -1)
+        first = matched.argmax(axis=1)
+        return np.where(matched.any(axis=1), first, -1)
+
+
+def load_rules(path):
+    with open(path) as f:
+        spec = json.load(f)
+    return RuleSet(spec["gestures"], spec.get("default"))
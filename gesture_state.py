@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class GestureStateMachine:
+    """Turns per-frame gesture labels into a stable, debounced gesture
+
+    Every label is stored with its timestamp in a fixed-size ring buffer and
+    the decision is a majority vote over the last window seconds, so it does
+    not depend on the frame rate and survives single misclassified frames.
+
+    A gesture becomes active once it has led the vote for hold_time seconds
+    with at least enter_ratio of the window, and stays active until its
+    share drops below exit_ratio. The gap between the two ratios is the
+    hysteresis that stops a gesture near a rule threshold from flickering.
+    """
+
+    def __init__(self, hold_time=0.15, window=0.3, enter_ratio=0.6, exit_ratio=0.3,
+                 idle=None, capacity=64):
+        self.hold_time = hold_time
+        self.window = window
+        self.enter_ratio = enter_ratio
+        self.exit_ratio = exit_ratio
+
+        # Labels are interned to small integers so votes are a single bincount;
+        # the idle label ("no gesture") is always 0 and never becomes active
+        self.idle = idle
+        self.label_ids = {idle: 0}
+        self.label_names = [idle]
+
+        self.times = np.full(capacity, -np.inf)
+        self.labels = np.zeros(capacity, dtype=np.intp)
+        self.next_slot = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the vote history, e.g. when the hand leaves the frame"""
+        self.times.fill(-np.inf)
+        self.next_slot = 0
+        self.active = self.idle
+        self.active_since = None
+        self.candidate = self.idle
+        self.candidate_since = None
+
+    def _label_id(self, label):
+        label_id = self.label_ids.get(label)
+        if label_id is None:
+            label_id = self.label_ids[label] = len(self.label_names)
+            self.label_names.append(label)
+        return label_id
+
+    def votes(self, t):
+        """Share of the window held by each label, indexed by label id"""
+        recent = self.labels[self.times > t - self.window]
+        counts = np.bincount(recent, minlength=len(self.label_names))
+        return counts / max(len(recent), 1)
+
+    def confidence(self, t):
+        """Share of the window held by the active gesture, 0 when idle"""
+        if self.active == self.idle:
+            return 0.0
+        return float(self.votes(t)[self.label_ids[self.active]])
+
+    def update(self, t, label):
+        """Add a classification at time t; returns the active gesture (idle if none)"""
+        slot = self.next_slot
+        self.times[slot] = t
+        self.labels[slot] = self._label_id(label)
+        self.next_slot = (slot + 1) % len(self.times)
+
+        shares = self.votes(t)
+        if self.active != self.idle:
+            if shares[self.label_ids[self.active]] >= self.exit_ratio:
+                return self.active
+            self.active = self.idle
+            self.active_since = None
+
+        # The leading non-idle label enters once it has led for hold_time
+        # and holds at least enter_ratio of the window
+        shares[0] = 0.0
+        best = int(shares.argmax())
+        if best == 0:
+            self.candidate = self.idle
+            self.candidate_since = None
+            return self.active
+
+        leader = self.label_names[best]
+        if leader != self.candidate:
+            self.candidate = leader
+            self.candidate_since = t
+        if shares[best] >= self.enter_ratio and t - self.candidate_since >= self.hold_time:
+            self.active = leader
+            self.active_since = t
+            self.candidate = self.idle
+            self.candidate_since = None
+        return self.active
+
+
+class ActionCooldowns:
+    """Per-gesture cooldowns between actions, shared by every tracked hand
+
+    Gestures missing from cooldowns use default_cooldown (seconds).
+    """
+
+    def __init__(self, cooldowns=None, default_cooldown=0.0):
+        self.cooldowns = dict(cooldowns or {})
+        self.default_cooldown = default_cooldown
+        self.last_fired = {}
+
+    def ready(self, gesture, t):
+        """True (and restart the cooldown) if gesture may trigger its action at time t"""
+        cooldown = self.cooldowns.get(gesture, self.default_cooldown)
+        last = self.last_fired.get(gesture)
+        if last is not None and t - last < cooldown:
+            return False
+        self.last_fired[gesture] = t
+        return True
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import numpy as np
+
+
+class HandModel:
+    """MediaPipe Hands, imported and initialised on a background thread
+
+    Importing mediapipe and building the graph takes seconds, so start()
+    does it on a daemon thread while the camera opens, and runs one
+    inference on a blank frame so the first real frame does not pay for
+    the lazy graph setup either. process() waits for the model on first
+    use; without start() it loads synchronously, and replaying a recorded
+    session never loads it at all.
+    """
+
+    def __init__(self, max_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5,
+                 warm_up_shape=(240, 320, 3)):
+        self.options = {
+            "static_image_mode": False,
+            "max_num_hands": max_hands,
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence,
+        }
+        self.warm_up_shape = warm_up_shape
+        self.solutions = None
+        self.hands = None
+        self.error = None
+        self.load_time = None
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def settings(self):
+        """Constructor arguments that build the same model, e.g. in a worker process"""
+        return {
+            "max_hands": self.options["max_num_hands"],
+            "min_detection_confidence": self.options["min_detection_confidence"],
+            "min_tracking_confidence": self.options["min_tracking_confidence"],
+            "warm_up_shape": self.warm_up_shape,
+        }
+
+    def start(self):
+        """Begin loading in the background"""
+        with self.lock:
+            if self.thread is None and not self.ready.is_set():
+                self.thread = threading.Thread(target=self._load, name="hand-model", daemon=True)
+                self.thread.start()
+        return self
+
+    def _load(self):
+        try:
+            start = time.perf_counter()
+            import mediapipe as mp
+            hands = mp.solutions.hands.Hands(**self.options)
+            if self.warm_up_shape:
+                hands.process(np.zeros(self.warm_up_shape, dtype=np.uint8))
+            self.solutions = mp.solutions
+            self.hands = hands
+            self.load_time = time.perf_counter() - start
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ready.set()
+
+    def wait(self):
+        """Block until the model is loaded; re-raises a loading error"""
+        if not self.ready.is_set():
+            self.start()
+            self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self.hands
+
+    def process(self, image_rgb):
+        hands = self.hands
+        if hands is None:
+            hands = self.wait()
+        return hands.process(image_rgb)
+
+    def draw(self, image, hand_landmarks):
+        """Draw one hand's landmarks and connections"""
+        self.wait()
+        self.solutions.drawing_utils.draw_landmarks(
+            image, hand_landmarks, self.solutions.hands.HAND_CONNECTIONS)
+
+    def close(self):
+        if self.hands is not None:
+            self.hands.close()
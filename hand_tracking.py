@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+
+from trajectory import PALM
+
+THUMB_TIP = 4
+INDEX_TIP = 8
+
+
+class HandTrack:
+    """One tracked hand: a stable ID, its handedness and the caller's per-hand state"""
+
+    def __init__(self, track_id, handedness, center, t, state):
+        self.track_id = track_id
+        self.handedness = handedness  # As first detected, so the key never changes
+        self.center = center
+        self.last_seen = t
+        self.state = state
+
+    @property
+    def key(self):
+        return (self.handedness, self.track_id)
+
+
+class HandTracker:
+    """Gives every detected hand a stable track ID and its own state object
+
+    update() matches this frame's hands to known tracks by palm centre
+    distance, adding handedness_penalty when MediaPipe's handedness label
+    disagrees, cheapest pair first. Hands further than max_distance from
+    every track start a new track with state from make_state(). Tracks not
+    seen for forget_after seconds are dropped together with their state.
+    """
+
+    def __init__(self, make_state, max_distance=0.25, handedness_penalty=0.1, forget_after=0.5):
+        self.make_state = make_state
+        self.max_distance = max_distance
+        self.handedness_penalty = handedness_penalty
+        self.forget_after = forget_after
+        self.tracks = {}
+        self.next_id = 0
+
+    def reset(self):
+        self.tracks.clear()
+
+    def update(self, t, handedness, points):
+        """Return the HandTrack of each hand, in the order of the (N, 21, 3) points batch"""
+        self.tracks = {track_id: track for track_id, track in self.tracks.items()
+                       if t - track.last_seen <= self.forget_after}
+        centers = points[:, PALM, :2].mean(axis=1)
+        matched = [None] * len(centers)
+
+        known = list(self.tracks.values())
+        if known and len(centers):
+            distance = np.linalg.norm(centers[:, np.newaxis] - np.array([track.center for track in known]), axis=2)
+            labels = np.array([track.handedness for track in known], dtype=object)
+            mismatch = labels[np.newaxis, :] != np.array(handedness, dtype=object)[:, np.newaxis]
+            cost = np.where(distance <= self.max_distance, distance + self.handedness_penalty * mismatch, np.inf)
+
+            taken = set()
+            for flat in np.argsort(cost, axis=None):
+                hand, candidate = divmod(int(flat), len(known))
+                if not np.isfinite(cost[hand, candidate]):
+                    break
+                if matched[hand] is None and candidate not in taken:
+                    matched[hand] = known[candidate]
+                    taken.add(candidate)
+
+        for i, center in enumerate(centers):
+            track = matched[i]
+            if track is None:
+                track = HandTrack(self.next_id, handedness[i], center, t, self.make_state())
+                self.tracks[track.track_id] = track
+                self.next_id += 1
+                matched[i] = track
+            track.center = center
+            track.last_seen = t
+        return matched
+
+
+class PinchZoom:
+    """Two-hand zoom: both hands pinching, steps as the distance between the pinches changes
+
+    update() returns "zoom_in" or "zoom_out" each time the distance between
+    the two pinch points has grown or shrunk by step since the last event.
+    """
+
+    def __init__(self, gesture="pinch", step=0.15):
+        self.gesture = gesture
+        self.step = step
+        self.reference = None
+
+    @property
+    def active(self):
+        return self.reference is not None
+
+    def update(self, gestures, points):
+        """gestures holds the stable gesture of each hand in the (N, 21, 3) points batch"""
+        pinching = [i for i, gesture in enumerate(gestures) if gesture == self.gesture]
+        if len(pinching) < 2:
+            self.reference = None
+            return None
+
+        pinch_points = points[pinching[:2]][:, [THUMB_TIP, INDEX_TIP], :2].mean(axis=1)
+        distance = math.hypot(*(pinch_points[1] - pinch_points[0]))
+        if self.reference is None:
+            self.reference = distance
+            return None
+
+        ratio = distance / max(self.reference, 1e-6)
+        if ratio >= 1 + self.step:
+            self.reference = distance
+            return "zoom_in"
+        if ratio <= 1 / (1 + self.step):
+            self.reference = distance
+            return "zoom_out"
+        return None
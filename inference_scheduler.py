@@ -0,0 +1,66 @@
+import time
+
+import cv2
+
+RUN = "run"      # Run hands.process on this frame
+REUSE = "reuse"  # Feed the previous landmarks through the gesture logic again
+SKIP = "skip"    # Nothing to do; keep showing the previous results
+
+
+class InferenceScheduler:
+    """Gates hands.process behind a cheap motion check on a tiny grayscale thumbnail
+
+    Motion is the mean absolute difference between the current thumbnail and
+    the one taken at the last inference, so slow drift still adds up. While a
+    hand is tracked, inference runs on motion and at least min_tracking_fps;
+    otherwise the previous landmarks are reused. With no hand present,
+    inference runs on motion or at idle_fps and frames are otherwise skipped.
+    """
+
+    def __init__(self, motion_threshold=6.0, min_tracking_fps=10.0, idle_fps=2.0, probe_size=(32, 24)):
+        self.motion_threshold = motion_threshold
+        self.min_tracking_interval = 1.0 / min_tracking_fps
+        self.idle_interval = 1.0 / idle_fps
+        self.probe_size = probe_size
+
+        self.reference = None
+        self.last_inference = None
+        self.hand_present = False
+        self.counts = {RUN: 0, REUSE: 0, SKIP: 0}
+
+    def _thumbnail(self, image):
+        small = cv2.resize(image, self.probe_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def decide(self, image, now=None):
+        """Return RUN, REUSE or SKIP for a BGR frame"""
+        if now is None:
+            now = time.perf_counter()
+        thumbnail = self._thumbnail(image)
+
+        if self.reference is None:
+            decision = RUN
+        else:
+            motion = cv2.absdiff(thumbnail, self.reference).mean()
+            elapsed = now - self.last_inference
+            if motion > self.motion_threshold:
+                decision = RUN
+            elif self.hand_present:
+                decision = RUN if elapsed >= self.min_tracking_interval else REUSE
+            else:
+                decision = RUN if elapsed >= self.idle_interval else SKIP
+
+        if decision == RUN:
+            self.reference = thumbnail
+            self.last_inference = now
+        self.counts[decision] += 1
+        return decision
+
+    def observe(self, hand_present):
+        """Report whether the inference just run found a hand"""
+        self.hand_present = hand_present
+
+    def format_counts(self):
+        total = sum(self.counts.values()) or 1
+        return ", ".join(f"{name} {count} ({100 * count / total:.0f}%)"
+                         for name, count in self.counts.items())
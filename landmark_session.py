@@ -0,0 +1,150 @@
+import shutil
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from gesture_classifier import landmarks_to_array
+
+# File layout: a fixed header followed by one contiguous block per column.
+#   header    magic, version, max_hands, frame_count, 4 column offsets
+#   timestamps  float64 (N,)
+#   hand_count  uint8   (N,)
+#   handedness  int8    (N, max_hands)         -1 empty, 0 left, 1 right
+#   landmarks   float32 (N, max_hands, 21, 3)  normalised MediaPipe coordinates
+MAGIC = b"GTCLMK01"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQ4Q")
+ALIGNMENT = 64
+
+HANDEDNESS_CODES = {"Left": 0, "Right": 1}
+HANDEDNESS_LABELS = {0: "Left", 1: "Right"}
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SessionWriter:
+    """Records per-frame hand landmarks into a columnar session file
+
+    Columns are spooled to temporary files while recording so memory stays
+    flat, then laid out back to back when the writer is closed. max_hands
+    must be at least the hand model's, since every frame reserves room for
+    that many hands; a frame with more raises ValueError.
+    """
+
+    def __init__(self, path, max_hands=2):
+        self.path = path
+        self.max_hands = max_hands
+        self.frame_count = 0
+
+        self._columns = [tempfile.TemporaryFile() for _ in range(4)]
+        self._handedness = np.empty(max_hands, dtype=np.int8)
+        self._landmarks = np.zeros((max_hands, 21, 3), dtype=np.float32)
+
+    def write(self, timestamp, hands):
+        """Append one frame; hands is a list of (handedness, (21, 3) points) pairs"""
+        if len(hands) > self.max_hands:
+            raise ValueError(f"Frame has {len(hands)} hands; the session records at most {self.max_hands}")
+        self._handedness.fill(-1)
+        self._landmarks.fill(0)
+        for i, (handedness, points) in enumerate(hands):
+            self._handedness[i] = HANDEDNESS_CODES.get(handedness, -1)
+            self._landmarks[i] = points
+
+        timestamps, counts, handedness, landmarks = self._columns
+        timestamps.write(struct.pack("<d", timestamp))
+        counts.write(struct.pack("<B", len(hands)))
+        handedness.write(self._handedness.tobytes())
+        landmarks.write(self._landmarks.tobytes())
+        self.frame_count += 1
+
+    def close(self):
+        offsets = []
+        with open(self.path, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            for column in self._columns:
+                offset = _align(f.tell())
+                f.write(b"\0" * (offset - f.tell()))
+                offsets.append(offset)
+                column.seek(0)
+                shutil.copyfileobj(column, f)
+                column.close()
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, self.max_hands, self.frame_count, *offsets))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SessionReader:
+    """Memory-maps a session file; columns are exposed as read-only NumPy arrays"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise IOError(f"Not a landmark session file: {path}")
+
+        magic, version, max_hands, frame_count, *offsets = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise IOError(f"Not a landmark session file: {path}")
+        self.max_hands = max_hands
+
+        def column(index, dtype, shape):
+            if frame_count == 0:
+                return np.empty(shape, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r", offset=offsets[index], shape=shape)
+
+        self.timestamps = column(0, np.float64, (frame_count,))
+        self.hand_counts = column(1, np.uint8, (frame_count,))
+        self.handedness = column(2, np.int8, (frame_count, max_hands))
+        self.landmarks = column(3, np.float32, (frame_count, max_hands, 21, 3))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frame(self, index):
+        """Return (timestamp, [(handedness, (21, 3) points), ...]) for one frame"""
+        count = self.hand_counts[index]
+        hands = [
+            (HANDEDNESS_LABELS.get(int(self.handedness[index, i])), self.landmarks[index, i])
+            for i in range(count)
+        ]
+        return float(self.timestamps[index]), hands
+
+    def hand_landmarks(self):
+        """All recorded hands as one (M, 21, 3) array, for batch classification"""
+        mask = np.arange(self.max_hands) < self.hand_counts[:, np.newaxis]
+        return self.landmarks[mask]
+
+
+def replay(reader, realtime=True, speed=1.0):
+    """Yield recorded frames, paced to their original timing unless realtime is False"""
+    start_wall = time.perf_counter()
+    start_recorded = reader.timestamps[0] if len(reader) else 0.0
+    for index in range(len(reader)):
+        timestamp, hands = reader.frame(index)
+        if realtime:
+            delay = (timestamp - start_recorded) / speed - (time.perf_counter() - start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        yield timestamp, hands
+
+
+def hands_from_results(results, out=None):
+    """Convert MediaPipe results into a list of (handedness, (21, 3) points) pairs"""
+    hands = []
+    if results.multi_hand_landmarks:
+        handedness = results.multi_handedness or []
+        for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            label = handedness[i].classification[0].label if i < len(handedness) else None
+            buffer = out[i] if out is not None and i < len(out) else None
+            hands.append((label, landmarks_to_array(hand_landmarks, buffer)))
+    return hands
@@ -0,0 +1,52 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access
+
+    Lets the controllers name heavy or OS-specific modules at the top of the
+    file without paying for them at startup, or at all when the gestures
+    that need them never fire. preload() imports the module on a background
+    thread so the first real use does not stall the frame loop.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+    def preload(self):
+        """Import in the background; errors surface again on first use"""
+        def load():
+            try:
+                self._load()
+            except Exception as e:
+                print(f"Could not preload {self._name}: {e}")
+
+        threading.Thread(target=load, name=f"preload-{self._name}", daemon=True).start()
+        return self
+
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -0,0 +1,213 @@
+import numpy as np
+
+WRIST = 0
+MIDDLE_MCP = 9
+
+# Training label for "no gesture"; predictions of it map to the classifier default
+NONE_LABEL = "none"
+
+
+def normalize_landmarks(points):
+    """Map a (N, 21, 3) batch to (N, 60) features invariant to position, size and in-plane rotation
+
+    The wrist moves to the origin, the wrist to middle knuckle vector becomes
+    unit length and points straight up. Left and right hands stay mirror
+    images of each other, so train with whichever hands will be used.
+    """
+    if len(points) == 1:
+        return _normalize_one(points[0])
+
+    p = points[:, 1:, :] - points[:, WRIST:WRIST + 1, :]
+    axis = p[:, MIDDLE_MCP - 1, :2]
+    scale_sq = np.maximum((axis * axis).sum(axis=1), 1e-12)
+
+    # Rotation taking the knuckle direction u to (0, -1), divided by the
+    # scale: rows of the transposed matrix are (-uy, -ux), (ux, -uy), (0, 0)
+    # and z keeps only the scaling. axis / scale^2 is u / scale.
+    ux = axis[:, 0] / scale_sq
+    uy = axis[:, 1] / scale_sq
+    rotation = np.zeros((len(points), 3, 3), dtype=np.float32)
+    rotation[:, 0, 0] = -uy
+    rotation[:, 0, 1] = -ux
+    rotation[:, 1, 0] = ux
+    rotation[:, 1, 1] = -uy
+    rotation[:, 2, 2] = 1 / np.sqrt(scale_sq)
+    return np.matmul(p, rotation).reshape(len(points), -1)
+
+
+def _normalize_one(points):
+    """normalize_landmarks for the common single-hand frame, with scalar maths for the rotation"""
+    p = points[1:] - points[WRIST]
+    ax = float(p[MIDDLE_MCP - 1, 0])
+    ay = float(p[MIDDLE_MCP - 1, 1])
+    scale_sq = max(ax * ax + ay * ay, 1e-12)
+    ux = ax / scale_sq
+    uy = ay / scale_sq
+    rotation = np.array([[-uy, -ux, 0.0], [ux, -uy, 0.0], [0.0, 0.0, scale_sq ** -0.5]], dtype=np.float32)
+    return (p @ rotation).reshape(1, -1)
+
+
+class LearnedModel:
+    """Shared prediction path; subclasses implement _scores(features) -> (N, classes)
+
+    Exposes names, default and first_match(points) like a gesture RuleSet,
+    so GestureClassifier can use either. Hands whose best score is below
+    min_confidence, or that look most like the "none" class, get -1.
+    """
+
+    kind = None
+    default = None
+
+    def __init__(self, labels, min_confidence=0.5):
+        self.labels = list(labels)
+        self.names = self.labels
+        self.min_confidence = min_confidence
+        self._none = self.labels.index(NONE_LABEL) if NONE_LABEL in self.labels else -1
+
+    def predict(self, points):
+        """Return (class index, confidence) per hand"""
+        scores = self._scores(normalize_landmarks(points))
+        return scores.argmax(axis=1), scores.max(axis=1)
+
+    def first_match(self, points):
+        best, confidence = self.predict(points)
+        rejected = (confidence < self.min_confidence) | (best == self._none)
+        return np.where(rejected, -1, best)
+
+    def save(self, path):
+        np.savez_compressed(path, kind=self.kind, labels=np.array(self.labels),
+                            min_confidence=self.min_confidence, **self._arrays())
+
+
+class KNNModel(LearnedModel):
+    """k-nearest neighbours over normalised landmarks; confidence is the winning vote share"""
+
+    kind = "knn"
+
+    def __init__(self, labels, prototypes, targets, k=5, min_confidence=0.5):
+        super().__init__(labels, min_confidence)
+        self.prototypes = np.ascontiguousarray(prototypes, dtype=np.float32)
+        self.targets = np.asarray(targets, dtype=np.intp)
+        self.k = min(k, len(self.targets))
+        self._norms = (self.prototypes ** 2).sum(axis=1)
+
+    @classmethod
+    def fit(cls, features, targets, labels, k=5, max_per_class=200, seed=0, min_confidence=0.5):
+        """Keep at most max_per_class random prototypes per class to bound inference cost"""
+        rng = np.random.default_rng(seed)
+        keep = []
+        for target in np.unique(targets):
+            indices = np.flatnonzero(targets == target)
+            if len(indices) > max_per_class:
+                indices = rng.choice(indices, max_per_class, replace=False)
+            keep.append(indices)
+        keep = np.concatenate(keep)
+        return cls(labels, features[keep], targets[keep], k, min_confidence)
+
+    def _scores(self, features):
+        # Squared distances without materialising (N, M, 60) differences
+        distance = self._norms - 2 * features @ self.prototypes.T
+        nearest = np.argpartition(distance, self.k - 1, axis=1)[:, :self.k]
+        classes = len(self.labels)
+        cells = self.targets[nearest] + classes * np.arange(len(features))[:, np.newaxis]
+        votes = np.bincount(cells.ravel(), minlength=classes * len(features))
+        return votes.reshape(len(features), classes) / self.k
+
+    def _arrays(self):
+        # Half precision prototypes halve the file; they are widened again on load
+        return {"prototypes": self.prototypes.astype(np.float16),
+                "targets": self.targets.astype(np.int16), "k": self.k}
+
+
+class MLPModel(LearnedModel):
+    """One hidden ReLU layer with a softmax output; confidence is the class probability"""
+
+    kind = "mlp"
+
+    def __init__(self, labels, mean, std, w1, b1, w2, b2, min_confidence=0.5):
+        super().__init__(labels, min_confidence)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        self.w1 = np.asarray(w1, dtype=np.float32)
+        self.b1 = np.asarray(b1, dtype=np.float32)
+        self.w2 = np.asarray(w2, dtype=np.float32)
+        self.b2 = np.asarray(b2, dtype=np.float32)
+
+        # Fold input standardisation into the first layer for inference
+        self._w1 = self.w1 / self.std[:, np.newaxis]
+        self._b1 = self.b1 - (self.mean / self.std) @ self.w1
+
+    @classmethod
+    def fit(cls, features, targets, labels, hidden=64, epochs=300, learning_rate=0.01,
+            weight_decay=1e-4, seed=0, min_confidence=0.5):
+        """Full-batch Adam on cross-entropy with L2 weight decay"""
+        rng = np.random.default_rng(seed)
+        mean = features.mean(axis=0)
+        std = features.std(axis=0) + 1e-6
+        x = (features - mean) / std
+        onehot = np.eye(len(labels), dtype=np.float32)[targets]
+
+        params = [
+            rng.normal(0, np.sqrt(2 / x.shape[1]), (x.shape[1], hidden)).astype(np.float32),
+            np.zeros(hidden, dtype=np.float32),
+            rng.normal(0, np.sqrt(1 / hidden), (hidden, len(labels))).astype(np.float32),
+            np.zeros(len(labels), dtype=np.float32),
+        ]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2 = 0.9, 0.999
+
+        for step in range(1, epochs + 1):
+            w1, b1, w2, b2 = params
+            h = np.maximum(x @ w1 + b1, 0)
+            probabilities = _softmax(h @ w2 + b2)
+
+            d_logits = (probabilities - onehot) / len(x)
+            d_h = (d_logits @ w2.T) * (h > 0)
+            grads = [x.T @ d_h + weight_decay * w1, d_h.sum(axis=0),
+                     h.T @ d_logits + weight_decay * w2, d_logits.sum(axis=0)]
+
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                p -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-8)
+
+        return cls(labels, mean, std, *params, min_confidence=min_confidence)
+
+    def _scores(self, features):
+        h = features @ self._w1
+        h += self._b1
+        np.maximum(h, 0, out=h)
+        logits = h @ self.w2
+        logits += self.b2
+        return _softmax(logits)
+
+    def _arrays(self):
+        return {"mean": self.mean, "std": self.std,
+                "w1": self.w1, "b1": self.b1, "w2": self.w2, "b2": self.b2}
+
+
+def _softmax(logits):
+    """Row-wise softmax, computed in place"""
+    logits -= logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+MODELS = {"knn": KNNModel, "mlp": MLPModel}
+
+
+def load_model(path):
+    with np.load(path) as data:
+        kind = str(data["kind"])
+        labels = [str(label) for label in data["labels"]]
+        min_confidence = float(data["min_confidence"])
+        if kind == "knn":
+            return KNNModel(labels, data["prototypes"], data["targets"], int(data["k"]), min_confidence)
+        if kind == "mlp":
+            return MLPModel(labels, data["mean"], data["std"], data["w1"], data["b1"],
+                            data["w2"], data["b2"], min_confidence)
+    raise ValueError(f"Unknown gesture model kind {kind!r} in {path}")
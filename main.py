@@ -1,153 +1,158 @@
+import argparse
 import cv2
-import mediapipe as mp
 import numpy as np
 import time
-import pyautogui
-import os
-import subprocess
-import ctypes
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-import webbrowser
-import keyboard
-import win32gui
-import win32con
-from PIL import ImageGrab
+from collections import Counter, deque
+
+from action_backends import get_backend, BACKENDS
+from hand_model import HandModel
+from screenshot_service import ScreenshotService, SCREENSHOT_FORMATS
+from event_log import EventLog, NULL_EVENT_LOG
+from metrics import Metrics, MetricsExporter, FrameProfiler, NULL_METRICS
+from gesture_classifier import load_classifier, DESKTOP_GESTURES, landmarks_to_array
+from gesture_state import GestureStateMachine, ActionCooldowns
+from hand_tracking import HandTracker
+from pipeline import FramePipeline
+from multi_stream import MultiStreamInference, StreamFusion
+from control import ControlChannel, OverlaySubscriber
+from action_executor import ActionExecutor
+from frame_sources import FrameSource, open_source
+from camera_tuning import CaptureTuner, DEFAULT_CACHE
+from landmark_session import SessionWriter, SessionReader, replay, hands_from_results
+from preprocess import FramePreprocessor
+from roi_tracker import RoiTracker
+from inference_scheduler import InferenceScheduler, RUN, REUSE, SKIP
+from stage_timing import NULL_RECORDER
 
 class HandGestureControl:
-    def __init__(self):
-        # Initialize MediaPipe Hand solution
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
-        
-        # Initialize webcam
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            raise IOError("Cannot open webcam")
-        
-        # Initialize audio controls
-        self.setup_audio_controls()
-        
-        # Cooldown mechanism to prevent repeated triggering
-        self.last_action_time = time.time()
-        self.cooldown = 2  # seconds between actions
-        
-        # State tracking
-        self.previous_gesture = None
-        self.gesture_start_time = 0
-        self.gesture_hold_time = 0.8  # seconds to hold gesture before triggering
-        self.is_muted = False
+    def __init__(self, source=0, record_path=None, roi=False, scheduler=None, mirror_image=True,
+                 gestures=DESKTOP_GESTURES, max_hands=1, hand_model=None, backend=None,
+                 screenshots=None, event_log=None, metrics=None, profiler=None):
+        # MediaPipe Hands loads in the background for live input; pass a
+        # started HandModel to overlap loading with opening the source
+        if hand_model is None:
+            hand_model = HandModel(max_hands, min_detection_confidence=0.7, min_tracking_confidence=0.5)
+            if source is not None:
+                hand_model.start()
+        self.hand_model = hand_model
+        
+        # Gesture rules compiled from a config file, and reusable landmark buffers, one per hand
+        self.classifier = load_classifier(gestures, default="unknown")
+        self.landmark_buffers = np.empty((max_hands, 21, 3), dtype=np.float32)
+        
+        # Initialize the frame source: a FrameSource, a spec such as a camera
+        # index or video path, or None when replaying a recorded session
+        if source is not None and not isinstance(source, FrameSource):
+            source = open_source(source)
+        self.source = source
+        
+        # Optional landmark recorder for offline replay
+        self.recorder = SessionWriter(record_path, max_hands) if record_path else None
+        
+        # Flip and colour conversion into reusable buffers
+        self.preprocessor = FramePreprocessor(mirror_image)
+        
+        # Optional hand region-of-interest cropping for cheaper inference
+        self.roi_tracker = RoiTracker() if roi else None
+        
+        # Optional motion-gated inference scheduler and the results it reuses
+        self.scheduler = scheduler
+        self.last_hands = []
+        self.last_hand_landmarks = []
+        self.last_detections = []
+        
+        # Set once the preview window has been shown; headless runs never open one
+        self.window_open = False
+        
+        # Counters and histograms for the metrics endpoint; stage timings
+        # feed its latency histogram unless benchmark.py replaces them
+        self.metrics = metrics or NULL_METRICS
+        self.timings = self.metrics if self.metrics.enabled else NULL_RECORDER
+        self.frame_counter = self.metrics.counter(
+            "frames_total", "Frames handled, by inference scheduler decision", ("decision",))
+        self.gesture_counter = self.metrics.counter(
+            "gestures_total", "Per-frame classification of each detected hand", ("gesture",))
+        self.action_counter = self.metrics.counter(
+            "actions_total", "Commands finished, by outcome", ("action", "outcome"))
+        
+        # Optional cProfile dumps of sampled frames
+        self.profiler = profiler or FrameProfiler()
+        
+        # OS operations for the commands: an ActionBackend, or a name from
+        # action_backends.BACKENDS; defaults to the one for this platform
+        if backend is None or isinstance(backend, str):
+            backend = get_backend(backend)
+        self.backend = backend
+        
+        # Screenshots are grabbed by the command and encoded on their own workers
+        self.screenshots = screenshots or ScreenshotService(self.backend.screenshot)
+        
+        # Debounce each tracked hand separately: hold a gesture for 0.8 s to
+        # trigger, then it waits out its own cooldown (seconds) before repeating
+        self.hand_tracker = HandTracker(
+            lambda: GestureStateMachine(hold_time=0.8, window=0.5, idle="unknown"))
+        self.cooldowns = ActionCooldowns({
+            "middle_finger": 10.0,
+            "thumbs_up": 1.0,
+            "thumbs_down": 1.0,
+            "victory": 5.0,
+        }, default_cooldown=2.0)
         
         # Status message
         self.status_message = "Ready"
         self.status_time = time.time()
         
-        # Command history
-        self.command_history = []
+        # Recent commands for the overlay; the full record goes to the event log
+        self.command_history = deque(maxlen=50)
+        self.events = event_log or NULL_EVENT_LOG
         
-        # Display size
-        self.screen_width, self.screen_height = pyautogui.size()
-    
-    def setup_audio_controls(self):
-        # Setup for volume control
-        devices = AudioUtilities.GetSpeakers()
-        interface = devices.Activate(
-            IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-        self.volume = cast(interface, POINTER(IAudioEndpointVolume))
-        
-        self.volume_range = (self.volume.GetVolumeRange()[0], self.volume.GetVolumeRange()[1])
-        self.current_volume = self.volume.GetMasterVolumeLevelScalar()
+        # OS commands run on a worker thread so they never stall the frame loop
+        self.executor = ActionExecutor(on_result=self.on_action_result)
+        self.action_timeouts = {
+            "thumbs_up": 2.0,
+            "thumbs_down": 2.0,
+            "victory": 5.0,
+            "open_palm": 2.0,
+            "fist": 2.0,
+            "pointing": 2.0,
+            "ok_sign": 10.0,
+        }
+        self.metrics.gauge("actions_dropped", "Commands dropped because the action queue was full",
+                           lambda: self.executor.dropped)
+        self.metrics.gauge("events_dropped", "Events dropped because the event log fell behind",
+                           lambda: self.events.dropped)
+        
+        # The backend opens its OS handles while the camera starts, ready for the first command
+        if source is not None:
+            self.backend.preload()
+            self.screenshots.start_burst()
     
     def detect_gesture(self, hand_landmarks):
         """Detect which gesture is being made based on hand landmarks"""
-        
-        # Extract landmark positions
-        points = []
-        for landmark in hand_landmarks.landmark:
-            points.append((landmark.x, landmark.y, landmark.z))
-        
-        # Check for middle finger gesture (just middle finger up)
-        if (points[12][1] > points[11][1] and  # Middle finger extended
-            points[8][1] > points[7][1] and   # Index finger down
-            points[16][1] > points[15][1] and  # Ring finger down
-            points[20][1] > points[19][1] and  # Pinky down
-            points[4][1] > points[3][1]):     # Thumb down
-            return "middle_finger"
-        
-        # Check for thumbs up
-        if (points[4][1] < points[3][1] and   # Thumb up
-            points[8][1] > points[7][1] and   # Index finger down
-            points[12][1] > points[11][1] and  # Middle finger down
-            points[16][1] > points[15][1] and  # Ring finger down
-            points[20][1] > points[19][1]):    # Pinky down
-            return "thumbs_up"
-        
-        # Check for thumbs down
-        if (points[4][1] > points[3][1] and   # Thumb down
-            points[8][1] > points[7][1] and   # Index finger down
-            points[12][1] > points[11][1] and  # Middle finger down
-            points[16][1] > points[15][1] and  # Ring finger down
-            points[20][1] > points[19][1] and  # Pinky down
-            points[4][0] > points[0][0]):      # Thumb to the right
-            return "thumbs_down"
-        
-        # Check for victory sign (index and middle fingers up)
-        if (points[8][1] < points[7][1] and   # Index finger up
-            points[12][1] < points[11][1] and  # Middle finger up
-            points[16][1] > points[15][1] and  # Ring finger down
-            points[20][1] > points[19][1]):    # Pinky down
-            return "victory"
-        
-        # Check for open palm (all fingers extended)
-        if (points[8][1] < points[5][1] and   # Index finger up
-            points[12][1] < points[9][1] and  # Middle finger up
-            points[16][1] < points[13][1] and  # Ring finger up
-            points[20][1] < points[17][1]):    # Pinky up
-            return "open_palm"
-        
-        # Check for fist (all fingers curled in)
-        if (points[8][1] > points[5][1] and   # Index finger curled
-            points[12][1] > points[9][1] and  # Middle finger curled
-            points[16][1] > points[13][1] and  # Ring finger curled
-            points[20][1] > points[17][1] and  # Pinky curled
-            points[4][1] > points[2][1]):      # Thumb curled
-            return "fist"
-        
-        # Check for pointing (just index finger up)
-        if (points[8][1] < points[7][1] and   # Index finger up
-            points[12][1] > points[11][1] and  # Middle finger down
-            points[16][1] > points[15][1] and  # Ring finger down
-            points[20][1] > points[19][1]):    # Pinky down
-            return "pointing"
-        
-        # Check for OK sign (thumb and index finger forming circle)
-        distance = np.sqrt(
-            (points[4][0] - points[8][0])**2 + 
-            (points[4][1] - points[8][1])**2
-        )
-        if distance < 0.1 and points[12][1] < points[11][1]:  # Proximity between thumb and index
-            return "ok_sign"
-        
-        return "unknown"
+        points = landmarks_to_array(hand_landmarks, self.landmark_buffers[0])
+        return self.classifier.classify(points)
     
-    def execute_command(self, gesture):
+    def execute_command(self, gesture, current_time=None, track=None):
         """Execute the command associated with the detected gesture"""
         
-        current_time = time.time()
-        # Only allow commands every few seconds to avoid rapid triggering
-        if current_time - self.last_action_time < self.cooldown:
+        if current_time is None:
+            current_time = time.time()
+        # Each gesture may only repeat once its cooldown has passed
+        if not self.cooldowns.ready(gesture, current_time):
             return
         
-        # Update status message and last action time
-        self.last_action_time = current_time
-        self.status_time = current_time
+        if track is not None:
+            self.events.log("gesture", t=current_time, gesture=gesture, hand=f"{track.handedness}-{track.track_id}",
+                            confidence=round(track.state.confidence(current_time), 3))
+        else:
+            self.events.log("gesture", t=current_time, gesture=gesture)
+        
+        # Hand the command to the action worker
+        self.executor.submit(gesture, self.run_command, gesture,
+                             timeout=self.action_timeouts.get(gesture))
+    
+    def run_command(self, gesture):
+        """Run the OS command for a gesture; called on the action worker thread"""
         
         try:
             if gesture == "middle_finger":
@@ -158,21 +163,17 @@ class HandGestureControl:
                 self.status_message = "Sleeping laptop..."
                 self.command_history.append("Sleep initiated")
                 # Put the laptop to sleep
-                ctypes.windll.powrprof.SetSuspendState(0, 1, 0)
+                self.backend.suspend()
 
             elif gesture == "thumbs_up":
                 # Increase volume by 10%
-                self.current_volume = min(1.0, self.current_volume + 0.1)
-                self.volume.SetMasterVolumeLevelScalar(self.current_volume, None)
-                volume_percent = int(self.current_volume * 100)
+                volume_percent = round(self.backend.change_volume(0.1) * 100)
                 self.status_message = f"Volume up: {volume_percent}%"
                 self.command_history.append(f"Volume increased to {volume_percent}%")
             
             elif gesture == "thumbs_down":
                 # Decrease volume by 10%
-                self.current_volume = max(0.0, self.current_volume - 0.1)
-                self.volume.SetMasterVolumeLevelScalar(self.current_volume, None)
-                volume_percent = int(self.current_volume * 100)
+                volume_percent = round(self.backend.change_volume(-0.1) * 100)
                 self.status_message = f"Volume down: {volume_percent}%"
                 self.command_history.append(f"Volume decreased to {volume_percent}%")
             
@@ -185,7 +186,7 @@ class HandGestureControl:
                 url = 'http://hanime.tv'
                 try:
                     # Try to open Brave in incognito mode
-                    subprocess.Popen(['start', 'brave', '--incognito', url], shell=True)
+                    self.backend.open_url(url, browser='brave', private=True)
                     self.status_message = "Opening Brave in incognito mode"
                     self.command_history.append("Brave browser (incognito) opened")
                 except Exception as e:
@@ -194,44 +195,65 @@ class HandGestureControl:
             
             elif gesture == "open_palm":
                 # Show desktop (Windows key + D)
-                pyautogui.hotkey('win', 'd')
+                self.backend.hotkey('win', 'd')
                 self.status_message = "Showing desktop"
                 self.command_history.append("Desktop shown")
             
             elif gesture == "fist":
                 # Toggle mute
-                self.is_muted = not self.is_muted
-                self.volume.SetMute(self.is_muted, None)
-                status = "muted" if self.is_muted else "unmuted"
+                status = "muted" if self.backend.toggle_mute() else "unmuted"
                 self.status_message = f"Audio {status}"
                 self.command_history.append(f"Audio {status}")
             
             elif gesture == "pointing":
                 # Alt+Tab to switch windows
-                pyautogui.hotkey('alt', 'tab')
+                self.backend.hotkey('alt', 'tab')
                 self.status_message = "Switching window"
                 self.command_history.append("Window switched")
             
             elif gesture == "ok_sign":
-                # Take screenshot
-                screenshot = ImageGrab.grab()
-                # Save to Pictures folder with timestamp
-                pictures_dir = os.path.join(os.path.expanduser('~'), 'Pictures')
-                if not os.path.exists(pictures_dir):
-                    os.makedirs(pictures_dir)
-                timestamp = time.strftime("%Y%m%d-%H%M%S")
-                screenshot_path = os.path.join(pictures_dir, f"screenshot_{timestamp}.png")
-                screenshot.save(screenshot_path)
-                self.status_message = f"Screenshot saved to {screenshot_path}"
-                self.command_history.append("Screenshot taken")
+                # Take screenshot, or save the recent screens in burst mode;
+                # they are written to the Pictures folder in the background
+                if self.screenshots.burst:
+                    saves = self.screenshots.save_burst()
+                    self.status_message = f"Saving the last {len(saves)} screens"
+                    self.command_history.append("Screenshot burst saved")
+                else:
+                    saves = [self.screenshots.capture()]
+                    self.status_message = "Saving screenshot"
+                    self.command_history.append("Screenshot taken")
+                for save in saves:
+                    save.add_done_callback(self.on_screenshot_saved)
             
         except Exception as e:
             self.status_message = f"Error: {str(e)}"
             print(f"Command execution error: {str(e)}")
+            # Reported to on_action_result as an error
+            raise
+        finally:
+            self.status_time = time.time()
+        return self.status_message
     
-    def run(self):
-        """Main loop to capture video and detect gestures"""
-        
+    def on_screenshot_saved(self, future):
+        error = future.exception()
+        if error is not None:
+            self.status_message = f"Error saving screenshot: {error}"
+        else:
+            self.status_message = f"Screenshot saved to {future.result()}"
+        self.status_time = time.time()
+    
+    def on_action_result(self, result):
+        """Log every action and surface those that never completed; run_command reports the rest itself"""
+        self.timings.add("action", result.latency)
+        self.action_counter.inc((result.name, result.status))
+        self.events.log("action", action=result.name, outcome=result.status, latency=round(result.latency, 4),
+                        detail=str(result.error) if result.error is not None else result.value)
+        if result.status in ("timeout", "expired"):
+            self.status_message = f"Command {result.name} {'timed out' if result.status == 'timeout' else 'expired'}"
+            self.status_time = time.time()
+            self.command_history.append(f"{result.name} {result.status}")
+    
+    def print_instructions(self, headless=False):
         print("Hand Gesture Control System is active.")
         print("Available gestures:")
         print("- Middle Finger: Shutdown PC (10s warning)")
@@ -242,81 +264,410 @@ class HandGestureControl:
         print("- Fist: Toggle mute/unmute")
         print("- Pointing (index finger): Switch window")
         print("- OK Sign: Take screenshot")
-        print("\nPress 'q' to quit")
+        if headless:
+            print("\nSend SIGINT/SIGTERM or 'stop' on the control socket to quit")
+        else:
+            print("\nPress 'q' to quit")
+    
+    def process_frame(self, image):
+        """Run hand detection on a mirrored BGR frame and act on held gestures
+        
+        Returns a list of (hand_landmarks, gesture) pairs for the overlay.
+        """
+        
+        frame_shape = image.shape
+        current_time = time.time()
+        
+        # Skip inference, or reuse the last landmarks, when little has moved
+        decision = self.scheduler.decide(image) if self.scheduler else RUN
+        self.frame_counter.inc(decision)
+        if decision == SKIP:
+            return self.last_detections
+        if decision == REUSE:
+            gestures = self.handle_hands(self.last_hands, current_time)
+            self.last_detections = list(zip(self.last_hand_landmarks, gestures))
+            return self.last_detections
+        
+        # Crop to the tracked hand when ROI tracking is enabled
+        roi = None
+        if self.roi_tracker:
+            image, roi = self.roi_tracker.crop(image)
+        
+        # Convert the image to RGB
+        with self.timings.stage("color"):
+            image_rgb = self.preprocessor.to_rgb(image)
+        
+        # Process the image and detect hands
+        with self.timings.stage("inference"):
+            results = self.hand_model.process(image_rgb)
+        
+        # Map cropped landmarks back to full-frame coordinates
+        if self.roi_tracker:
+            self.roi_tracker.update(results, roi, frame_shape)
+        self.preprocessor.fix_results(results)
+        
+        hands = hands_from_results(results, self.landmark_buffers)
+        if self.recorder:
+            self.recorder.write(current_time, hands)
+        if self.scheduler:
+            self.scheduler.observe(bool(hands))
+        
+        gestures = self.handle_hands(hands, current_time)
+        self.last_hands = hands
+        self.last_hand_landmarks = results.multi_hand_landmarks or []
+        self.last_detections = list(zip(self.last_hand_landmarks, gestures))
+        return self.last_detections
+    
+    def handle_hands(self, hands, current_time=None):
+        """Classify (handedness, points) pairs and act on gestures held long enough
+        
+        This is the shared path for live frames and recorded sessions.
+        Returns the gesture detected for each hand.
+        """
+        
+        if current_time is None:
+            current_time = time.time()
+        
+        if not hands:
+            # No hand detected; tracks expire on their own
+            return []
+        
+        # Detect gestures for every hand in one batch
+        points = np.stack([hand_points for _, hand_points in hands])
+        with self.timings.stage("classify"):
+            gestures = list(self.classifier.labels(points))
+        for gesture in gestures:
+            self.gesture_counter.inc(gesture)
+        tracks = self.hand_tracker.update(current_time, [handedness for handedness, _ in hands], points)
+        
+        for track, gesture in zip(tracks, gestures):
+            # Execute the command once the hand's gesture is stable
+            stable = track.state.update(current_time, gesture)
+            if stable != "unknown":
+                with self.timings.stage("action_dispatch"):
+                    self.execute_command(stable, current_time, track)
+        
+        return gestures
+    
+    def draw_overlay(self, image, detections):
+        """Draw landmarks, the detected gesture and status text onto the frame"""
+        
+        if detections:
+            for hand_landmarks, gesture in detections:
+                # Draw the hand annotations on the image
+                self.hand_model.draw(image, hand_landmarks)
+            
+            # Display the detected gestures, one per hand
+            gestures = " / ".join(gesture for _, gesture in detections)
+            cv2.putText(image, f"Gesture: {gestures}", (10, 30), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        else:
+            cv2.putText(image, "No hand detected", (10, 30), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        
+        # Display status message with timeout
+        if time.time() - self.status_time < 3:  # Show status for 3 seconds
+            cv2.putText(image, self.status_message, (10, image.shape[0] - 20), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        
+        # Show most recent command in history
+        if self.command_history:
+            cv2.putText(image, f"Last command: {self.command_history[-1]}", 
+                        (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
+    
+    def show_frame(self, image, detections):
+        """Draw the overlay and show the preview window; returns False when 'q' is pressed"""
+        image = self.preprocessor.display(image)
+        self.draw_overlay(image, detections)
+        
+        # Display the resulting image
+        with self.timings.stage("display"):
+            cv2.imshow('Hand Gesture Control', image)
+            self.window_open = True
+            
+            # Break the loop when 'q' is pressed
+            return cv2.waitKey(1) & 0xFF != ord('q')
+    
+    def status(self):
+        """Snapshot of the controller state for the control socket"""
+        return {
+            "status": self.status_message,
+            "last_command": self.command_history[-1] if self.command_history else None,
+            "gestures": {f"{track.handedness}-{track.track_id}": track.state.active
+                         for track in self.hand_tracker.tracks.values()},
+        }
+    
+    def run(self, headless=False, overlay_fps=None, control_address=None):
+        """Main loop to capture video and detect gestures
+        
+        In headless mode nothing is drawn or shown and the loop is stopped by
+        a signal or the control socket; otherwise the preview is refreshed at
+        most overlay_fps times a second.
+        """
+        
+        self.print_instructions(headless)
+        overlay = None if headless else OverlaySubscriber(self.show_frame, overlay_fps)
+        control = ControlChannel(control_address, self.status).start()
+        process_frame = self.profiler.wrap(self.process_frame)
+        frame = None
         
         try:
-            while self.cap.isOpened():
-                success, image = self.cap.read()
-                if not success:
-                    print("Failed to capture image from camera")
+            while not control.stop_requested:
+                # Capture into the previous frame's memory instead of a new array
+                frame = self.source.read(frame)
+                if frame is None:
+                    print("No more frames from the input source")
                     break
                 
                 # Flip the image horizontally for a more intuitive mirror view
-                image = cv2.flip(image, 1)
-                
-                # Convert the image to RGB
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                
-                # Process the image and detect hands
-                results = self.hands.process(image_rgb)
-                
-                # Draw the hand annotations on the image
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        self.mp_drawing.draw_landmarks(
-                            image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                        
-                        # Detect gesture
-                        gesture = self.detect_gesture(hand_landmarks)
-                        
-                        # Display the detected gesture
-                        cv2.putText(image, f"Gesture: {gesture}", (10, 30), 
-                                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                        
-                        # Handle gesture persistence
-                        current_time = time.time()
-                        if gesture == self.previous_gesture and gesture != "unknown":
-                            # If same gesture is held for enough time, execute command
-                            if current_time - self.gesture_start_time >= self.gesture_hold_time:
-                                self.execute_command(gesture)
-                                self.gesture_start_time = current_time  # Reset timer after execution
-                        else:
-                            # New gesture detected, start timing
-                            self.previous_gesture = gesture
-                            self.gesture_start_time = current_time
-                else:
-                    # No hand detected
-                    self.previous_gesture = None
-                    cv2.putText(image, "No hand detected", (10, 30), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                image = self.preprocessor.mirror(frame)
                 
-                # Display status message with timeout
-                if time.time() - self.status_time < 3:  # Show status for 3 seconds
-                    cv2.putText(image, self.status_message, (10, image.shape[0] - 20), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-                
-                # Show most recent command in history
-                if self.command_history:
-                    cv2.putText(image, f"Last command: {self.command_history[-1]}", 
-                                (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
-                
-                # Display the resulting image
-                cv2.imshow('Hand Gesture Control', image)
-                
-                # Break the loop when 'q' is pressed
-                if cv2.waitKey(5) & 0xFF == ord('q'):
+                detections = process_frame(image)
+                if overlay and not overlay.publish(image, detections, time.perf_counter()):
                     break
                 
         finally:
-            # Clean up
-            self.cap.release()
+            control.close()
+            self.close()
+    
+    def run_pipelined(self, headless=False, overlay_fps=None, control_address=None):
+        """Run capture, inference and display on separate threads
+        
+        Inference always works on the newest captured frame; older frames
+        are dropped instead of queueing up behind a slow hands.process call.
+        """
+        
+        self.print_instructions(headless)
+        overlay = None if headless else OverlaySubscriber(self.show_frame, overlay_fps)
+        control = ControlChannel(control_address, self.status).start()
+        frame = None
+        
+        def capture():
+            nonlocal frame
+            # Mirroring copies the frame into a pooled buffer, so the capture buffer can be reused
+            frame = self.source.read(frame if self.preprocessor.mirror_image else None)
+            if frame is None:
+                print("No more frames from the input source")
+                return None
+            # Flip the image horizontally for a more intuitive mirror view
+            return self.preprocessor.mirror(frame)
+        
+        def present(image, detections):
+            if control.stop_requested:
+                return False
+            if overlay:
+                return overlay.publish(image, detections, time.perf_counter())
+            return True
+        
+        # Mirrored frames are queued between threads, so a buffer is only reused once its frame is presented
+        self.preprocessor = FramePreprocessor(self.preprocessor.mirror_image, pooled=True)
+        pipeline = FramePipeline(capture, self.profiler.wrap(self.process_frame), present,
+                                 release=self.preprocessor.release)
+        self.metrics.gauge("frames_dropped", "Frames dropped between pipeline stages",
+                           lambda: {"before_inference": pipeline.frames.dropped,
+                                    "before_presentation": pipeline.results.dropped}, label="queue")
+        try:
+            pipeline.run()
+        finally:
+            control.close()
+            self.close()
+            print(pipeline.format_report())
+    
+    def run_multi_stream(self, sources, control_address=None):
+        """Run one inference process per frame source, without a preview
+        
+        Landmarks from every stream come back to this process, where the
+        stream currently seeing a hand drives the gesture and command logic.
+        """
+        
+        self.print_instructions(headless=True)
+        self.backend.preload()
+        self.screenshots.start_burst()
+        control = ControlChannel(control_address, self.status).start()
+        streams = MultiStreamInference(sources, hand_options=self.hand_model.settings(),
+                                       timings=self.timings)
+        fusion = StreamFusion()
+        self.metrics.gauge("stream_frames_dropped", "Frames dropped per camera stream",
+                           streams.dropped, label="stream")
+        
+        def handle(stream, t, hands):
+            self.frame_counter.inc(RUN)
+            hands = fusion.update(stream, t, hands)
+            if hands is None:
+                return
+            if self.recorder:
+                self.recorder.write(t, hands)
+            self.handle_hands(hands, t)
+        
+        try:
+            streams.run(handle, lambda: control.stop_requested)
+        finally:
+            control.close()
+            streams.close()
+            self.close()
+            print(streams.format_report())
+            print(f"Active stream switches: {fusion.switches}")
+    
+    def run_replay(self, path, realtime=True):
+        """Feed a recorded landmark session through the gesture and command logic"""
+        
+        reader = SessionReader(path)
+        
+        gesture_counts = Counter()
+        start = time.perf_counter()
+        try:
+            for timestamp, hands in replay(reader, realtime):
+                gesture_counts.update(self.handle_hands(hands, timestamp))
+        finally:
+            self.close()
+        elapsed = time.perf_counter() - start
+        
+        print(f"Replayed {len(reader)} frames in {elapsed:.3f}s")
+        for gesture, count in gesture_counts.most_common():
+            print(f"- {gesture}: {count}")
+        return gesture_counts
+    
+    def close(self):
+        """Release the frame source, window, recorder and action worker"""
+        self.executor.close(wait=False)
+        # Finish writing screenshots that were already grabbed
+        self.screenshots.close()
+        self.events.close()
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if self.source is not None:
+            self.source.close()
+        if self.scheduler:
+            print(f"Inference scheduler: {self.scheduler.format_counts()}")
+        if self.window_open:
             cv2.destroyAllWindows()
+        self.hand_model.close()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hand Gesture Control")
+    parser.add_argument("--source", default="0",
+                        help="camera index, video file, image directory or synthetic[:pattern]")
+    parser.add_argument("--fps", type=float,
+                        help="pace the input source to this frame rate")
+    parser.add_argument("--prefetch", type=int,
+                        help="number of frames to decode ahead of the main loop")
+    parser.add_argument("--roi", action="store_true",
+                        help="run inference on a crop around the tracked hand")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="only run inference on motion or at a minimum rate")
+    parser.add_argument("--tracking-fps", type=float, default=10.0,
+                        help="minimum inference rate while a hand is tracked (with --motion-gate)")
+    parser.add_argument("--idle-fps", type=float, default=2.0,
+                        help="inference rate while no hand is present (with --motion-gate)")
+    parser.add_argument("--mirror-landmarks", action="store_true",
+                        help="mirror landmark coordinates instead of flipping every frame")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run capture, inference and display on separate threads")
+    parser.add_argument("--streams", nargs="+", metavar="SOURCE",
+                        help="run one inference process per camera (headless; no ROI or motion gate)")
+    parser.add_argument("--no-camera-tuning", action="store_true",
+                        help="keep the camera's default mode instead of probing for the fastest one")
+    parser.add_argument("--retune-camera", action="store_true",
+                        help="probe camera modes again even when a tuned mode is cached")
+    parser.add_argument("--camera-cache", metavar="PATH", default=DEFAULT_CACHE,
+                        help="file caching the tuned mode of each camera")
+    parser.add_argument("--headless", action="store_true",
+                        help="no preview window or drawing; stop with a signal or the control socket")
+    parser.add_argument("--overlay-fps", type=float,
+                        help="refresh the preview window at most this often")
+    parser.add_argument("--control", metavar="ADDRESS",
+                        help="Unix socket path or local TCP port accepting stop/status commands")
+    parser.add_argument("--max-hands", type=int, default=1,
+                        help="number of hands to track, each with its own gesture state")
+    parser.add_argument("--gestures", metavar="PATH", default=DESKTOP_GESTURES,
+                        help="gesture rule file or trained model (.npz) (default: gestures/desktop.json)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="OS action backend; 'recording' only logs actions (default: this platform)")
+    parser.add_argument("--screenshot-format", choices=sorted(SCREENSHOT_FORMATS), default="png",
+                        help="screenshot file format; raw saves the pixels unencoded as .npy")
+    parser.add_argument("--png-level", type=int, default=1, choices=range(10), metavar="0-9",
+                        help="PNG compression level; higher is smaller and slower")
+    parser.add_argument("--burst", type=int, default=0, metavar="N",
+                        help="keep grabbing the screen and save the last N screens on OK sign")
+    parser.add_argument("--burst-fps", type=float, default=2.0,
+                        help="screens grabbed per second in burst mode")
+    parser.add_argument("--event-log", metavar="PATH",
+                        help="write gesture and action events as JSONL (gzip when PATH ends in .gz)")
+    parser.add_argument("--event-log-mb", type=float, default=10.0,
+                        help="rotate the event log at this size")
+    parser.add_argument("--event-log-backups", type=int, default=5,
+                        help="rotated event log files to keep")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="rewrite a metrics snapshot to PATH every --metrics-interval seconds")
+    parser.add_argument("--metrics-interval", type=float, default=10.0,
+                        help="seconds between metrics snapshots")
+    parser.add_argument("--profile-every", type=int, default=0, metavar="N",
+                        help="cProfile one frame in every N and write it to --profile-dir")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="directory for frame profiles (at most 20 are written)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record hand landmarks to a session file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recorded session instead of using the webcam")
+    parser.add_argument("--max-speed", action="store_true",
+                        help="replay as fast as possible instead of in real time")
+    args = parser.parse_args()
+    
     try:
-        controller = HandGestureControl()
-        controller.run()
+        source = None
+        hand_model = None
+        sources = None
+        # Cameras are switched to the fastest mode covering 640x480, probed once and cached
+        tuner = None
+        if not args.no_camera_tuning:
+            tuner = CaptureTuner((640, 480), cache_path=args.camera_cache, retune=args.retune_camera)
+        if args.streams:
+            # Each stream loads its own hand model in its worker process
+            sources = [open_source(spec, fps=args.fps, prefetch=args.prefetch, tuner=tuner)
+                       for spec in args.streams]
+        elif not args.replay:
+            # Load the hand model while the camera opens
+            hand_model = HandModel(args.max_hands, min_detection_confidence=0.7,
+                                   min_tracking_confidence=0.5).start()
+            source = open_source(args.source, fps=args.fps, prefetch=args.prefetch, tuner=tuner)
+        scheduler = None
+        if args.motion_gate:
+            scheduler = InferenceScheduler(min_tracking_fps=args.tracking_fps, idle_fps=args.idle_fps)
+        backend = get_backend(args.backend)
+        screenshots = ScreenshotService(backend.screenshot, image_format=args.screenshot_format,
+                                        png_level=args.png_level, burst=args.burst,
+                                        burst_fps=args.burst_fps)
+        event_log = None
+        if args.event_log:
+            event_log = EventLog(args.event_log, max_bytes=int(args.event_log_mb * 1024 * 1024),
+                                 backups=args.event_log_backups)
+        metrics = None
+        exporter = None
+        if args.metrics_port is not None or args.metrics_file:
+            metrics = Metrics()
+            exporter = MetricsExporter(metrics, args.metrics_port, args.metrics_file, args.metrics_interval)
+        profiler = FrameProfiler(args.profile_every, args.profile_dir)
+        controller = HandGestureControl(source, record_path=args.record, roi=args.roi,
+                                        scheduler=scheduler, mirror_image=not args.mirror_landmarks,
+                                        gestures=args.gestures, max_hands=args.max_hands,
+                                        hand_model=hand_model, backend=backend,
+                                        screenshots=screenshots, event_log=event_log,
+                                        metrics=metrics, profiler=profiler)
+        if args.replay:
+            controller.run_replay(args.replay, realtime=not args.max_speed)
+        elif sources:
+            controller.run_multi_stream(sources, args.control)
+        elif args.pipeline:
+            controller.run_pipelined(args.headless, args.overlay_fps, args.control)
+        else:
+            controller.run(args.headless, args.overlay_fps, args.control)
+        if exporter:
+            exporter.close()
     except Exception as e:
         print(f"Error: {str(e)}")
-        input("Press Enter to exit...")
\ No newline at end of file
+        if not args.headless:
+            input("Press Enter to exit...")
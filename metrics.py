@@ -0,0 +1,290 @@
+import bisect
+import cProfile
+import http.server
+import os
+import threading
+
+from stage_timing import _Stage
+
+# Bucket upper bounds in seconds for stage and action latencies
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Monotonic counts per label value (or label tuple when there are several labels)
+
+    Series are updated from several threads (the frame loop, pipeline
+    stages and the action worker), so updates and the exporter's copy take
+    a per-metric lock; uncontended, it costs far less than a frame.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, label=None, amount=1):
+        with self.lock:
+            self.values[label] = self.values.get(label, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = list(self.values.items())
+        for label, value in values:
+            yield self.name, self._label_values(label), value
+
+    def _label_values(self, label):
+        if not self.labels:
+            return ()
+        return label if isinstance(label, tuple) else (label,)
+
+
+class Histogram(Counter):
+    """Fixed-bucket histogram: observe() is a bisect and two additions"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, label=None):
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.values.get(label)
+            if series is None:
+                # Per-bucket counts plus the overflow bucket, then the sum
+                series = self.values[label] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bucket] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self.lock:
+            values = [(label, list(series)) for label, series in self.values.items()]
+        for label, series in values:
+            labels = self._label_values(label)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                yield self.name + "_bucket", labels + (bound,), cumulative
+            yield self.name + "_sum", labels, series[-1]
+            yield self.name + "_count", labels, cumulative
+
+    def sample_labels(self, sample_name):
+        return self.labels + ("le",) if sample_name.endswith("_bucket") else self.labels
+
+
+class Gauge:
+    """A value read from read() when metrics are exported; a dict gives one sample per label"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, read, label=None):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.labels = (label,) if label else ()
+
+    def samples(self):
+        value = self.read()
+        if isinstance(value, dict):
+            for label, item in list(value.items()):
+                yield self.name, (label,), item
+        else:
+            yield self.name, (), value
+
+
+class Metrics:
+    """Registry of counters, histograms and gauges rendered in Prometheus text format
+
+    It also implements the stage recorder interface of stage_timing, so a
+    controller's timings can point at it and every existing stage() block
+    lands in the stage_seconds histogram.
+    """
+
+    enabled = True
+
+    def __init__(self, prefix="gesture_control_"):
+        self.prefix = prefix
+        self.metrics = {}
+        self.stage_seconds = self.histogram("stage_seconds", "Time spent in each processing stage", ("stage",))
+
+    def _register(self, metric):
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(self.prefix + name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(self.prefix + name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, read, label=None):
+        gauge = Gauge(self.prefix + name, help_text, read, label)
+        self.metrics[gauge.name] = gauge
+        return gauge
+
+    # Stage recorder interface
+    def add(self, stage, seconds):
+        self.stage_seconds.observe(seconds, stage)
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def render(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                for sample_name, values, value in metric.samples():
+                    names = metric.labels
+                    if isinstance(metric, Histogram):
+                        names = metric.sample_labels(sample_name)
+                    lines.append(f"{sample_name}{_label_text(names, values)} {value}")
+            except Exception as e:
+                lines.append(f"# error reading {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+class _NullMetric:
+    def inc(self, label=None, amount=1):
+        pass
+
+    def observe(self, value, label=None):
+        pass
+
+
+class NullMetrics:
+    """Drop-in registry that records nothing; the default without --metrics-port or --metrics-file"""
+
+    enabled = False
+    _metric = _NullMetric()
+
+    def counter(self, name, help_text, labels=()):
+        return self._metric
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._metric
+
+    def gauge(self, name, help_text, read, label=None):
+        return None
+
+
+NULL_METRICS = NullMetrics()
+
+
+class MetricsExporter:
+    """Serves a registry at http://127.0.0.1:port/metrics and/or rewrites it to a file periodically
+
+    Rendering happens only when scraped or at each snapshot, never on the
+    frame loop. The snapshot file is replaced atomically so readers never
+    see a partial file.
+    """
+
+    def __init__(self, metrics, port=None, snapshot_path=None, interval=10.0):
+        self.metrics = metrics
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.server = None
+        self.stop_event = threading.Event()
+        self.threads = []
+
+        if port is not None:
+            self.server = http.server.ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+            self.server.daemon_threads = True
+            self.threads.append(threading.Thread(target=self.server.serve_forever, name="metrics-http",
+                                                 daemon=True))
+        if snapshot_path:
+            self.threads.append(threading.Thread(target=self._snapshot_loop, name="metrics-snapshot",
+                                                 daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def write_snapshot(self):
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.metrics.render())
+        os.replace(temporary, self.snapshot_path)
+
+    def _snapshot_loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                print(f"Metrics snapshot error: {str(e)}")
+
+    def close(self):
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.snapshot_path:
+            self.write_snapshot()
+
+
+class FrameProfiler:
+    """Profiles one frame in every `every` with cProfile, writing up to limit .prof files
+
+    wrap(func) returns func itself when profiling is off, so the unprofiled
+    path costs nothing.
+    """
+
+    def __init__(self, every=0, directory="profiles", limit=20):
+        self.every = every
+        self.directory = directory
+        self.limit = limit
+        self.frames = 0
+        self.written = 0
+
+    def wrap(self, func):
+        if not self.every:
+            return func
+        os.makedirs(self.directory, exist_ok=True)
+
+        def profiled(*args, **kwargs):
+            self.frames += 1
+            if self.frames % self.every or self.written >= self.limit:
+                return func(*args, **kwargs)
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                profile.dump_stats(os.path.join(self.directory, f"frame_{self.frames:06d}.prof"))
+                self.written += 1
+
+        return profiled
@@ -0,0 +1,269 @@
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from frame_ring import FrameRing
+from pipeline import StageStats
+
+
+class StreamFusion:
+    """Chooses which stream's hands drive the gesture logic
+
+    Cameras see the user from different angles, so their landmarks cannot
+    simply be averaged. The active stream keeps control while it sees a
+    hand; once it has not seen one for hold seconds, the next stream that
+    reports a hand takes over. Only results of the active stream are passed
+    on, so each of its frames drives the gesture logic exactly once.
+    """
+
+    def __init__(self, hold=0.3):
+        self.hold = hold
+        self.active = None
+        self.last_seen = {}  # Stream -> time it last reported a hand
+        self.switches = 0
+
+    def update(self, stream, t, hands):
+        """Returns hands when stream is (or becomes) the active one, otherwise None"""
+        if hands:
+            self.last_seen[stream] = t
+        if self.active is None:
+            self.active = stream
+        elif stream != self.active and hands and t - self.last_seen.get(self.active, float("-inf")) > self.hold:
+            self.active = stream
+            self.switches += 1
+        return hands if stream == self.active else None
+
+
+def _inference_worker(index, ring_spec, new_frame, stopped, results, ready, hand_options):
+    """Worker process: MediaPipe on the newest frame of one stream, landmarks back to the parent
+
+    Frames are read in place from the stream's shared-memory ring; only
+    landmark arrays cross process boundaries.
+    """
+    from hand_model import HandModel
+    from landmark_session import hands_from_results
+
+    # Ctrl+C reaches the whole process group; the parent stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # One OpenCV thread per worker; the streams already use every core between them
+    cv2.setNumThreads(1)
+    ring = FrameRing.attach(ring_spec)
+    image_rgb = np.empty(ring.shape, dtype=np.uint8)
+    model = None
+    skipped = 0
+    try:
+        model = HandModel(**hand_options)
+        model.wait()
+        ready.set()
+        landmark_buffers = np.empty((hand_options.get("max_hands", 1), 21, 3), dtype=np.float32)
+
+        after = -1
+        while True:
+            new_frame.wait(0.1)
+            new_frame.clear()
+            # Latest frame wins: frames published during the last inference are skipped
+            latest = ring.latest(after)
+            if latest is None:
+                if stopped.is_set():
+                    break
+                continue
+            sequence, view, missed = latest
+            captured_at = ring.timestamp(sequence)
+            cv2.cvtColor(view, cv2.COLOR_BGR2RGB, dst=image_rgb)
+            view = None
+            after = sequence
+            if not ring.valid(sequence):
+                # The writer lapped the ring while the frame was being converted
+                skipped += missed + 1
+                continue
+            skipped += missed
+
+            start = time.perf_counter()
+            hands = hands_from_results(model.process(image_rgb), landmark_buffers)
+            inference = time.perf_counter() - start
+
+            labels = [handedness for handedness, _ in hands]
+            points = np.stack([hand_points for _, hand_points in hands]) if hands else None
+            results.put((index, sequence, captured_at, labels, points, inference, skipped))
+    except Exception as e:
+        print(f"Stream {index} inference error: {str(e)}")
+    finally:
+        if model is not None:
+            model.close()
+        latest = view = None
+        ring.close()
+        # No sequence number marks the end of the stream
+        results.put((index, None, None, None, None, 0.0, skipped))
+
+
+class _Stream:
+    """Parent-side state of one camera stream"""
+
+    def __init__(self, index, source):
+        self.index = index
+        self.source = source
+        self.ring = None
+        self.new_frame = None  # Set after each published frame, to wake the worker
+        self.stopped = None  # Set when capture has ended
+        self.ready = None  # Set by the worker once its model is loaded
+        self.process = None
+        self.thread = None
+        self.done = False
+
+        self.captured = 0
+        self.skipped = 0  # Overwritten in the ring before the worker got to them
+        self.processed = 0
+        self.inference = StageStats()
+        self.end_to_end = StageStats()
+
+
+class MultiStreamInference:
+    """One MediaPipe worker process per frame source, with landmarks fused in this process
+
+    A capture thread per stream reads each frame straight into the next
+    slot of that stream's shared-memory FrameRing and mirrors it in place;
+    the worker process reads the newest frame from the ring without a copy.
+    Every stream has its own ring, so a slow camera or worker only loses
+    its own frames: capture never waits, and a worker that falls behind
+    skips to the newest frame. Capture starts once the worker has loaded
+    its model. Workers return landmark arrays, which run() hands to
+    handle(stream, t, hands) on the calling thread.
+    """
+
+    def __init__(self, sources, hand_options=None, slots=4, mirror=True, timings=None):
+        self.hand_options = hand_options or {}
+        self.slot_count = slots
+        self.mirror = mirror
+        self.timings = timings
+        self.streams = [_Stream(index, source) for index, source in enumerate(sources)]
+        self.stop_event = threading.Event()
+        self.context = multiprocessing.get_context("spawn")
+        self.results = None
+        self.started = False
+
+    def frame_shape(self, stream):
+        return self.streams[stream].ring.shape
+
+    def start(self):
+        if self.started:
+            return self
+        self.started = True
+        self.results = self.context.Queue()
+        for stream in self.streams:
+            # The first frame fixes the ring's frame size; frames of another size are resized
+            frame = stream.source.read()
+            if frame is None:
+                print(f"Stream {stream.index} has no frames")
+                stream.done = True
+                continue
+            stream.ring = FrameRing(frame.shape, self.slot_count)
+            stream.new_frame = self.context.Event()
+            stream.stopped = self.context.Event()
+            stream.ready = self.context.Event()
+
+            stream.process = self.context.Process(
+                target=_inference_worker, name=f"stream-{stream.index}", daemon=True,
+                args=(stream.index, stream.ring.spec(), stream.new_frame, stream.stopped, self.results,
+                      stream.ready, self.hand_options))
+            stream.process.start()
+            stream.thread = threading.Thread(target=self._capture_loop, args=(stream, frame),
+                                             name=f"capture-{stream.index}", daemon=True)
+            stream.thread.start()
+        return self
+
+    def _publish(self, stream, slot, frame):
+        if frame is not slot:
+            if frame.shape != slot.shape:
+                cv2.resize(frame, (slot.shape[1], slot.shape[0]), dst=slot)
+            else:
+                np.copyto(slot, frame)
+        if self.mirror:
+            cv2.flip(slot, 1, dst=slot)
+        stream.ring.publish()
+        stream.captured += 1
+        stream.new_frame.set()
+
+    def _capture_loop(self, stream, frame):
+        ring = stream.ring
+        try:
+            # Frames captured while the worker loads its model would only be dropped
+            while not stream.ready.wait(0.1):
+                if self.stop_event.is_set() or not stream.process.is_alive():
+                    return
+            self._publish(stream, ring.claim(), frame)
+            while not self.stop_event.is_set():
+                slot = ring.claim()
+                frame = stream.source.read(slot)
+                if frame is None:
+                    break
+                self._publish(stream, slot, frame)
+        except Exception as e:
+            print(f"Stream {stream.index} capture error: {str(e)}")
+        finally:
+            stream.stopped.set()
+            stream.new_frame.set()
+
+    def dropped(self):
+        """Frames per stream that the worker never got to"""
+        return {f"stream{stream.index}": stream.skipped for stream in self.streams}
+
+    def run(self, handle, should_stop=None):
+        """Call handle(stream, t, hands) for every result until all streams end or should_stop() is true"""
+        self.start()
+        running = sum(not stream.done for stream in self.streams)
+        try:
+            while running and not (should_stop and should_stop()):
+                try:
+                    index, sequence, captured_at, labels, points, inference, skipped = self.results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                stream = self.streams[index]
+                stream.skipped = skipped
+                if sequence is None:
+                    stream.done = True
+                    running -= 1
+                    continue
+
+                stream.processed += 1
+                stream.inference.add(inference)
+                if self.timings is not None:
+                    self.timings.add("inference", inference)
+                handle(index, captured_at, list(zip(labels, points)) if labels else [])
+                stream.end_to_end.add(time.time() - captured_at)
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop capture and the workers, and free the shared memory"""
+        self.stop_event.set()
+        for stream in self.streams:
+            if stream.thread is not None:
+                stream.thread.join(timeout=1.0)
+            if stream.stopped is not None:
+                stream.stopped.set()
+                stream.new_frame.set()
+        for stream in self.streams:
+            if stream.process is not None:
+                stream.process.join(timeout=2.0)
+                if stream.process.is_alive():
+                    stream.process.terminate()
+                stream.process = None
+            stream.source.close()
+            if stream.ring is not None:
+                stream.ring.close()
+
+    def format_report(self):
+        lines = ["Stream statistics:"]
+        for stream in self.streams:
+            inference = stream.inference.summary()
+            end_to_end = stream.end_to_end.summary()
+            lines.append(f"- stream {stream.index}: {stream.captured} captured, {stream.processed} processed, "
+                         f"{stream.skipped} skipped, "
+                         f"inference mean {inference['mean_ms']:.1f} ms, "
+                         f"end to end mean {end_to_end['mean_ms']:.1f} ms, max {end_to_end['max_ms']:.1f} ms")
+        return "\n".join(lines)
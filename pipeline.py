@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """Bounded queue that drops the oldest item when full, so consumers see the newest
+
+    on_drop(item) is called for every dropped item, and for items still
+    queued when the queue is drained.
+    """
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self.items = deque()
+        self.dropped = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def put(self, item):
+        with self.condition:
+            if len(self.items) >= self.maxsize:
+                dropped = self.items.popleft()
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop(dropped)
+            self.items.append(item)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """Return the next item, or None on timeout or once the queue is closed and empty"""
+        with self.condition:
+            if not self.items and not self.closed:
+                self.condition.wait(timeout)
+            if self.items:
+                return self.items.popleft()
+            return None
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def drain(self):
+        """Discard the remaining items, passing each to on_drop"""
+        with self.condition:
+            items = list(self.items)
+            self.items.clear()
+        if self.on_drop is not None:
+            for item in items:
+                self.on_drop(item)
+
+
+class StageStats:
+    """Rolling latency statistics for one pipeline stage"""
+
+    def __init__(self, window=300):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        samples = list(self.samples)
+        if not samples:
+            return {"count": self.count, "mean_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * sum(samples) / len(samples),
+            "max_ms": 1000 * max(samples),
+        }
+
+
+class FramePipeline:
+    """Runs capture, inference and presentation as separate stages joined by bounded queues
+
+    capture() returns the next frame or None when the source is exhausted,
+    infer(frame) returns a result, and present(frame, result) returns False
+    to stop. Presentation runs on the calling thread because OpenCV windows
+    must be driven from the main thread.
+
+    release(frame), when given, is called once the pipeline is done with a
+    frame: after it was presented, or when it was dropped. Capture may only
+    reuse a frame's buffer after that, because inference or presentation
+    can still be reading it until then.
+    """
+
+    def __init__(self, capture, infer, present, queue_size=1, release=None):
+        self.capture = capture
+        self.infer = infer
+        self.present = present
+        self.release = release
+
+        # "Latest frame wins": a full queue drops its oldest frame
+        self.frames = LatestQueue(queue_size, on_drop=lambda item: self._release(item[2]))
+        self.results = LatestQueue(queue_size, on_drop=lambda item: self._release(item[2]))
+        self.stop_event = threading.Event()
+
+        self.stats = {
+            "capture": StageStats(),
+            "inference": StageStats(),
+            "presentation": StageStats(),
+            "end_to_end": StageStats(),
+        }
+
+    def _release(self, frame):
+        if self.release is not None:
+            self.release(frame)
+
+    def _capture_loop(self):
+        sequence = 0
+        try:
+            while not self.stop_event.is_set():
+                start = time.perf_counter()
+                frame = self.capture()
+                if frame is None:
+                    break
+                self.stats["capture"].add(time.perf_counter() - start)
+                self.frames.put((sequence, start, frame))
+                sequence += 1
+        finally:
+            self.stop_event.set()
+            self.frames.close()
+
+    def _inference_loop(self):
+        try:
+            while True:
+                item = self.frames.get(timeout=0.1)
+                if item is None:
+                    if self.frames.closed:
+                        break
+                    continue
+                sequence, captured_at, frame = item
+                start = time.perf_counter()
+                result = self.infer(frame)
+                self.stats["inference"].add(time.perf_counter() - start)
+                self.results.put((sequence, captured_at, frame, result))
+        finally:
+            self.stop_event.set()
+            self.results.close()
+
+    def run(self):
+        """Run until the source ends or present() returns False"""
+        threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self.results.get(timeout=0.1)
+                if item is None:
+                    if self.results.closed:
+                        break
+                    continue
+                sequence, captured_at, frame, result = item
+                start = time.perf_counter()
+                try:
+                    keep_running = self.present(frame, result)
+                finally:
+                    self._release(frame)
+                end = time.perf_counter()
+                self.stats["presentation"].add(end - start)
+                self.stats["end_to_end"].add(end - captured_at)
+                if keep_running is False:
+                    break
+        finally:
+            self.stop()
+            for thread in threads:
+                thread.join(timeout=1.0)
+            self.frames.drain()
+            self.results.drain()
+
+    def stop(self):
+        self.stop_event.set()
+        self.frames.close()
+        self.results.close()
+
+    def report(self):
+        """Per-stage latency and dropped frame counts"""
+        report = {name: stats.summary() for name, stats in self.stats.items()}
+        report["dropped_before_inference"] = self.frames.dropped
+        report["dropped_before_presentation"] = self.results.dropped
+        return report
+
+    def format_report(self):
+        report = self.report()
+        lines = ["Pipeline statistics:"]
+        for name in self.stats:
+            summary = report[name]
+            lines.append(f"- {name}: {summary['count']} frames, "
+                         f"mean {summary['mean_ms']:.1f} ms, max {summary['max_ms']:.1f} ms")
+        lines.append(f"- dropped before inference: {report['dropped_before_inference']}")
+        lines.append(f"- dropped before presentation: {report['dropped_before_presentation']}")
+        return "\n".join(lines)
@@ -0,0 +1,81 @@
+import threading
+
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """Mirroring and colour conversion into preallocated buffers
+
+    Every output is written with OpenCV's dst= argument into a buffer that
+    is only reallocated when the frame size changes, so the steady-state loop
+    allocates no new frames.
+
+    With mirror_image=False the camera frame is never flipped before
+    inference. Landmark x coordinates and handedness are mirrored after
+    hands.process instead, and the flipped BGR frame is only produced by
+    display() when something actually draws it.
+
+    The sequential loop reuses one mirror buffer for every frame. With
+    pooled=True, as when frames are queued between threads, each mirror()
+    takes a buffer nobody holds and the caller hands it back with release()
+    once the frame has been presented or dropped; the pool grows to the
+    number of frames alive at once.
+    """
+
+    def __init__(self, mirror_image=True, pooled=False):
+        self.mirror_image = mirror_image
+        self.pooled = pooled
+        self._mirrored = None
+        self._free = []  # Pooled mirror buffers no frame refers to any more
+        self._lock = threading.Lock()
+        self._display = None
+        self._rgb = None
+
+    @staticmethod
+    def _fit(buffer, image):
+        if buffer is None or buffer.shape != image.shape:
+            return np.empty_like(image)
+        return buffer
+
+    def mirror(self, image):
+        """Return the frame the gesture pipeline works on"""
+        if not self.mirror_image:
+            return image
+        if not self.pooled:
+            self._mirrored = self._fit(self._mirrored, image)
+            return cv2.flip(image, 1, dst=self._mirrored)
+        with self._lock:
+            buffer = self._free.pop() if self._free else None
+        buffer = self._fit(buffer, image)
+        cv2.flip(image, 1, dst=buffer)
+        return buffer
+
+    def release(self, image):
+        """Give a pooled frame from mirror() back once nothing reads or draws it"""
+        if self.pooled and self.mirror_image and image is not None:
+            with self._lock:
+                self._free.append(image)
+
+    def display(self, image):
+        """Return a mirrored BGR frame for drawing the overlay"""
+        if self.mirror_image:
+            return image
+        self._display = self._fit(self._display, image)
+        return cv2.flip(image, 1, dst=self._display)
+
+    def to_rgb(self, image):
+        """Convert a BGR frame (or crop) to RGB for MediaPipe"""
+        self._rgb = self._fit(self._rgb, image)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+    def fix_results(self, results):
+        """Mirror landmarks and handedness when the frame itself was not flipped"""
+        if self.mirror_image or not results.multi_hand_landmarks:
+            return
+        for hand_landmarks in results.multi_hand_landmarks:
+            for landmark in hand_landmarks.landmark:
+                landmark.x = 1.0 - landmark.x
+        for handedness in results.multi_handedness or []:
+            for classification in handedness.classification:
+                classification.label = "Left" if classification.label == "Right" else "Right"
@@ -0,0 +1,98 @@
+import cv2
+import numpy as np
+
+
+class RoiTracker:
+    """Crops inference input to a padded window around the previously tracked hand
+
+    crop() returns the window to send to hands.process together with its
+    (x, y, width, height) in full-frame pixels, or None when the full frame
+    is used. update() maps the landmarks MediaPipe returned for the window
+    back to full-frame normalised coordinates in place, so drawing and
+    gesture logic never see crop coordinates, and picks the next window.
+
+    The window only moves when the hand nears its edge or changes size a
+    lot. A steady window keeps MediaPipe's own tracking valid between
+    frames instead of forcing palm re-detection on every shift.
+    """
+
+    def __init__(self, padding=0.3, min_size=0.25, max_input=256, edge_margin=0.1, lost_after=2):
+        self.padding = padding          # Extra space around the hand, as a fraction of its size
+        self.min_size = min_size        # Smallest window, as a fraction of the shorter frame side
+        self.max_input = max_input      # Windows larger than this many pixels are downscaled
+        self.edge_margin = edge_margin  # Move the window once the hand is this close to an edge
+        self.lost_after = lost_after    # Frames without a hand before falling back to full frame
+
+        self.roi = None
+        self.missed = 0
+
+    def crop(self, image):
+        """Return (input_image, roi) for the next inference"""
+        if self.roi is None:
+            return image, None
+        x, y, w, h = self.roi
+        window = image[y:y + h, x:x + w]
+        longest = max(w, h)
+        if self.max_input and longest > self.max_input:
+            scale = self.max_input / longest
+            window = cv2.resize(window, (max(1, round(w * scale)), max(1, round(h * scale))),
+                                interpolation=cv2.INTER_AREA)
+        return window, self.roi
+
+    def reset(self):
+        self.roi = None
+        self.missed = 0
+
+    def update(self, results, roi, frame_shape):
+        """Map results from roi back to the full frame and choose the next window"""
+        frame_height, frame_width = frame_shape[:2]
+        hands = results.multi_hand_landmarks or []
+
+        if roi is not None:
+            x, y, w, h = roi
+            for hand_landmarks in hands:
+                for landmark in hand_landmarks.landmark:
+                    landmark.x = (x + landmark.x * w) / frame_width
+                    landmark.y = (y + landmark.y * h) / frame_height
+                    landmark.z = landmark.z * w / frame_width
+
+        if not hands:
+            self.missed += 1
+            if self.missed >= self.lost_after:
+                self.roi = None
+            return
+
+        self.missed = 0
+        points = np.array([(landmark.x, landmark.y)
+                           for hand_landmarks in hands
+                           for landmark in hand_landmarks.landmark], dtype=np.float32)
+        points *= (frame_width, frame_height)
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+
+        if self.roi is not None and self._still_inside(low, high):
+            return
+        self.roi = self._window_around(low, high, frame_width, frame_height)
+
+    def _still_inside(self, low, high):
+        x, y, w, h = self.roi
+        margin_x = w * self.edge_margin
+        margin_y = h * self.edge_margin
+        inside = (low[0] >= x + margin_x and low[1] >= y + margin_y and
+                  high[0] <= x + w - margin_x and high[1] <= y + h - margin_y)
+        # Shrink the window again once the hand fills much less of it
+        hand_size = max(high - low) * (1 + 2 * self.padding)
+        return inside and hand_size >= 0.5 * max(w, h)
+
+    def _window_around(self, low, high, frame_width, frame_height):
+        center = (low + high) / 2
+        side = max(high - low) * (1 + 2 * self.padding)
+        side = max(side, self.min_size * min(frame_width, frame_height))
+
+        w = int(min(side, frame_width))
+        h = int(min(side, frame_height))
+        x = int(np.clip(center[0] - w / 2, 0, frame_width - w))
+        y = int(np.clip(center[1] - h / 2, 0, frame_height - h))
+        if w >= frame_width and h >= frame_height:
+            return None
+        return (x, y, w, h)
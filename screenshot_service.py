@@ -0,0 +1,204 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# File extension per format; "raw" writes the BGR array unencoded as .npy
+SCREENSHOT_FORMATS = {
+    "png": ".png",
+    "jpg": ".jpg",
+    "bmp": ".bmp",
+    "qoi": ".qoi",
+    "raw": ".npy",
+}
+
+
+class ScreenshotService:
+    """Grabs screens into reusable buffers and encodes them on a worker pool
+
+    capture() only grabs the screen straight into a free buffer and
+    returns; grab(out) fills out when it has the screen's shape and returns
+    a new array otherwise. The encode and write happen on one of workers
+    threads (OpenCV releases the GIL while encoding), and the buffer goes
+    back to the pool afterwards.
+    PNG defaults to compression level 1, about twice as fast as level 6
+    (what PIL used) for a few percent larger files; "raw" skips encoding.
+
+    With burst > 0, start_burst() keeps grabbing at burst_fps into a ring of
+    burst buffers and save_burst() writes the last burst screens.
+    """
+
+    def __init__(self, grab, directory=None, image_format="png", png_level=1, jpeg_quality=90,
+                 workers=2, burst=0, burst_fps=2.0, buffer_timeout=5.0):
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unknown screenshot format {image_format!r}")
+        self.extension = SCREENSHOT_FORMATS[image_format]
+        if image_format == "qoi" and not cv2.haveImageWriter(self.extension):
+            raise ValueError("This OpenCV build cannot write QOI images")
+
+        self.grab = grab
+        self.directory = directory or os.path.join(os.path.expanduser('~'), 'Pictures')
+        self.image_format = image_format
+        self.params = []
+        if image_format == "png":
+            self.params = [cv2.IMWRITE_PNG_COMPRESSION, png_level]
+        elif image_format == "jpg":
+            self.params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")
+        self.directory_ready = False
+
+        # One buffer per worker, one being filled and one per burst screen being
+        # saved; allocated on first use because the screen size is only known
+        # after the first grab
+        self.free = queue.Queue()
+        self.buffer_count = 0
+        self.max_buffers = workers + 1 + burst
+        self.buffer_lock = threading.Lock()
+        self.buffer_timeout = buffer_timeout
+
+        # Burst ring buffer: screens, their capture times and the next slot
+        self.burst = burst
+        self.burst_interval = 1.0 / burst_fps
+        self.ring = None
+        self.ring_times = np.zeros(burst)
+        self.ring_count = 0
+        self.ring_lock = threading.Lock()
+        self.burst_scratch = None
+        self.burst_stop = threading.Event()
+        self.burst_thread = None
+
+    def _path(self, t, suffix=""):
+        if not self.directory_ready:
+            os.makedirs(self.directory, exist_ok=True)
+            self.directory_ready = True
+        timestamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(t))
+        return os.path.join(self.directory, f"screenshot_{timestamp}{suffix}{self.extension}")
+
+    def _buffer(self, shape=None):
+        """A free buffer, waiting for an encode to finish when all are busy
+
+        Without shape it may be None or of another size, for the grab to
+        replace. Raises TimeoutError when no buffer comes back within
+        buffer_timeout seconds.
+        """
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            with self.buffer_lock:
+                allocate = self.buffer_count < self.max_buffers
+                if allocate:
+                    self.buffer_count += 1
+            if allocate:
+                buffer = None
+            else:
+                try:
+                    buffer = self.free.get(timeout=self.buffer_timeout)
+                except queue.Empty:
+                    raise TimeoutError("No screenshot buffer was freed in time") from None
+        if shape is not None and (buffer is None or buffer.shape != shape):
+            # Not allocated yet, or the screen size changed
+            return np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    def _give_back(self, buffer):
+        """Return a buffer from _buffer() that never reached an encode"""
+        if buffer is not None:
+            self.free.put(buffer)
+            return
+        with self.buffer_lock:
+            self.buffer_count -= 1
+
+    def _encode(self, image, path):
+        try:
+            if self.image_format == "raw":
+                np.save(path, image)
+            else:
+                ok, encoded = cv2.imencode(self.extension, image, self.params)
+                if not ok:
+                    raise RuntimeError(f"Could not encode {path}")
+                encoded.tofile(path)
+            return path
+        finally:
+            self.free.put(image)
+
+    def capture(self):
+        """Grab the screen now and save it in the background; returns a Future of the path"""
+        t = time.time()
+        buffer = self._buffer()
+        try:
+            image = self.grab(buffer)
+            return self.pool.submit(self._encode, image, self._path(t))
+        except Exception:
+            # The slot would otherwise be lost, and later captures would wait for it forever
+            self._give_back(buffer)
+            raise
+
+    # Burst mode
+    def start_burst(self):
+        if self.burst <= 0 or self.burst_thread is not None:
+            return self
+        self.burst_thread = threading.Thread(target=self._burst_loop, name="screenshot-burst", daemon=True)
+        self.burst_thread.start()
+        return self
+
+    def _burst_loop(self):
+        while not self.burst_stop.is_set():
+            start = time.monotonic()
+            try:
+                self._grab_into_ring()
+            except Exception as e:
+                print(f"Burst screenshot error: {str(e)}")
+            self.burst_stop.wait(max(0.0, self.burst_interval - (time.monotonic() - start)))
+
+    def _grab_into_ring(self):
+        t = time.time()
+        # Grab into a scratch buffer; only the copy into the ring holds the lock
+        self.burst_scratch = image = self.grab(self.burst_scratch)
+        with self.ring_lock:
+            if self.ring is None or self.ring.shape[1:] != image.shape:
+                self.ring = np.empty((self.burst,) + image.shape, dtype=np.uint8)
+                self.ring_count = 0
+            slot = self.ring_count % self.burst
+            np.copyto(self.ring[slot], image)
+            self.ring_times[slot] = t
+            self.ring_count += 1
+
+    def save_burst(self):
+        """Save the screens in the ring, oldest first; returns their Futures
+
+        Each screen is copied out of the ring first, so grabbing continues
+        while they are encoded. The buffers are taken before the ring is
+        locked, because that can mean waiting for an encode.
+        """
+        while True:
+            with self.ring_lock:
+                if self.ring is None:
+                    return []
+                count = min(self.ring_count, self.burst)
+                shape = self.ring.shape[1:]
+            buffers = [self._buffer(shape) for _ in range(count)]
+            with self.ring_lock:
+                # Unless the screen size changed meanwhile, the ring still holds at least count screens
+                if self.ring.shape[1:] == shape and self.ring_count >= count:
+                    slots = [(self.ring_count - count + i) % self.burst for i in range(count)]
+                    copies = []
+                    for buffer, slot in zip(buffers, slots):
+                        np.copyto(buffer, self.ring[slot])
+                        copies.append((buffer, self.ring_times[slot]))
+                    break
+            for buffer in buffers:
+                self.free.put(buffer)
+
+        return [self.pool.submit(self._encode, buffer, self._path(t, f"-burst{i:02d}"))
+                for i, (buffer, t) in enumerate(copies)]
+
+    def close(self, wait=True):
+        self.burst_stop.set()
+        if self.burst_thread is not None:
+            self.burst_thread.join(timeout=1.0)
+        self.pool.shutdown(wait=wait)
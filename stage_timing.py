@@ -0,0 +1,76 @@
+import time
+from collections import defaultdict
+
+import numpy as np
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add(self.name, time.perf_counter() - self.start)
+
+
+class LatencyRecorder:
+    """Collects every latency sample per named stage for percentile reports"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def add(self, stage, seconds):
+        self.samples[stage].append(seconds)
+
+    def stage(self, name):
+        """Context manager that records the time spent inside it under name"""
+        return _Stage(self, name)
+
+    def summary(self):
+        summary = {}
+        for stage, samples in self.samples.items():
+            ms = np.asarray(samples) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            summary[stage] = {
+                "count": len(ms),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(ms.max()),
+            }
+        return summary
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+class NullRecorder:
+    """Drop-in recorder that discards everything; the default outside benchmarks"""
+
+    _stage = _NullStage()
+
+    def add(self, stage, seconds):
+        pass
+
+    def stage(self, name):
+        return self._stage
+
+    def summary(self):
+        return {}
+
+
+NULL_RECORDER = NullRecorder()
@@ -0,0 +1,101 @@
+import cv2
+import numpy as np
+
+from camera_tuning import fourcc_code, fourcc_name
+
+
+class FakeCamera:
+    """Simulated UVC camera for exercising capture tuning without hardware
+
+    modes lists the (fourcc, width, height, fps) combinations it supports.
+    Like a driver it snaps every request to the closest supported mode, in
+    the requested FOURCC when it has one. read() advances a virtual clock
+    by the frame interval, plus decode_seconds for MJPG, so probing is
+    instant and deterministic: pass camera.clock to CaptureTuner and
+    camera.open as the capture factory.
+    """
+
+    DEFAULT_MODES = (
+        ("YUYV", 640, 480, 30), ("YUYV", 1280, 720, 10), ("YUYV", 320, 240, 30),
+        ("MJPG", 640, 480, 60), ("MJPG", 640, 480, 30), ("MJPG", 1280, 720, 30), ("MJPG", 320, 240, 30),
+    )
+
+    def __init__(self, modes=DEFAULT_MODES, decode_seconds=0.002, buffer_size_supported=True):
+        self.modes = [(fourcc, int(width), int(height), float(fps)) for fourcc, width, height, fps in modes]
+        self.decode_seconds = decode_seconds
+        self.buffer_size_supported = buffer_size_supported
+        self.now = 0.0
+        self.opened = 0
+
+    def clock(self):
+        return self.now
+
+    def open(self, device=0, *args):
+        self.opened += 1
+        return FakeCapture(self)
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in returned by FakeCamera.open()"""
+
+    def __init__(self, camera):
+        self.camera = camera
+        self.requested = {
+            cv2.CAP_PROP_FOURCC: fourcc_code(camera.modes[0][0]),
+            cv2.CAP_PROP_FRAME_WIDTH: camera.modes[0][1],
+            cv2.CAP_PROP_FRAME_HEIGHT: camera.modes[0][2],
+            cv2.CAP_PROP_FPS: camera.modes[0][3],
+        }
+        self.buffer_size = 4
+        self.mode = camera.modes[0]
+        self.released = False
+
+    def isOpened(self):
+        return not self.released
+
+    def getBackendName(self):
+        return "FAKE"
+
+    def _resolve(self):
+        fourcc = fourcc_name(self.requested[cv2.CAP_PROP_FOURCC])
+        width = self.requested[cv2.CAP_PROP_FRAME_WIDTH]
+        height = self.requested[cv2.CAP_PROP_FRAME_HEIGHT]
+        fps = self.requested[cv2.CAP_PROP_FPS]
+        modes = [mode for mode in self.camera.modes if mode[0] == fourcc] or self.camera.modes
+        self.mode = min(modes, key=lambda mode: (abs(mode[1] * mode[2] - width * height), abs(mode[3] - fps)))
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            if not self.camera.buffer_size_supported:
+                return False
+            self.buffer_size = int(value)
+            return True
+        if prop not in self.requested:
+            return False
+        self.requested[prop] = value
+        self._resolve()
+        return True
+
+    def get(self, prop):
+        fourcc, width, height, fps = self.mode
+        values = {
+            cv2.CAP_PROP_FOURCC: float(fourcc_code(fourcc)),
+            cv2.CAP_PROP_FRAME_WIDTH: float(width),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(height),
+            cv2.CAP_PROP_FPS: fps,
+            cv2.CAP_PROP_BUFFERSIZE: float(self.buffer_size) if self.camera.buffer_size_supported else 0.0,
+        }
+        return values.get(prop, 0.0)
+
+    def read(self, image=None):
+        if self.released:
+            return False, None
+        fourcc, width, height, fps = self.mode
+        self.camera.now += 1.0 / fps + (self.camera.decode_seconds if fourcc == "MJPG" else 0.0)
+        if image is None or image.shape != (height, width, 3):
+            image = np.empty((height, width, 3), dtype=np.uint8)
+        image.fill(int(self.camera.now * 30) % 256)
+        return True, image
+
+    def release(self):
+        self.released = True
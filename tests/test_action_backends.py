@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from action_backends import ActionBackend, RecordingBackend, get_backend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.5
+        return self.now
+
+
+def test_records_calls_with_their_time():
+    backend = RecordingBackend(clock=FakeClock())
+    backend.hotkey("ctrl", "c")
+    backend.click("right", 2)
+    backend.type_text("hello")
+    assert backend.calls == [
+        (0.5, "hotkey", ("ctrl", "c")),
+        (1.0, "click", ("right", 2)),
+        (1.5, "type_text", ("hello",)),
+    ]
+    backend.clear()
+    assert backend.names() == []
+
+
+def test_keeps_the_simulated_desktop_state():
+    backend = RecordingBackend(screen_size=(800, 600), active_window="Editor", volume=0.95)
+    assert backend.change_volume(0.1) == 1.0
+    assert backend.change_volume(-0.3) == pytest.approx(0.7)
+    assert backend.toggle_mute() is True
+    assert backend.muted()
+    backend.move_cursor(10, 20)
+    assert backend.cursor == (10, 20)
+    assert backend.screen_size() == (800, 600)
+    assert backend.screenshot().shape == (600, 800, 3)
+    assert backend.active_window_title() == "Editor"
+    assert backend.names() == ["set_volume", "set_volume", "set_mute", "move_cursor", "screenshot"]
+
+
+def test_implements_every_action():
+    shared = ("preload", "_preload", "change_volume", "toggle_mute")
+    inherited = [name for name, value in vars(ActionBackend).items()
+                 if callable(value) and name not in shared and vars(RecordingBackend).get(name) is None]
+    assert inherited == []
+
+
+def test_records_from_many_threads():
+    backend = RecordingBackend()
+    threads = [threading.Thread(target=lambda: [backend.press("a") for _ in range(500)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(backend.names()) == 2000
+
+
+def test_get_backend():
+    assert isinstance(get_backend("recording"), RecordingBackend)
+    with pytest.raises(ValueError):
+        get_backend("amiga")
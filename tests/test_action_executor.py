@@ -0,0 +1,58 @@
+import threading
+import time
+
+from action_executor import ActionExecutor
+
+
+def test_slow_action_is_never_overlapped():
+    results = []
+    running = []
+    overlaps = []
+
+    def action(seconds):
+        running.append(threading.get_ident())
+        if len(running) > 1:
+            overlaps.append(list(running))
+        time.sleep(seconds)
+        running.pop()
+
+    executor = ActionExecutor(on_result=results.append)
+    executor.submit("hung", action, 0.2, timeout=0.05)
+    executor.submit("next", action, 0.0, timeout=1.0)
+    executor.submit("stale", action, 0.0, timeout=0.1)
+    executor.close()
+
+    assert overlaps == []
+    assert [(result.name, result.status) for result in results] == [
+        ("hung", "timeout"), ("next", "ok"), ("stale", "expired")]
+
+
+def test_overflow_never_drops_untimed_actions():
+    gate = threading.Event()
+    results = []
+    executor = ActionExecutor(on_result=results.append, max_pending=3)
+    executor.submit("blocker", gate.wait)
+    time.sleep(0.05)
+    executor.submit("mouse_down", lambda: None)
+    executor.submit("scroll", lambda: None, timeout=5.0)
+    executor.submit("move", lambda: None, coalesce_key="cursor")
+    executor.submit("mouse_up", lambda: None)
+    executor.submit("copy", lambda: None, timeout=5.0)
+    gate.set()
+    executor.close()
+
+    names = [result.name for result in results]
+    assert names == ["blocker", "mouse_down", "mouse_up", "copy"]
+    assert executor.dropped == 2
+
+
+def test_close_does_not_wait_forever_on_a_hung_action():
+    gate = threading.Event()
+    executor = ActionExecutor()
+    executor.submit("hung", gate.wait)
+    start = time.monotonic()
+    executor.close(timeout=0.1)
+    assert time.monotonic() - start < 1.0
+    assert executor.worker.is_alive()
+    gate.set()
+    executor.worker.join(1.0)
@@ -0,0 +1,67 @@
+from camera_tuning import CaptureTuner
+from fake_camera import FakeCamera
+from frame_sources import WebcamSource
+
+
+def tuner_for(camera, tmp_path, **options):
+    return CaptureTuner((640, 480), cache_path=str(tmp_path / "modes.json"), clock=camera.clock, **options)
+
+
+def test_prefers_the_fastest_mode_at_the_smallest_covering_size(tmp_path):
+    camera = FakeCamera()
+    mode, cached = tuner_for(camera, tmp_path).tune(camera.open(), "fake:0")
+    assert (mode.fourcc, mode.width, mode.height, mode.fps) == ("MJPG", 640, 480, 60.0)
+    assert mode.buffer_size == 1
+    assert not cached
+
+
+def test_equal_modes_go_to_the_shorter_interval(tmp_path):
+    camera = FakeCamera(modes=(("YUYV", 640, 480, 30), ("MJPG", 1280, 720, 30), ("MJPG", 640, 480, 30)),
+                        buffer_size_supported=False)
+    mode, _ = tuner_for(camera, tmp_path).tune(camera.open(), "fake:0")
+    assert (mode.fourcc, mode.width, mode.height, mode.fps) == ("YUYV", 640, 480, 30.0)
+    assert mode.buffer_size is None
+
+
+def test_second_open_uses_the_cache(tmp_path):
+    camera = FakeCamera()
+    tuner_for(camera, tmp_path).tune(camera.open(), "fake:0")
+    probe_time = camera.now
+
+    mode, cached = tuner_for(camera, tmp_path).tune(camera.open(), "fake:0")
+    assert cached
+    assert (mode.fourcc, mode.width, mode.height) == ("MJPG", 640, 480)
+    assert mode.interval is not None
+    # No frames were read, so the virtual clock did not move
+    assert camera.now == probe_time
+
+
+def test_retune_probes_again(tmp_path):
+    camera = FakeCamera()
+    tuner_for(camera, tmp_path).tune(camera.open(), "fake:0")
+    probe_time = camera.now
+
+    mode, cached = tuner_for(camera, tmp_path, retune=True).tune(camera.open(), "fake:0")
+    assert not cached
+    assert camera.now > probe_time
+    assert (mode.fourcc, mode.width, mode.height, mode.fps) == ("MJPG", 640, 480, 60.0)
+
+
+def test_cache_is_per_device_and_target(tmp_path):
+    camera = FakeCamera()
+    tuner_for(camera, tmp_path).tune(camera.open(), "fake:0")
+    assert not tuner_for(camera, tmp_path).tune(camera.open(), "fake:1")[1]
+    wide = CaptureTuner((1280, 720), cache_path=str(tmp_path / "modes.json"), clock=camera.clock)
+    mode, cached = wide.tune(camera.open(), "fake:0")
+    assert not cached
+    assert (mode.width, mode.height) == (1280, 720)
+
+
+def test_webcam_source_applies_the_tuned_mode(tmp_path):
+    camera = FakeCamera()
+    source = WebcamSource(0, tuner=tuner_for(camera, tmp_path), open_capture=camera.open)
+    try:
+        assert source.mode.fourcc == "MJPG"
+        assert source.read().shape == (480, 640, 3)
+    finally:
+        source.close()
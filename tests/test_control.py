@@ -0,0 +1,42 @@
+import signal
+import socket
+
+import pytest
+
+from control import ControlChannel
+
+
+def send(path, command):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(command.encode("utf-8"))
+        return client.recv(256).decode("utf-8").strip()
+
+
+def test_refuses_to_replace_a_regular_file(tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("keep me")
+    previous = signal.getsignal(signal.SIGTERM)
+    with pytest.raises(FileExistsError):
+        ControlChannel(str(notes)).start()
+    assert notes.read_text() == "keep me"
+    assert signal.getsignal(signal.SIGTERM) is previous
+
+
+def test_replaces_a_stale_socket_and_restores_signal_handlers(tmp_path):
+    path = tmp_path / "control.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    previous = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+    control = ControlChannel(str(path)).start()
+    try:
+        assert signal.getsignal(signal.SIGTERM) == control.request_stop
+        assert send(path, "ping") == "pong"
+        assert send(path, "stop") == "stopping"
+        assert control.stop_requested
+    finally:
+        control.close()
+    assert not path.exists()
+    assert {signum: signal.getsignal(signum) for signum in previous} == previous
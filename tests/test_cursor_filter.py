@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from cursor_filter import CursorDriver, KalmanCursorFilter, OneEuroFilter
+
+
+FILTERS = [OneEuroFilter, KalmanCursorFilter]
+
+
+@pytest.mark.parametrize("make_filter", FILTERS)
+def test_stationary_input_converges_with_less_jitter(make_filter):
+    cursor_filter = make_filter()
+    rng = np.random.default_rng(0)
+    raw = np.array([500.0, 300.0]) + rng.normal(0, 4, size=(240, 2))
+    out = np.array([cursor_filter.update(i / 60, p).copy() for i, p in enumerate(raw)])
+    settled = out[120:]
+    assert np.abs(settled.mean(axis=0) - [500, 300]).max() < 2
+    assert settled.std(axis=0).max() < raw[120:].std(axis=0).min() * 0.75
+
+
+# One-Euro trades some lag for smoothness, so it only has to beat holding still
+@pytest.mark.parametrize("make_filter, tolerance", [(OneEuroFilter, 0.5), (KalmanCursorFilter, 0.05)])
+def test_predict_extrapolates_constant_velocity(make_filter, tolerance):
+    cursor_filter = make_filter()
+    velocity = np.array([600.0, -300.0])
+    for i in range(60):
+        t = i / 60
+        cursor_filter.update(t, np.array([100.0, 800.0]) + velocity * t)
+    held = cursor_filter.predict(t)
+    t += 0.05
+    expected = np.array([100.0, 800.0]) + velocity * t
+    error = np.abs(cursor_filter.predict(t) - expected).max()
+    assert error < tolerance * np.abs(held - expected).max()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_driver_stops_moving_once_updates_stop():
+    clock = FakeClock()
+    moves = []
+    driver = CursorDriver(KalmanCursorFilter(), lambda x, y: moves.append((x, y)),
+                          refresh_hz=100.0, clock=clock)
+    for i in range(30):
+        clock.now = i / 30
+        driver.update(clock.now, 100.0 + 300.0 * clock.now, 100.0)
+        driver._tick()
+    pushed = len(moves)
+    assert pushed > 0
+
+    # Extrapolation is capped at max_extrapolation, then the driver goes quiet
+    while clock.now < 29 / 30 + driver.reset_after:
+        clock.now += driver.interval
+        driver._tick()
+    assert moves[-1][0] <= 100.0 + 300.0 * (29 / 30 + driver.max_extrapolation) + 1
+    quiet = len(moves)
+    for _ in range(10):
+        clock.now += driver.interval
+        driver._tick()
+    assert len(moves) == quiet
+
+    # A measurement after the gap starts over instead of blending with the old track
+    clock.now += 0.1
+    assert tuple(driver.update(clock.now, 900.0, 700.0)) == (900.0, 700.0)
+
+
+def test_driver_thread_starts_and_stops():
+    moves = []
+    driver = CursorDriver(OneEuroFilter(), lambda x, y: moves.append((x, y)), refresh_hz=200.0)
+    driver.start()
+    driver.update(driver.clock(), 10.0, 20.0)
+    try:
+        for _ in range(100):
+            if moves:
+                break
+            driver.stop_event.wait(0.01)
+    finally:
+        driver.stop()
+    assert moves and moves[0] == (10.0, 20.0)
+    assert not driver.running
@@ -0,0 +1,62 @@
+import wave
+
+import numpy as np
+
+from dictation import AudioRingBuffer, Dictation, EnergyVAD, TranscriptRecognizer, WavFileSource
+
+RATE = 16000
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(samples.astype(np.int16).tobytes())
+
+
+def two_utterances():
+    rng = np.random.default_rng(0)
+
+    def silence(seconds):
+        return rng.normal(0, 30, int(seconds * RATE))
+
+    def speech(seconds):
+        t = np.arange(int(seconds * RATE)) / RATE
+        return 8000 * np.sin(2 * np.pi * 220 * t) + silence(seconds)
+
+    return np.concatenate([silence(0.5), speech(0.6), silence(1.2), speech(0.6), silence(1.2)])
+
+
+def test_dictation_transcribes_each_utterance(tmp_path):
+    write_wav(tmp_path / "clip.wav", two_utterances())
+    (tmp_path / "clip.txt").write_text("first line\nsecond line\n", encoding="utf-8")
+
+    lines = []
+    dictation = Dictation(WavFileSource(str(tmp_path / "clip.wav")),
+                          TranscriptRecognizer(str(tmp_path / "clip.txt")), lines.append, vad=EnergyVAD())
+    dictation.start().join(timeout=10)
+    assert not any(thread.is_alive() for thread in dictation.threads)
+    assert lines == ["first line", "second line"]
+    assert dictation.dropped == 0
+
+
+def test_ring_reads_across_the_wrap_point():
+    ring = AudioRingBuffer(1, 10)
+    ring.write(np.arange(8, dtype=np.int16))
+    ring.write(np.arange(8, 14, dtype=np.int16))
+    assert ring.count == 14
+    assert ring.read(6, 14).tolist() == list(range(6, 14))
+    # Samples 0..3 have been overwritten
+    assert ring.read(0, 6).tolist() == [4, 5]
+    assert ring.read(12, 20).tolist() == [12, 13]
+
+
+def test_ring_keeps_absolute_positions_after_an_oversized_write():
+    ring = AudioRingBuffer(1, 10)
+    ring.write(np.arange(3, dtype=np.int16))
+    ring.write(np.arange(3, 28, dtype=np.int16))
+    assert ring.count == 28
+    assert ring.read(0, 28).tolist() == list(range(18, 28))
+    ring.write(np.arange(28, 31, dtype=np.int16))
+    assert ring.read(20, 31).tolist() == list(range(21, 31))
@@ -0,0 +1,47 @@
+import threading
+
+from event_log import EventLog, read_events
+
+
+def test_counts_every_event_from_many_threads(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), flush_interval=0.01, max_pending=100000)
+    threads = [threading.Thread(target=lambda: [log.log("gesture", i=i) for i in range(2000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+    assert (log.logged, log.written, log.dropped, log.failed) == (8000, 8000, 0, 0)
+    assert len(list(read_events(str(tmp_path / "events.jsonl")))) == 8000
+
+
+def test_only_overflow_counts_as_dropped(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), flush_interval=60.0, max_pending=10)
+    for i in range(25):
+        log.log("motion", i=i)
+    # Queued events are not dropped while they wait for the writer
+    assert log.dropped == 15
+    log.close()
+    assert [event["i"] for event in read_events(str(tmp_path / "events.jsonl"))] == list(range(15, 25))
+    assert (log.written, log.dropped) == (10, 15)
+
+
+class FullDisk:
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_write_errors_are_reported(tmp_path, capsys):
+    log = EventLog(str(tmp_path / "events.jsonl"), flush_interval=60.0)
+    log.file.close()
+    log.file = FullDisk()
+    log.log("action", action="copy")
+    log.close()
+    assert (log.failed, log.dropped, log.written) == (1, 0, 0)
+    assert "1 events lost" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from frame_ring import FrameRing
+
+
+SHAPE = (4, 6, 3)
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing(SHAPE, slots=3)
+    yield ring
+    ring.close()
+
+
+def frame(value):
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+
+def test_claim_publish_and_latest(ring):
+    assert ring.latest() is None
+    slot = ring.claim()
+    slot[:] = 7
+    assert ring.latest() is None  # Claimed but not yet published
+    assert ring.publish(timestamp=1.5) == 0
+
+    sequence, view, dropped = ring.latest()
+    assert (sequence, dropped) == (0, 0)
+    assert (view == 7).all() and not view.flags.writeable
+    assert ring.timestamp(0) == 1.5
+    assert ring.latest(after=0) is None
+
+
+def test_latest_counts_the_frames_a_reader_skipped(ring):
+    for value in range(5):
+        ring.write(frame(value), timestamp=value)
+    sequence, view, dropped = ring.latest(after=1)
+    assert (sequence, dropped) == (4, 2)
+    assert (view == 4).all()
+
+
+def test_a_slot_turns_invalid_once_the_writer_laps_it(ring):
+    ring.write(frame(1))
+    sequence, view, _ = ring.latest()
+    ring.write(frame(2))
+    ring.write(frame(3))
+    assert ring.valid(sequence)
+
+    ring.claim()  # The writer is back at the reader's slot
+    assert not ring.valid(sequence)
+    assert ring.view(sequence) is None and ring.timestamp(sequence) is None
+    ring.publish()
+    assert not ring.valid(sequence)
+
+
+def test_second_handle_attached_from_spec_sees_published_frames(ring):
+    reader = FrameRing.attach(ring.spec())
+    try:
+        assert not reader.owner
+        assert reader.latest() is None
+        ring.write(frame(9), timestamp=2.0)
+        sequence, view, dropped = reader.latest()
+        assert (sequence, dropped) == (0, 0)
+        assert (view == 9).all() and reader.timestamp(sequence) == 2.0
+    finally:
+        reader.close()
+    # Closing a reader leaves the ring to its owner
+    ring.write(frame(10))
+    assert (ring.latest()[1] == 10).all()
+
+
+def test_close_unlinks_the_owners_memory():
+    ring = FrameRing(SHAPE)
+    name = ring.spec()[2]
+    reader = FrameRing.attach(ring.spec())
+    reader.close()
+    shared_memory.SharedMemory(name=name).close()
+
+    ring.close()
+    ring.close()  # Closing twice is harmless
+    assert ring.memory is None
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_needs_two_slots():
+    with pytest.raises(ValueError):
+        FrameRing(SHAPE, slots=1)
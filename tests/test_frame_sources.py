@@ -0,0 +1,55 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from frame_sources import SyntheticSource, VideoFileSource, open_source
+
+
+def write_video(path, frames):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+    writer.release()
+
+
+def test_fps_paces_reads():
+    source = SyntheticSource(64, 48, fps=50, frames=11)
+    start = time.perf_counter()
+    count = sum(1 for _ in source)
+    elapsed = time.perf_counter() - start
+    assert count == 11
+    assert 10 / 50 * 0.9 <= elapsed < 10 / 50 + 0.15
+
+
+def test_unpaced_source_does_not_sleep():
+    source = SyntheticSource(64, 48, fps=None, frames=100)
+    start = time.perf_counter()
+    assert sum(1 for _ in source) == 100
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 4])
+def test_video_ends_cleanly(tmp_path, prefetch):
+    write_video(tmp_path / "clip.avi", 12)
+    source = open_source(str(tmp_path / "clip.avi"), prefetch=prefetch)
+    assert isinstance(source, VideoFileSource)
+
+    frames = list(source)
+    assert len(frames) == 12
+    assert [round(frame.mean() / 10) for frame in frames] == list(range(12))
+    # Reading past the end keeps returning None instead of waiting on the prefetcher
+    assert source.read() is None and source.read() is None
+    source.close()
+    if prefetch:
+        assert not source._prefetcher.is_alive()
+
+
+def test_reads_into_the_given_frame(tmp_path):
+    write_video(tmp_path / "clip.avi", 3)
+    source = VideoFileSource(str(tmp_path / "clip.avi"), prefetch=2)
+    out = np.zeros((48, 64, 3), dtype=np.uint8)
+    assert source.read(out) is out and round(out.mean() / 10) == 0
+    assert source.read(out) is out and round(out.mean() / 10) == 1
+    source.close()
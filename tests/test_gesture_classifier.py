@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pytest
+
+from gesture_classifier import CURSOR_GESTURES, DESKTOP_GESTURES, load_classifier
+
+# Scalar reference cascades: the detect_gesture and detect_* rules the
+# compiled rule files replaced, one hand at a time
+
+
+def desktop_reference(p):
+    x, y = p[:, 0], p[:, 1]
+    if y[12] > y[11] and y[8] > y[7] and y[16] > y[15] and y[20] > y[19] and y[4] > y[3]:
+        return "middle_finger"
+    if y[4] < y[3] and y[8] > y[7] and y[12] > y[11] and y[16] > y[15] and y[20] > y[19]:
+        return "thumbs_up"
+    if y[4] > y[3] and y[8] > y[7] and y[12] > y[11] and y[16] > y[15] and y[20] > y[19] and x[4] > x[0]:
+        return "thumbs_down"
+    if y[8] < y[7] and y[12] < y[11] and y[16] > y[15] and y[20] > y[19]:
+        return "victory"
+    if y[8] < y[5] and y[12] < y[9] and y[16] < y[13] and y[20] < y[17]:
+        return "open_palm"
+    if y[8] > y[5] and y[12] > y[9] and y[16] > y[13] and y[20] > y[17] and y[4] > y[2]:
+        return "fist"
+    if y[8] < y[7] and y[12] > y[11] and y[16] > y[15] and y[20] > y[19]:
+        return "pointing"
+    if math.hypot(x[4] - x[8], y[4] - y[8]) < 0.1 and y[12] < y[11]:
+        return "ok_sign"
+    return "unknown"
+
+
+def cursor_reference(p):
+    x, y = p[:, 0], p[:, 1]
+    wrist = y[0]
+
+    def distance(a, b):
+        return math.hypot(x[a] - x[b], y[a] - y[b])
+
+    up = {tip: y[tip] < wrist for tip in (4, 8, 12, 16, 20)}
+    down = {tip: y[tip] > wrist for tip in (4, 8, 12, 16, 20)}
+    if all(up.values()) and abs(x[4] - x[8]) > 0.04 and abs(x[8] - x[20]) > 0.1:
+        return "open_palm"
+    if distance(4, 8) < 0.04:
+        return "pinch"
+    if distance(4, 6) < 0.05 and up[12] and up[16] and up[20]:
+        return "ok_sign"
+    if up[8] and up[12] and down[16] and down[20] and abs(x[8] - x[12]) > 0.04:
+        return "v_sign"
+    if up[8] and up[12] and up[16] and down[20] and down[4]:
+        return "three_fingers"
+    if all(distance(4, tip) < 0.07 for tip in (8, 12, 16, 20)):
+        return "all_finger_pinch"
+    if all(down.values()) and abs(x[8] - x[20]) < 0.1:
+        return "fist"
+    if y[4] < wrist - 0.1 and down[8] and down[12] and down[16] and down[20]:
+        return "thumb_up"
+    if y[4] > wrist + 0.1 and down[8] and down[12] and down[16] and down[20]:
+        return "thumb_down"
+    if up[4] and down[8] and down[12] and down[16] and up[20]:
+        return "rock_gesture"
+    if (up[8] and up[12] and up[16] and up[20] and abs(x[8] - x[12]) < 0.03
+            and abs(x[12] - x[16]) < 0.03 and abs(x[16] - x[20]) < 0.03):
+        return "flat_hand"
+    return None
+
+
+def hands(count, seed=0):
+    """Random hands around a wrist, squeezed together often enough to hit the distance rules"""
+    rng = np.random.default_rng(seed)
+    spread = rng.choice([0.02, 0.06, 0.2, 0.5], size=(count, 1, 1))
+    points = 0.5 + spread * rng.uniform(-1, 1, size=(count, 21, 3))
+    return points.astype(np.float32)
+
+
+# thumbs_down can never fire: every hand it matches is a middle_finger first
+@pytest.mark.parametrize("path, default, reference, unreachable", [
+    (DESKTOP_GESTURES, "unknown", desktop_reference, {"thumbs_down"}),
+    (CURSOR_GESTURES, None, cursor_reference, set()),
+])
+def test_batch_matches_the_scalar_rules(path, default, reference, unreachable):
+    classifier = load_classifier(path, default=default)
+    points = hands(20000)
+    expected = [reference(hand) for hand in points]
+    assert list(classifier.labels(points)) == expected
+    # Every reachable rule fires somewhere, so the comparison covers the whole cascade
+    assert set(expected) >= set(classifier.names) - unreachable
+
+
+def test_single_hand_matches_the_batch():
+    classifier = load_classifier(CURSOR_GESTURES)
+    points = hands(50, seed=1)
+    assert [classifier.classify(hand) for hand in points] == list(classifier.labels(points))
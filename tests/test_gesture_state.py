@@ -0,0 +1,49 @@
+import pytest
+
+from gesture_state import ActionCooldowns, GestureStateMachine
+
+
+def activation_time(fps, hold_time=0.15):
+    state = GestureStateMachine(hold_time=hold_time, window=0.3)
+    for i in range(2 * int(fps)):
+        t = i / fps
+        if state.update(t, "fist") == "fist":
+            return t
+    return None
+
+
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_hold_is_measured_in_seconds_not_frames(fps):
+    t = activation_time(fps)
+    assert 0.15 <= t < 0.15 + 1 / fps
+
+
+def test_noisy_frame_neither_exits_nor_switches():
+    state = GestureStateMachine(hold_time=0.15, window=0.3)
+    labels = ["fist"] * 30 + ["open_palm"] + ["fist"] * 5 + [None] + ["fist"] * 5
+    active = [state.update(i / 60, label) for i, label in enumerate(labels)]
+    assert active[20:] == ["fist"] * (len(labels) - 20)
+
+
+def test_exits_once_the_gesture_is_gone_and_switches_after_a_new_hold():
+    state = GestureStateMachine(hold_time=0.15, window=0.3)
+    t = 0.0
+    for _ in range(30):
+        state.update(t, "fist")
+        t += 1 / 60
+    switched_at = None
+    for _ in range(60):
+        if state.update(t, "open_palm") == "open_palm" and switched_at is None:
+            switched_at = t
+        t += 1 / 60
+    assert switched_at is not None and switched_at - 0.5 >= 0.15
+
+
+def test_cooldown_blocks_only_its_own_gesture():
+    cooldowns = ActionCooldowns({"thumb_up": 1.0}, default_cooldown=0.5)
+    assert cooldowns.ready("thumb_up", 0.0)
+    assert not cooldowns.ready("thumb_up", 0.9)
+    assert cooldowns.ready("thumb_down", 0.9)
+    assert not cooldowns.ready("thumb_down", 1.2)
+    assert cooldowns.ready("thumb_up", 1.0)
+    assert cooldowns.ready("thumb_down", 1.5)
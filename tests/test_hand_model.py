@@ -0,0 +1,80 @@
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from hand_model import HandModel
+
+
+class FakeHands:
+    def __init__(self, loaded, **options):
+        self.options = options
+        self.frames = []
+        self.closed = False
+        # Hold the background load here until the test lets it finish
+        assert loaded.wait(5)
+
+    def process(self, image):
+        self.frames.append(image.shape)
+        return "results"
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    loaded = threading.Event()
+    hands = types.SimpleNamespace(Hands=lambda **options: FakeHands(loaded, **options))
+    mediapipe = types.ModuleType("mediapipe")
+    mediapipe.solutions = types.SimpleNamespace(hands=hands)
+    monkeypatch.setitem(sys.modules, "mediapipe", mediapipe)
+    return loaded
+
+
+def test_warmup_runs_in_the_background(loaded):
+    model = HandModel(max_hands=2, warm_up_shape=(24, 32, 3)).start()
+    assert model.thread.is_alive() and not model.ready.is_set()
+
+    loaded.set()
+    hands = model.wait()
+    assert model.ready.is_set() and model.load_time is not None
+    assert hands.frames == [(24, 32, 3)]
+    assert hands.options["max_num_hands"] == 2
+    model.close()
+    assert hands.closed
+
+
+def test_first_process_waits_for_the_model(loaded):
+    model = HandModel().start()
+    results = []
+    caller = threading.Thread(target=lambda: results.append(model.process(np.zeros((4, 4, 3), np.uint8))))
+    caller.start()
+    caller.join(0.1)
+    assert caller.is_alive() and not results
+
+    loaded.set()
+    caller.join(5)
+    assert results == ["results"]
+    assert model.hands.frames == [(240, 320, 3), (4, 4, 3)]
+
+
+def test_process_without_start_loads_synchronously(loaded):
+    loaded.set()
+    model = HandModel(warm_up_shape=None)
+    assert model.process(np.zeros((4, 4, 3), np.uint8)) == "results"
+    assert model.hands.frames == [(4, 4, 3)]
+
+
+def test_loading_errors_surface_on_use(monkeypatch):
+    monkeypatch.setitem(sys.modules, "mediapipe", None)
+    model = HandModel().start()
+    with pytest.raises(ImportError):
+        model.process(np.zeros((4, 4, 3), np.uint8))
+
+
+def test_settings_rebuild_the_same_model():
+    model = HandModel(max_hands=2, min_detection_confidence=0.6, min_tracking_confidence=0.4)
+    assert HandModel(**model.settings()).options == model.options
@@ -0,0 +1,62 @@
+import numpy as np
+
+from hand_tracking import INDEX_TIP, THUMB_TIP, HandTracker, PinchZoom
+
+
+def hand_at(x, y):
+    return np.tile([x, y, 0.0], (21, 1))
+
+
+def batch(*centers):
+    return np.stack([hand_at(x, y) for x, y in centers])
+
+
+def test_ids_follow_the_hands_when_the_list_order_swaps():
+    tracker = HandTracker(dict)
+    left, right = tracker.update(0.0, ["Left", "Right"], batch((0.3, 0.5), (0.7, 0.5)))
+    left.state["name"] = "left"
+
+    # MediaPipe lists the hands the other way round on the next frame
+    first, second = tracker.update(0.033, ["Right", "Left"], batch((0.71, 0.5), (0.31, 0.5)))
+    assert first.track_id == right.track_id and second.track_id == left.track_id
+    assert second.state == {"name": "left"}
+    assert len(tracker.tracks) == 2
+
+
+def test_tracks_are_dropped_after_forget_after():
+    tracker = HandTracker(dict, forget_after=0.5)
+    (track,) = tracker.update(0.0, ["Right"], batch((0.5, 0.5)))
+    tracker.update(0.4, [], np.zeros((0, 21, 3)))
+    assert track.track_id in tracker.tracks
+
+    (same,) = tracker.update(0.45, ["Right"], batch((0.5, 0.5)))
+    assert same is track
+    tracker.update(1.0, [], np.zeros((0, 21, 3)))
+    assert not tracker.tracks
+    (new,) = tracker.update(1.01, ["Right"], batch((0.5, 0.5)))
+    assert new.track_id != track.track_id
+
+
+def pinches(distance):
+    points = batch((0.5 - distance / 2, 0.5), (0.5 + distance / 2, 0.5))
+    points[:, [THUMB_TIP, INDEX_TIP], 1] += [[-0.01, 0.01]]
+    return points
+
+
+def test_pinch_zoom_steps_only_past_its_threshold():
+    zoom = PinchZoom(step=0.15)
+    both = ["pinch", "pinch"]
+    assert zoom.update(both, pinches(0.4)) is None
+    assert zoom.active
+    assert zoom.update(both, pinches(0.44)) is None
+    assert zoom.update(both, pinches(0.47)) == "zoom_in"
+    assert zoom.update(both, pinches(0.44)) is None
+    assert zoom.update(both, pinches(0.40)) == "zoom_out"
+
+
+def test_pinch_zoom_needs_both_hands_pinching():
+    zoom = PinchZoom()
+    assert zoom.update(["pinch", "pinch"], pinches(0.4)) is None
+    assert zoom.update(["pinch", "fist"], pinches(0.8)) is None
+    assert not zoom.active
+    assert zoom.update(["pinch", "pinch"], pinches(0.8)) is None
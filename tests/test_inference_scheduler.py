@@ -0,0 +1,52 @@
+import numpy as np
+
+from inference_scheduler import REUSE, RUN, SKIP, InferenceScheduler
+
+
+def still():
+    return np.full((240, 320, 3), 100, dtype=np.uint8)
+
+
+def box_at(x):
+    image = still()
+    image[80:160, x:x + 80] = 255
+    return image
+
+
+def run(scheduler, frames, fps=30.0):
+    return [scheduler.decide(image, now=i / fps) for i, image in enumerate(frames)]
+
+
+def test_still_frames_without_a_hand_are_skipped_between_idle_refreshes():
+    scheduler = InferenceScheduler(idle_fps=2.0)
+    decisions = run(scheduler, [still()] * 31)
+    assert [i for i, decision in enumerate(decisions) if decision == RUN] == [0, 15, 30]
+    assert set(decisions) == {RUN, SKIP}
+    assert scheduler.counts == {RUN: 3, REUSE: 0, SKIP: 28}
+
+
+def test_still_frames_with_a_hand_reuse_landmarks_between_forced_refreshes():
+    scheduler = InferenceScheduler(min_tracking_fps=8.0)
+    scheduler.decide(still(), now=0.0)
+    scheduler.observe(True)
+    decisions = [scheduler.decide(still(), now=i / 32) for i in range(1, 9)]
+    assert decisions == [REUSE, REUSE, REUSE, RUN, REUSE, REUSE, REUSE, RUN]
+
+
+def test_motion_runs_every_frame():
+    scheduler = InferenceScheduler()
+    decisions = run(scheduler, [box_at(x) for x in range(0, 200, 20)])
+    assert decisions == [RUN] * 10
+
+    scheduler.observe(True)
+    decisions = [scheduler.decide(box_at(x), now=1 + i / 30) for i, x in enumerate(range(0, 200, 20))]
+    assert decisions == [RUN] * 10
+
+
+def test_slow_drift_adds_up_to_a_run():
+    # Motion is measured against the last inference, not the previous frame
+    scheduler = InferenceScheduler(motion_threshold=6.0, idle_fps=0.01)
+    decisions = run(scheduler, [box_at(x) for x in range(0, 40, 2)])
+    assert decisions[0] == RUN and SKIP in decisions[1:3]
+    assert RUN in decisions[1:]
+    assert scheduler.format_counts().startswith("run ")
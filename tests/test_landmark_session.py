@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+import pytest
+
+from action_backends import RecordingBackend
+from landmark_session import SessionReader, SessionWriter, replay
+from main import HandGestureControl
+
+
+def thumbs_up():
+    """A hand the desktop rules label thumbs_up: thumb tip above its joint, fingers curled"""
+    points = np.full((21, 3), 0.5, dtype=np.float32)
+    points[4, 1] = 0.4
+    for tip in (8, 12, 16, 20):
+        points[tip, 1] = 0.6
+    return points
+
+
+def record(path, frames, fps=30.0):
+    with SessionWriter(str(path)) as writer:
+        for i, hands in enumerate(frames):
+            writer.write(100.0 + i / fps, hands)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "session.lmk"
+    left = np.random.default_rng(0).random((21, 3), dtype=np.float32)
+    right = np.random.default_rng(1).random((21, 3), dtype=np.float32)
+    record(path, [[], [("Left", left)], [("Left", left), ("Right", right)]])
+
+    reader = SessionReader(str(path))
+    assert len(reader) == 3
+    timestamp, hands = reader.frame(0)
+    assert timestamp == 100.0 and hands == []
+    _, hands = reader.frame(2)
+    assert [handedness for handedness, _ in hands] == ["Left", "Right"]
+    assert np.array_equal(hands[0][1], left) and np.array_equal(hands[1][1], right)
+    assert reader.hand_landmarks().shape == (3, 21, 3)
+
+
+def test_empty_session(tmp_path):
+    path = tmp_path / "empty.lmk"
+    record(path, [])
+    reader = SessionReader(str(path))
+    assert len(reader) == 0
+    assert list(replay(reader)) == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not landmarks")
+    with pytest.raises(IOError):
+        SessionReader(str(path))
+
+
+def test_replay_keeps_the_recorded_pace(tmp_path):
+    path = tmp_path / "session.lmk"
+    record(path, [[]] * 7, fps=20.0)
+    reader = SessionReader(str(path))
+
+    start = time.perf_counter()
+    assert len(list(replay(reader, realtime=True, speed=2.0))) == 7
+    # Six intervals of 50 ms at double speed
+    assert time.perf_counter() - start >= 0.14
+
+    start = time.perf_counter()
+    timestamps = [timestamp for timestamp, _ in replay(reader, realtime=False)]
+    assert time.perf_counter() - start < 0.1
+    assert timestamps == list(reader.timestamps)
+
+
+def test_replay_drives_the_gesture_commands(tmp_path):
+    path = tmp_path / "session.lmk"
+    # Held for 1.5 s: long enough to trigger once, too short for a second time after the cooldown
+    record(path, [[("Right", thumbs_up())]] * 45)
+    reader = SessionReader(str(path))
+
+    backend = RecordingBackend(volume=0.5)
+    controller = HandGestureControl(source=None, backend=backend)
+    for timestamp, hands in replay(reader, realtime=False):
+        controller.handle_hands(hands, timestamp)
+    controller.executor.close()
+    controller.close()
+
+    assert backend.names() == ["set_volume"]
+    assert backend.volume() == pytest.approx(0.6)
+
+    counts = HandGestureControl(source=None, backend=RecordingBackend()).run_replay(str(path), realtime=False)
+    assert counts == {"thumbs_up": 45}
+
+
+def test_records_as_many_hands_as_the_model_tracks(tmp_path):
+    path = tmp_path / "session.lmk"
+    hands = [("Left", np.full((21, 3), i, dtype=np.float32)) for i in range(3)]
+    with SessionWriter(str(path), max_hands=3) as writer:
+        writer.write(0.0, hands)
+        with pytest.raises(ValueError):
+            writer.write(0.1, hands + hands[:1])
+    reader = SessionReader(str(path))
+    assert len(reader) == 1
+    assert [int(points[0, 0]) for _, points in reader.frame(0)[1]] == [0, 1, 2]
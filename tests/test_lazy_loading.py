@@ -0,0 +1,44 @@
+import sys
+import threading
+
+import pytest
+
+from lazy_loading import lazy_import
+
+
+@pytest.fixture
+def heavy_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_test_heavy.py").write_text("IMPORTS = []\nIMPORTS.append(1)\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_test_heavy"
+    sys.modules.pop("lazy_test_heavy", None)
+
+
+def test_imports_on_first_attribute_access(heavy_module):
+    module = lazy_import(heavy_module)
+    assert heavy_module not in sys.modules
+    assert "not loaded" in repr(module)
+
+    assert module.VALUE == 42
+    assert heavy_module in sys.modules
+    assert module.IMPORTS == [1]
+    assert module.VALUE == 42 and module.IMPORTS == [1]  # Imported once
+
+
+def test_setting_an_attribute_sets_it_on_the_module(heavy_module):
+    module = lazy_import(heavy_module)
+    module.VALUE = 7
+    assert sys.modules[heavy_module].VALUE == 7
+
+
+def test_preload_imports_in_the_background(heavy_module):
+    module = lazy_import(heavy_module).preload()
+    for thread in [t for t in threading.enumerate() if t.name == f"preload-{heavy_module}"]:
+        thread.join(timeout=5)
+    assert module._module is sys.modules[heavy_module]
+
+
+def test_missing_module_fails_on_use_not_on_import():
+    module = lazy_import("no_such_module_for_lazy_test")
+    with pytest.raises(ImportError):
+        module.anything
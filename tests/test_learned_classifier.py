@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from gesture_classifier import GestureClassifier, load_classifier
+from learned_classifier import KNNModel, MLPModel, NONE_LABEL, load_model, normalize_landmarks
+
+LABELS = ["fist", "open_palm", "pointing", NONE_LABEL]
+
+
+def templates(seed=0):
+    return np.random.default_rng(seed).uniform(0.3, 0.7, size=(len(LABELS), 21, 3)).astype(np.float32)
+
+
+def dataset(count, noise=0.01, seed=1):
+    """Noisy copies of one template per label, at random positions, sizes and angles"""
+    rng = np.random.default_rng(seed)
+    targets = rng.integers(0, len(LABELS), count)
+    points = templates()[targets] + rng.normal(0, noise, (count, 21, 3)).astype(np.float32)
+    return transform(points, rng), targets
+
+
+def transform(points, rng):
+    angle = rng.uniform(-np.pi, np.pi, (len(points), 1))
+    scale = rng.uniform(0.5, 2.0, (len(points), 1, 1))
+    shift = rng.uniform(-0.3, 0.3, (len(points), 1, 3))
+    x, y = points[..., 0], points[..., 1]
+    moved = np.stack([x * np.cos(angle) - y * np.sin(angle), x * np.sin(angle) + y * np.cos(angle),
+                      points[..., 2]], axis=-1)
+    return (moved * scale + shift).astype(np.float32)
+
+
+def test_normalisation_ignores_position_size_and_rotation():
+    points = templates()
+    moved = transform(points, np.random.default_rng(2))
+    assert np.allclose(normalize_landmarks(points), normalize_landmarks(moved), atol=1e-4)
+
+
+def test_batch_normalisation_matches_single_hands():
+    points, _ = dataset(8)
+    batch = normalize_landmarks(points)
+    single = np.concatenate([normalize_landmarks(points[i:i + 1]) for i in range(len(points))])
+    assert batch.shape == (8, 60)
+    assert np.allclose(batch, single, atol=1e-5)
+
+
+@pytest.mark.parametrize("model_class", [KNNModel, MLPModel])
+def test_fit_save_load_round_trip(model_class, tmp_path):
+    points, targets = dataset(400)
+    model = model_class.fit(normalize_landmarks(points), targets, LABELS)
+    test_points, test_targets = dataset(100, seed=3)
+    best, _ = model.predict(test_points)
+    assert (best == test_targets).mean() > 0.95
+
+    path = str(tmp_path / "gestures.npz")
+    model.save(path)
+    loaded = load_model(path)
+    assert type(loaded) is model_class
+    assert loaded.labels == LABELS
+    assert np.array_equal(loaded.first_match(test_points), model.first_match(test_points))
+
+
+def test_rejects_none_and_unsure_hands():
+    points, targets = dataset(400)
+    model = KNNModel.fit(normalize_landmarks(points), targets, LABELS, k=5)
+    none = templates()[LABELS.index(NONE_LABEL)][np.newaxis]
+    assert model.first_match(none)[0] == -1
+
+    unsure = KNNModel.fit(normalize_landmarks(points), targets, LABELS, min_confidence=1.01)
+    assert (unsure.first_match(points[:20]) == -1).all()
+
+
+def test_load_classifier_uses_a_saved_model(tmp_path):
+    points, targets = dataset(400)
+    path = str(tmp_path / "gestures.npz")
+    MLPModel.fit(normalize_landmarks(points), targets, LABELS).save(path)
+
+    classifier = load_classifier(path, default="unknown")
+    assert isinstance(classifier, GestureClassifier)
+    hands = templates()
+    assert list(classifier.labels(hands)) == ["fist", "open_palm", "pointing", "unknown"]
+    assert classifier.classify(hands[1]) == "open_palm"
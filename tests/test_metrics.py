@@ -0,0 +1,34 @@
+import threading
+
+from metrics import Metrics
+
+
+def test_counts_updates_from_many_threads():
+    metrics = Metrics()
+    counter = metrics.counter("actions_total", "Actions", ("action",))
+
+    def work():
+        for _ in range(20000):
+            counter.inc("copy")
+            metrics.add("inference", 0.003)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.values["copy"] == 80000
+    text = metrics.render()
+    assert 'gesture_control_actions_total{action="copy"} 80000' in text
+    assert 'gesture_control_stage_seconds_count{stage="inference"} 80000' in text
+    assert 'gesture_control_stage_seconds_bucket{stage="inference",le="0.002"} 0' in text
+    assert 'gesture_control_stage_seconds_bucket{stage="inference",le="0.005"} 80000' in text
+
+
+def test_gauges_are_read_when_rendered():
+    metrics = Metrics()
+    queue = {"before_inference": 1}
+    metrics.gauge("frames_dropped", "Frames dropped", lambda: dict(queue), label="queue")
+    queue["before_inference"] = 3
+    assert 'gesture_control_frames_dropped{queue="before_inference"} 3' in metrics.render()
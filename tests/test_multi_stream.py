@@ -0,0 +1,31 @@
+import os
+import runpy
+import threading
+
+import numpy as np
+
+from multi_stream import StreamFusion
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_spawned_workers_can_import_the_scripts_without_side_effects():
+    # A spawn worker runs the launching script again under this name
+    before = threading.active_count()
+    cont = runpy.run_path(os.path.join(ROOT, "cont.py"), run_name="__mp_main__")
+    runpy.run_path(os.path.join(ROOT, "main.py"), run_name="__mp_main__")
+    assert threading.active_count() == before
+    assert cont["backend"] is None and cont["executor"] is None and cont["classifier"] is None
+
+
+def test_fusion_keeps_the_active_stream_while_it_sees_a_hand():
+    fusion = StreamFusion(hold=0.3)
+    hand = [("Right", np.zeros((21, 3), dtype=np.float32))]
+    assert fusion.update(0, 0.0, hand) == hand
+    assert fusion.update(1, 0.1, hand) is None
+    # Stream 0 loses the hand; stream 1 takes over once hold has passed
+    assert fusion.update(0, 0.2, hand) == hand
+    assert fusion.update(0, 0.3, []) == []
+    assert fusion.update(1, 0.4, hand) is None
+    assert fusion.update(1, 0.6, hand) == hand
+    assert fusion.active == 1 and fusion.switches == 1
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import numpy as np
+
+from pipeline import FramePipeline, LatestQueue
+from preprocess import FramePreprocessor
+
+
+class NumberedSource:
+    """Fast source whose every frame is filled with its own sequence number"""
+
+    def __init__(self, count, interval=1 / 60):
+        self.count = count
+        self.interval = interval
+        self.sequence = 0
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def read(self):
+        if self.sequence >= self.count:
+            return None
+        time.sleep(self.interval)
+        self.sequence += 1
+        # Captures into the same buffer every time, as the camera loop does
+        self.frame.fill(self.sequence % 256)
+        return self.frame
+
+
+def test_latest_queue_reports_dropped_items():
+    dropped = []
+    frames = LatestQueue(1, on_drop=dropped.append)
+    for item in range(3):
+        frames.put(item)
+    assert frames.dropped == 2
+    assert dropped == [0, 1]
+    frames.drain()
+    assert dropped == [0, 1, 2]
+
+
+def test_slow_inference_never_sees_a_reused_buffer():
+    source = NumberedSource(60)
+    preprocessor = FramePreprocessor(mirror_image=True, pooled=True)
+    corrupted = []
+    presented = []
+    lock = threading.Lock()
+
+    def capture():
+        frame = source.read()
+        return None if frame is None else preprocessor.mirror(frame)
+
+    def infer(frame):
+        value = int(frame[0, 0, 0])
+        time.sleep(0.12)
+        if not (frame == value).all():
+            with lock:
+                corrupted.append(("inference", value))
+        return value
+
+    def present(frame, value):
+        # Presentation is slow too, so frames pile up behind both stages
+        time.sleep(0.02)
+        if not (frame == value).all():
+            corrupted.append(("presentation", value))
+        presented.append(value)
+
+    pipeline = FramePipeline(capture, infer, present, release=preprocessor.release)
+    pipeline.run()
+
+    assert presented
+    assert corrupted == []
+    assert pipeline.frames.dropped > 0
+    # Buffers come back to the pool instead of growing with every frame
+    assert len(preprocessor._free) <= 6
+
+
+def test_sequential_mirror_reuses_one_buffer():
+    preprocessor = FramePreprocessor(mirror_image=True)
+    image = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    first = preprocessor.mirror(image)
+    second = preprocessor.mirror(image)
+    assert first is second
+    assert (first == image[:, ::-1]).all()
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from roi_tracker import RoiTracker
+
+FRAME = (480, 640, 3)
+
+
+def results(*hands):
+    """Fake hands.process results; each hand is a list of (x, y, z) normalised points"""
+    return SimpleNamespace(multi_hand_landmarks=[
+        SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in hand]) for hand in hands
+    ] or None)
+
+
+def hand_box(x0, y0, x1, y1):
+    return [(x0, y0, 0.0), (x1, y1, -0.1), ((x0 + x1) / 2, (y0 + y1) / 2, 0.05)]
+
+
+def test_full_frame_until_a_hand_is_found():
+    tracker = RoiTracker()
+    image = np.zeros(FRAME, dtype=np.uint8)
+    window, roi = tracker.crop(image)
+    assert window is image and roi is None
+
+    tracker.update(results(hand_box(0.4, 0.4, 0.5, 0.55)), None, FRAME)
+    x, y, w, h = tracker.roi
+    assert x <= 0.4 * 640 and y <= 0.4 * 480 and x + w >= 0.5 * 640 and y + h >= 0.55 * 480
+
+
+def test_crop_landmarks_map_back_to_the_full_frame():
+    tracker = RoiTracker(max_input=None)
+    tracker.roi = (200, 100, 160, 120)
+    image = np.arange(np.prod(FRAME), dtype=np.uint32).reshape(FRAME).astype(np.uint8)
+    window, roi = tracker.crop(image)
+    assert window.shape == (120, 160, 3)
+    assert (window == image[100:220, 200:360]).all()
+
+    hands = results([(0.5, 0.5, 0.2), (0.0, 1.0, -0.1)])
+    tracker.update(hands, roi, FRAME)
+    first, second = hands.multi_hand_landmarks[0].landmark
+    assert (first.x, first.y) == pytest.approx(((200 + 80) / 640, (100 + 60) / 480))
+    assert first.z == pytest.approx(0.2 * 160 / 640)
+    assert (second.x, second.y) == pytest.approx((200 / 640, 220 / 480))
+
+
+def test_large_windows_are_downscaled():
+    tracker = RoiTracker(max_input=100)
+    tracker.roi = (0, 0, 400, 200)
+    window, roi = tracker.crop(np.zeros(FRAME, dtype=np.uint8))
+    assert window.shape == (50, 100, 3) and roi == (0, 0, 400, 200)
+
+
+def test_falls_back_to_the_full_frame_when_tracking_is_lost():
+    tracker = RoiTracker(lost_after=2)
+    tracker.update(results(hand_box(0.4, 0.4, 0.5, 0.55)), None, FRAME)
+    roi = tracker.roi
+    assert roi is not None
+
+    tracker.update(results(), roi, FRAME)
+    assert tracker.roi == roi  # One missed frame keeps the window
+    tracker.update(results(), roi, FRAME)
+    assert tracker.roi is None
+    image = np.zeros(FRAME, dtype=np.uint8)
+    assert tracker.crop(image) == (image, None)
+
+
+def test_window_holds_still_for_small_moves_and_follows_large_ones():
+    tracker = RoiTracker()
+    tracker.update(results(hand_box(0.4, 0.4, 0.5, 0.55)), None, FRAME)
+    roi = tracker.roi
+    tracker.update(results(hand_box(0.41, 0.4, 0.51, 0.55)), None, FRAME)
+    assert tracker.roi == roi
+    tracker.update(results(hand_box(0.7, 0.4, 0.8, 0.55)), None, FRAME)
+    assert tracker.roi != roi
+    x, _, w, _ = tracker.roi
+    assert x <= 0.7 * 640 and x + w >= 0.8 * 640
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from action_backends import RecordingBackend
+from screenshot_service import ScreenshotService
+
+
+class Screen:
+    """grab(out) stand-in that counts how often it had to allocate"""
+
+    def __init__(self, shape=(60, 80, 3)):
+        self.shape = shape
+        self.value = 0
+        self.allocated = 0
+
+    def grab(self, out=None):
+        if out is None or out.shape != self.shape:
+            out = np.empty(self.shape, dtype=np.uint8)
+            self.allocated += 1
+        self.value += 1
+        out.fill(self.value)
+        return out
+
+
+def test_capture_grabs_into_pooled_buffers(tmp_path):
+    screen = Screen()
+    service = ScreenshotService(screen.grab, str(tmp_path), image_format="raw", workers=1)
+    encode = service._encode
+    encoded = []
+
+    def record_encode(image, path):
+        encoded.append(int(image[0, 0, 0]))
+        return encode(image, path)
+
+    service._encode = record_encode
+    for _ in range(10):
+        service.capture().result()
+    service.close()
+    # Every screen reached the encoder intact, and only the pool's buffers were ever allocated
+    assert encoded == list(range(1, 11))
+    assert screen.allocated <= service.max_buffers
+
+
+def test_backend_screenshot_fills_the_given_buffer():
+    backend = RecordingBackend(screen_size=(80, 60))
+    buffer = np.full((60, 80, 3), 7, dtype=np.uint8)
+    assert backend.screenshot(buffer) is buffer
+    assert not buffer.any()
+    assert backend.screenshot(np.empty((10, 10, 3), dtype=np.uint8)).shape == (60, 80, 3)
+
+
+def test_save_burst_does_not_block_grabbing_while_it_waits_for_buffers(tmp_path):
+    screen = Screen()
+    service = ScreenshotService(screen.grab, str(tmp_path), image_format="raw", workers=1, burst=3,
+                                burst_fps=100.0)
+    gate = threading.Event()
+    encode = service._encode
+
+    def slow_encode(image, path):
+        gate.wait()
+        return encode(image, path)
+
+    service._encode = slow_encode
+    service.start_burst()
+    time.sleep(0.1)
+    # Hold every buffer in encodes that cannot finish yet
+    pending = [service.capture() for _ in range(service.max_buffers)]
+    saver = threading.Thread(target=service.save_burst)
+    saver.start()
+    time.sleep(0.05)
+    grabbed = service.ring_count
+    time.sleep(0.1)
+    # save_burst is waiting for buffers, but the ring kept filling
+    assert saver.is_alive()
+    assert service.ring_count > grabbed
+    gate.set()
+    saver.join(2.0)
+    assert not saver.is_alive()
+    for future in pending:
+        future.result()
+    service.close()
+
+
+def test_failed_grabs_give_their_buffer_back(tmp_path):
+    screen = Screen()
+    failures = []
+
+    def grab(out=None):
+        if len(failures) < 10:
+            failures.append(out)
+            raise OSError("display went away")
+        return screen.grab(out)
+
+    service = ScreenshotService(grab, str(tmp_path), image_format="raw", workers=1, buffer_timeout=1.0)
+    for _ in range(10):
+        with pytest.raises(OSError, match="display went away"):
+            service.capture()
+    assert len(failures) > service.max_buffers
+    assert service.capture().result().endswith(".npy")
+    service.close()
+
+
+def test_failed_paths_give_their_buffer_back(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    service = ScreenshotService(Screen().grab, str(blocker / "shots"), image_format="raw", workers=1,
+                                buffer_timeout=1.0)
+    for _ in range(service.max_buffers + 2):
+        with pytest.raises(OSError) as failure:
+            service.capture()
+        # Running out of buffers would show up as a TimeoutError instead
+        assert not isinstance(failure.value, TimeoutError)
+    assert service.free.qsize() == service.buffer_count
+    service.close()
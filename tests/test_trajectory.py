@@ -0,0 +1,64 @@
+import numpy as np
+
+from trajectory import PALM, MotionRecognizer
+
+FPS = 30
+
+
+def hand(x, y, scale=1.0):
+    """Landmarks whose palm centre is (x, y) and whose palm size grows with scale"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, :2] = x, y
+    angles = np.linspace(0, 2 * np.pi, len(PALM), endpoint=False)
+    points[PALM, 0] += 0.05 * scale * np.cos(angles)
+    points[PALM, 1] += 0.05 * scale * np.sin(angles)
+    return points
+
+
+def play(recognizer, path, start=0.0):
+    """Feed (x, y, scale) samples at FPS; returns [(time, event)]"""
+    events = []
+    for i, (x, y, scale) in enumerate(path):
+        t = start + i / FPS
+        event = recognizer.update(t, hand(x, y, scale))
+        if event:
+            events.append((round(t, 2), event))
+    return events
+
+
+def move(start, end, seconds):
+    steps = int(seconds * FPS)
+    return [tuple(start[k] + (end[k] - start[k]) * i / steps for k in range(3)) for i in range(steps + 1)]
+
+
+def hold(position, seconds):
+    return [position] * int(seconds * FPS)
+
+
+def names(events):
+    return [event for _, event in events]
+
+
+def test_slow_swipe_fires_once():
+    path = move((0.2, 0.5, 1.0), (0.8, 0.5, 1.0), 1.5) + hold((0.8, 0.5, 1.0), 0.5)
+    assert names(play(MotionRecognizer(), path)) == ["swipe_right"]
+
+
+def test_fast_push_fires_once():
+    path = move((0.5, 0.5, 1.0), (0.5, 0.5, 2.0), 0.3) + hold((0.5, 0.5, 2.0), 1.0)
+    assert names(play(MotionRecognizer(), path)) == ["push"]
+
+
+def test_slow_push_fires_once():
+    path = move((0.5, 0.5, 1.0), (0.5, 0.5, 1.8), 0.6) + hold((0.5, 0.5, 1.8), 1.0)
+    assert names(play(MotionRecognizer(), path)) == ["push"]
+
+
+def test_rearms_after_the_hand_rests():
+    path = (move((0.2, 0.5, 1.0), (0.8, 0.5, 1.0), 0.4) + hold((0.8, 0.5, 1.0), 0.5)
+            + move((0.8, 0.5, 1.0), (0.2, 0.5, 1.0), 0.4) + hold((0.2, 0.5, 1.0), 0.5))
+    assert names(play(MotionRecognizer(), path)) == ["swipe_right", "swipe_left"]
+
+
+def test_still_hand_fires_nothing():
+    assert play(MotionRecognizer(), hold((0.5, 0.5, 1.0), 2.0)) == []
@@ -0,0 +1,129 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from landmark_session import MAGIC, SessionReader
+from learned_classifier import MODELS, NONE_LABEL, load_model, normalize_landmarks
+
+
+def _is_session(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_labelled_sessions(specs):
+    """Read LABEL=PATH specs into (points, targets, labels); PATH is a session file or a directory of them"""
+    labels = []
+    points = []
+    targets = []
+    for spec in specs:
+        label, sep, path = spec.partition("=")
+        if not sep:
+            raise ValueError(f"Expected LABEL=PATH, got {spec!r}")
+        if label not in labels:
+            labels.append(label)
+        paths = [path]
+        if os.path.isdir(path):
+            paths = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+            paths = [p for p in paths if os.path.isfile(p) and _is_session(p)]
+        for session_path in paths:
+            hands = np.array(SessionReader(session_path).hand_landmarks())
+            points.append(hands)
+            targets.append(np.full(len(hands), labels.index(label)))
+    return np.concatenate(points), np.concatenate(targets), labels
+
+
+def split(targets, test_fraction, seed):
+    """Stratified train/test split of sample indices"""
+    rng = np.random.default_rng(seed)
+    train, test = [], []
+    for target in np.unique(targets):
+        indices = rng.permutation(np.flatnonzero(targets == target))
+        cut = int(round(len(indices) * test_fraction))
+        test.append(indices[:cut])
+        train.append(indices[cut:])
+    return np.concatenate(train), np.concatenate(test)
+
+
+def confusion_matrix(targets, predictions, count):
+    matrix = np.zeros((count, count), dtype=np.int64)
+    np.add.at(matrix, (targets, predictions), 1)
+    return matrix
+
+
+def format_confusion(matrix, labels):
+    width = max(8, max(len(label) for label in labels) + 2)
+    lines = ["Confusion matrix (rows: true, columns: predicted):",
+             " " * width + "".join(f"{label[:width - 2]:>{width}}" for label in labels)]
+    for label, row in zip(labels, matrix):
+        lines.append(f"{label:<{width}}" + "".join(f"{value:>{width}}" for value in row))
+    return "\n".join(lines)
+
+
+def time_single_hand(model, points, repeats=1000):
+    """Mean microseconds for one (1, 21, 3) hand through first_match()"""
+    hand = np.ascontiguousarray(points[:1])
+    model.first_match(hand)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.first_match(hand)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a landmark gesture classifier from labelled sessions")
+    parser.add_argument("data", nargs="+", metavar="LABEL=PATH",
+                        help=f"session file or directory of sessions recorded with --record; "
+                             f"label negatives {NONE_LABEL!r}")
+    parser.add_argument("--model", choices=sorted(MODELS), default="mlp", help="classifier type")
+    parser.add_argument("--output", metavar="PATH", default="gestures/model.npz",
+                        help="where to write the model, loaded with --gestures PATH")
+    parser.add_argument("--test-fraction", type=float, default=0.2,
+                        help="share of each label held out for evaluation")
+    parser.add_argument("--min-confidence", type=float, default=0.5,
+                        help="report no gesture when the best class scores below this")
+    parser.add_argument("--k", type=int, default=5, help="neighbours for knn")
+    parser.add_argument("--max-per-class", type=int, default=200, help="knn prototypes kept per label")
+    parser.add_argument("--hidden", type=int, default=64, help="hidden units for mlp")
+    parser.add_argument("--epochs", type=int, default=300, help="training steps for mlp")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    points, targets, labels = load_labelled_sessions(args.data)
+    print(f"Loaded {len(points)} hands:")
+    for i, label in enumerate(labels):
+        print(f"- {label}: {int((targets == i).sum())}")
+
+    train, test = split(targets, args.test_fraction, args.seed)
+    features = normalize_landmarks(points)
+
+    start = time.perf_counter()
+    if args.model == "knn":
+        model = MODELS["knn"].fit(features[train], targets[train], labels, k=args.k,
+                                  max_per_class=args.max_per_class, seed=args.seed,
+                                  min_confidence=args.min_confidence)
+    else:
+        model = MODELS["mlp"].fit(features[train], targets[train], labels, hidden=args.hidden,
+                                  epochs=args.epochs, seed=args.seed, min_confidence=args.min_confidence)
+    print(f"Trained {args.model} on {len(train)} hands in {time.perf_counter() - start:.1f}s")
+
+    if len(test):
+        predictions, _ = model.predict(points[test])
+        accuracy = (predictions == targets[test]).mean()
+        print(f"Held-out accuracy: {accuracy:.3f} on {len(test)} hands")
+        print(format_confusion(confusion_matrix(targets[test], predictions, len(labels)), labels))
+
+    # np.savez adds the extension when it is missing
+    output = args.output if args.output.endswith(".npz") else args.output + ".npz"
+    model.save(output)
+    start = time.perf_counter()
+    model = load_model(output)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Wrote {output} ({os.path.getsize(output) / 1024:.1f} KiB, loads in {load_ms:.1f} ms)")
+    print(f"Inference: {time_single_hand(model, points):.1f} us per hand")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import math
+
+import numpy as np
+
+PALM = np.array([0, 5, 9, 13, 17])  # Wrist and finger knuckles
+
+
+class TrajectoryBuffer:
+    """Fixed-size ring buffer of timestamped hand landmarks
+
+    Alongside the raw (21, 3) landmarks each sample stores the palm centre,
+    the palm size (grows as the hand nears the camera) and the cumulative path length
+    of the palm centre, so window statistics only need the two samples at
+    its ends. Samples are addressed by a running sequence number.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.points = np.zeros((capacity, 21, 3), dtype=np.float32)
+        self.centers = np.zeros((capacity, 2))
+        self.scales = np.zeros(capacity)
+        self.path = np.zeros(capacity)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.first = 0
+
+    def __len__(self):
+        return self.count - self.first
+
+    def slot(self, seq):
+        return seq % self.capacity
+
+    def append(self, t, points):
+        """Store one hand; O(1)"""
+        slot = self.slot(self.count)
+        self.times[slot] = t
+        self.points[slot] = points
+        palm = points[PALM, :2]
+        center = self.centers[slot]
+        center[:] = palm.mean(axis=0)
+        # RMS spread of the palm points; averaging five points keeps jitter low
+        self.scales[slot] = np.sqrt(((palm - center) ** 2).sum(axis=1).mean())
+        if len(self):
+            previous = self.slot(self.count - 1)
+            self.path[slot] = self.path[previous] + math.hypot(*(center - self.centers[previous]))
+        else:
+            self.path[slot] = 0.0
+        self.count += 1
+        self.first = max(self.first, self.count - self.capacity)
+
+    def clear(self):
+        """Drop the history but keep sequence numbers increasing"""
+        self.first = self.count
+
+    def seek(self, seq, since):
+        """First sequence number >= seq whose time is >= since
+
+        Callers keep the returned value and pass it back next frame, so a
+        sliding window advances in amortised O(1).
+        """
+        seq = max(seq, self.first)
+        while seq < self.count - 1 and self.times[self.slot(seq)] < since:
+            seq += 1
+        return seq
+
+    def ordered(self, array, start):
+        """Copy of array for samples start..newest, oldest first"""
+        slots = np.arange(start, self.count) % self.capacity
+        return array[slots]
+
+
+def _circle_templates(samples, phases):
+    angles = np.linspace(0, 2 * np.pi, samples, endpoint=False)
+    templates = []
+    for direction in (1, -1):
+        for phase in np.linspace(0, 2 * np.pi, phases, endpoint=False):
+            a = phase + direction * angles
+            # Unit RMS radius to match the normalised trajectory
+            templates.append(np.column_stack([np.cos(a), np.sin(a)]))
+    return np.array(templates)
+
+
+def dtw_distances(sequence, templates):
+    """DTW distance from an (n, 2) sequence to each of (T, m, 2) templates
+
+    The recurrence is evaluated one anti-diagonal at a time, vectorised over
+    every cell of the diagonal and every template.
+    """
+    n, m = len(sequence), templates.shape[1]
+    cost = np.linalg.norm(templates[:, np.newaxis, :, :] - sequence[np.newaxis, :, np.newaxis, :], axis=3)
+    D = np.full((len(templates), n + 1, m + 1), np.inf)
+    D[:, 0, 0] = 0.0
+    for k in range(2, n + m + 1):
+        i = np.arange(max(1, k - m), min(n, k - 1) + 1)
+        j = k - i
+        best = np.minimum(np.minimum(D[:, i - 1, j], D[:, i, j - 1]), D[:, i - 1, j - 1])
+        D[:, i, j] = cost[:, i - 1, j - 1] + best
+    return D[:, n, m] / (n + m)
+
+
+class MotionRecognizer:
+    """Recognises swipes, pushes and circles from a stream of hand landmarks
+
+    update(t, points) appends one hand and returns an event name or None:
+    swipe_left, swipe_right, swipe_up, swipe_down (palm centre travelling
+    far and mostly straight), push (palm growing as the hand moves towards
+    the camera) and circle (a closed loop of the palm centre matched against
+    circle templates with DTW).
+
+    A swipe is held back until the stroke slows down or has stayed straight
+    for swipe_settle seconds, and dropped if the path curves away first, so
+    the opening arc of a circle is not reported as a swipe.
+
+    Swipe and push checks only read the samples at the two ends of their
+    window. The DTW match runs only when a cheap closed-loop test passes,
+    and its cost is bounded by the buffer capacity. After an event the
+    history is cleared and nothing fires for refractory seconds, and then
+    not until the hand has rested (palm speed below rest_speed and palm
+    size within rest_growth) for rest_time seconds. The history is cleared
+    again at that point, so the rest of a slow stroke cannot fire twice.
+    """
+
+    def __init__(self, swipe_window=0.4, swipe_distance=0.15, swipe_straightness=0.8,
+                 swipe_settle=0.15, swipe_stop_speed=0.3,
+                 push_window=0.4, push_growth=0.25, push_drift=0.08,
+                 circle_window=1.2, circle_min_path=0.3, circle_closure=0.25,
+                 circle_threshold=0.35, samples=16, refractory=0.3,
+                 rest_time=0.2, rest_speed=0.15, rest_growth=0.08, capacity=64):
+        self.swipe_window = swipe_window
+        self.swipe_distance = swipe_distance
+        self.swipe_straightness = swipe_straightness
+        self.swipe_settle = swipe_settle
+        self.swipe_stop_speed = swipe_stop_speed
+        self.push_window = push_window
+        self.push_growth = push_growth
+        self.push_drift = push_drift
+        self.circle_window = circle_window
+        self.circle_min_path = circle_min_path
+        self.circle_closure = circle_closure
+        self.circle_threshold = circle_threshold
+        self.samples = samples
+        self.templates = _circle_templates(samples, phases=8)
+        self.refractory = refractory
+        self.rest_time = rest_time
+        self.rest_speed = rest_speed
+        self.rest_growth = rest_growth
+
+        self.buffer = TrajectoryBuffer(capacity)
+        self.swipe_start = 0
+        self.push_start = 0
+        self.circle_start = 0
+        self.rest_start = 0
+        self.pending_swipe = None  # (start sequence, time it qualified)
+        self.quiet_until = -np.inf
+        self.armed = True  # False from an event until the hand has rested
+
+    def reset(self):
+        """Forget the trajectory, e.g. when the hand is lost"""
+        self._clear()
+        self.armed = True
+
+    def _clear(self):
+        self.buffer.clear()
+        self.pending_swipe = None
+
+    def update(self, t, points):
+        buffer = self.buffer
+        buffer.append(t, points)
+        if not self.armed:
+            if t < self.quiet_until or not self._rested(t):
+                return None
+            # The stroke that fired is over; only what follows the rest counts
+            self._clear()
+            self.armed = True
+            return None
+        if len(buffer) < 3:
+            return None
+
+        self.swipe_start = buffer.seek(self.swipe_start, t - self.swipe_window)
+        self.push_start = buffer.seek(self.push_start, t - self.push_window)
+        self.circle_start = buffer.seek(self.circle_start, t - self.circle_window)
+
+        event = self._swipe(t) or self._push() or self._circle()
+        if event:
+            self._clear()
+            self.armed = False
+            self.quiet_until = t + self.refractory
+        return event
+
+    def _rested(self, t):
+        """Whether the hand has barely moved or changed size for the last rest_time seconds"""
+        buffer = self.buffer
+        if not len(buffer) or buffer.times[buffer.slot(buffer.first)] > t - self.rest_time:
+            return False
+        self.rest_start = buffer.seek(self.rest_start, t - self.rest_time)
+        first, last = self._span(self.rest_start)
+        elapsed = max(buffer.times[last] - buffer.times[first], 1e-6)
+        if (buffer.path[last] - buffer.path[first]) / elapsed > self.rest_speed:
+            return False
+        start_scale = buffer.scales[first]
+        return start_scale > 0 and abs(buffer.scales[last] / start_scale - 1.0) <= self.rest_growth
+
+    def _span(self, start):
+        return self.buffer.slot(start), self.buffer.slot(self.buffer.count - 1)
+
+    def _stroke(self, start):
+        """Displacement and path length of the palm centre from start to now"""
+        first, last = self._span(start)
+        displacement = self.buffer.centers[last] - self.buffer.centers[first]
+        return displacement, self.buffer.path[last] - self.buffer.path[first]
+
+    def _swipe(self, t):
+        buffer = self.buffer
+        if self.pending_swipe is None:
+            displacement, path = self._stroke(self.swipe_start)
+            distance = math.hypot(*displacement)
+            if distance < self.swipe_distance or distance < self.swipe_straightness * path:
+                return None
+            self.pending_swipe = (self.swipe_start, t)
+
+        start, qualified_at = self.pending_swipe
+        start = max(start, buffer.first)
+        displacement, path = self._stroke(start)
+        if math.hypot(*displacement) < self.swipe_straightness * path:
+            self.pending_swipe = None
+            return None
+
+        last, previous = buffer.slot(buffer.count - 1), buffer.slot(buffer.count - 2)
+        step_time = max(buffer.times[last] - buffer.times[previous], 1e-6)
+        speed = (buffer.path[last] - buffer.path[previous]) / step_time
+        if speed > self.swipe_stop_speed and t - qualified_at < self.swipe_settle:
+            return None
+
+        dx, dy = displacement
+        if abs(dx) >= abs(dy):
+            return "swipe_right" if dx > 0 else "swipe_left"
+        return "swipe_down" if dy > 0 else "swipe_up"
+
+    def _push(self):
+        first, last = self._span(self.push_start)
+        start_scale = self.buffer.scales[first]
+        if start_scale <= 0:
+            return None
+        growth = self.buffer.scales[last] / start_scale - 1.0
+        drift = math.hypot(*self._stroke(self.push_start)[0])
+        if growth >= self.push_growth and drift <= self.push_drift:
+            return "push"
+        return None
+
+    def _circle(self):
+        buffer = self.buffer
+        displacement, path = self._stroke(self.circle_start)
+        closure = math.hypot(*displacement)
+        if path < self.circle_min_path or closure > self.circle_closure * path:
+            return None
+
+        # Resample evenly along the path, then remove position and size
+        centers = buffer.ordered(buffer.centers, self.circle_start)
+        distance = buffer.ordered(buffer.path, self.circle_start)
+        targets = np.linspace(distance[0], distance[-1], self.samples)
+        resampled = np.column_stack([np.interp(targets, distance, centers[:, axis]) for axis in (0, 1)])
+        resampled -= resampled.mean(axis=0)
+        radius = np.sqrt((resampled ** 2).sum(axis=1).mean())
+        if radius == 0:
+            return None
+        resampled /= radius
+
+        if dtw_distances(resampled, self.templates).min() <= self.circle_threshold:
+            return "circle"
+        return None